@@ -1,15 +1,43 @@
 from __future__ import annotations
 
+import atexit
 import re
-import urllib.request
 import urllib.parse
+from functools import lru_cache
+from html.parser import HTMLParser
 from typing import Any, Dict, List, Optional
 
+import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/analyze", tags=["analyze"])
 
+_PREVIEW_MAX_HEADINGS = 20
+_PREVIEW_META_NAMES = ("description", "keywords")
+_PREVIEW_CHUNK = 64 * 1024
+_PREVIEW_MAX_BYTES = 1024 * 1024
+# Cheap presence check so the parser can stop once everything the page actually has is found.
+# One alternation with named groups covers all four patterns in a single pass over the HTML.
+_PREVIEW_PRESENCE_RE = re.compile(
+    r"(?P<title><title[\s>])|(?P<heading><h[1-3][\s>/])|"
+    + "|".join(f"(?P<{n}>{re.escape(n)})" for n in _PREVIEW_META_NAMES),
+    re.IGNORECASE,
+)
+_PREVIEW_PRESENCE_GROUPS = frozenset(_PREVIEW_PRESENCE_RE.groupindex)
+
+# Shared keep-alive pool so repeated previews reuse TCP/TLS connections
+_HTTP_CLIENT = httpx.Client(
+    follow_redirects=True,
+    timeout=httpx.Timeout(10.0),
+    headers={
+        "User-Agent": "XenlixaiBot/0.1 (+https://example.com)",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    },
+    limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+)
+atexit.register(_HTTP_CLIENT.close)
+
 
 class AnalyzeRequest(BaseModel):
     url: str
@@ -29,9 +57,14 @@ class AnalyzeResponse(BaseModel):
     preview: AnalyzePreview
 
 
+@lru_cache(maxsize=4096)
+def _parsed(url: str) -> urllib.parse.ParseResult:
+    return urllib.parse.urlparse(url)
+
+
 def _validate_url(url: str) -> str:
     try:
-        parsed = urllib.parse.urlparse(url)
+        parsed = _parsed(url)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid URL")
     if parsed.scheme not in ("http", "https"):
@@ -42,42 +75,111 @@ def _validate_url(url: str) -> str:
 
 
 def _fetch_html(url: str, timeout: int = 10) -> str:
-    req = urllib.request.Request(url, headers={
-        "User-Agent": "XenlixaiBot/0.1 (+https://example.com)",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    })
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
+    with _HTTP_CLIENT.stream("GET", url, timeout=timeout) as resp:
+        resp.raise_for_status()
         content_type = resp.headers.get("Content-Type", "")
         if "text/html" not in content_type:
             raise HTTPException(status_code=415, detail=f"Unsupported content type: {content_type}")
-        # Read up to 1MB for preview
-        raw = resp.read(1024 * 1024)
-        charset = resp.headers.get_param("charset") if hasattr(resp.headers, "get_param") else None
-        encoding = charset or "utf-8"
-        return raw.decode(encoding, errors="replace")
-
-
-def _strip_tags(text: str) -> str:
-    return re.sub(r"<[^>]+>", "", text or "").strip()
+        # Read up to 1MB for preview. An uncompressed Content-Length bounds the
+        # read up front so small pages stop as soon as the body is complete.
+        limit = _PREVIEW_MAX_BYTES
+        content_length = resp.headers.get("Content-Length", "")
+        if content_length.isdigit() and not resp.headers.get("Content-Encoding"):
+            limit = min(limit, int(content_length))
+        buf = bytearray()
+        for chunk in resp.iter_bytes(chunk_size=_PREVIEW_CHUNK):
+            buf += chunk
+            if len(buf) >= limit:
+                break
+        del buf[_PREVIEW_MAX_BYTES:]
+        encoding = resp.charset_encoding or "utf-8"
+        return buf.decode(encoding, errors="replace")
+
+
+class _PreviewParser(HTMLParser):
+    """Single forward pass collecting <title>, h1-h3 text and meta description/keywords."""
+
+    def __init__(
+        self,
+        expect_title: bool = True,
+        expect_headings: bool = True,
+        expect_meta: tuple[str, ...] = _PREVIEW_META_NAMES,
+    ) -> None:
+        super().__init__(convert_charrefs=True)
+        self._expect_title = expect_title
+        self._expect_headings = expect_headings
+        self._expect_meta = expect_meta
+        self.title: Optional[str] = None
+        self.headings: List[str] = []
+        self.meta: Dict[str, str] = {}
+        self._capture: Optional[str] = None
+        self._buf: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        return (
+            (self.title is not None or not self._expect_title)
+            and (len(self.headings) >= _PREVIEW_MAX_HEADINGS or not self._expect_headings)
+            and all(n in self.meta for n in self._expect_meta)
+        )
+
+    def handle_starttag(self, tag: str, attrs: List[tuple[str, Optional[str]]]) -> None:
+        if tag == "meta":
+            a = dict(attrs)
+            name = (a.get("name") or "").lower()
+            content = a.get("content")
+            if name in _PREVIEW_META_NAMES and content is not None and name not in self.meta:
+                self.meta[name] = content.strip()
+        elif self._capture is None and (
+            (tag == "title" and self.title is None)
+            or (tag in ("h1", "h2", "h3") and len(self.headings) < _PREVIEW_MAX_HEADINGS)
+        ):
+            self._capture = tag
+            self._buf = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._capture is None:
+            return
+        if tag == self._capture or (self._capture != "title" and tag in ("h1", "h2", "h3")):
+            text = "".join(self._buf).strip()
+            if self._capture == "title":
+                self.title = text
+            else:
+                self.headings.append(text)
+            self._capture = None
+            self._buf = []
+
+    def handle_data(self, data: str) -> None:
+        if self._capture is not None:
+            self._buf.append(data)
+
+
+def _preview_presence(html: str) -> set[str]:
+    found: set[str] = set()
+    for m in _PREVIEW_PRESENCE_RE.finditer(html):
+        found.add(m.lastgroup or "")
+        if len(found) == len(_PREVIEW_PRESENCE_GROUPS):
+            break
+    return found
+
+
+def _scan_preview(html: str) -> _PreviewParser:
+    present = _preview_presence(html)
+    parser = _PreviewParser(
+        expect_title="title" in present,
+        expect_headings="heading" in present,
+        expect_meta=tuple(n for n in _PREVIEW_META_NAMES if n in present),
+    )
+    for i in range(0, len(html), _PREVIEW_CHUNK):
+        parser.feed(html[i:i + _PREVIEW_CHUNK])
+        if parser.done:
+            break
+    return parser
 
 
 def _extract_preview(html: str) -> AnalyzePreview:
-    title_match = re.search(r"<title[^>]*>(.*?)</title>", html, flags=re.I | re.S)
-    title = _strip_tags(title_match.group(1)) if title_match else None
-
-    headings_raw = re.findall(r"<h[1-3][^>]*>(.*?)</h[1-3]>", html, flags=re.I | re.S)
-    headings = [_strip_tags(h) for h in headings_raw][:20]
-
-    # Basic meta tags
-    meta: Dict[str, str] = {}
-    desc = re.search(r'<meta[^>]+name=["\']description["\'][^>]+content=["\'](.*?)["\']', html, flags=re.I)
-    if desc:
-        meta["description"] = _strip_tags(desc.group(1))
-    kw = re.search(r'<meta[^>]+name=["\']keywords["\'][^>]+content=["\'](.*?)["\']', html, flags=re.I)
-    if kw:
-        meta["keywords"] = _strip_tags(kw.group(1))
-
-    return AnalyzePreview(title=title, headings=headings, meta=meta)
+    parser = _scan_preview(html or "")
+    return AnalyzePreview(title=parser.title, headings=parser.headings, meta=parser.meta)
 
 
 @router.post("/", response_model=AnalyzeResponse)
@@ -1,20 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import time
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+import httpx
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel, Field
 
 from app.utils.url_validator import validate_url_or_raise, SSRFProtectionError
-from app.services.fetcher import fetch_html, parse_html_summary
-from app.services.lighthouse import fetch_psi
+from app.services.fetcher import HEADERS, aread_capped, decode_body, extract_text, parse_html_tree, parse_html_summary_from_tree
+from app.services.lighthouse import fetch_psi, psi_needs_refresh
 from app.services.keyphrases import extract_keyphrases
+from app.services.page_signals import keyphrase_intent, scan_html_signals
 
 # Reuse internal helpers from orchestrator for scoring and business extraction
-from app.api.routes.orchestrator import _compute_scores, _extract_structured_data_summary, _extract_business_entity
+from app.api.routes.orchestrator import (
+    ScoreDimension,
+    StructuredDataSummary,
+    WeaknessItem,
+    _compute_scores,
+    _extract_structured_data_summary,
+    _extract_business_entity,
+)
 
 
 router = APIRouter(tags=["analyze-url"])  # no prefix; endpoint path defined explicitly below
@@ -40,59 +51,118 @@ class AnalyzeUrlResponse(BaseModel):
     psi_snapshot: Dict[str, Any]
     aeo_score: int
     geo_score: int
-    aeo_dimensions: List[Dict[str, Any]]
-    geo_dimensions: List[Dict[str, Any]]
-    weaknesses: List[Dict[str, Any]]
+    aeo_dimensions: List[ScoreDimension]
+    geo_dimensions: List[ScoreDimension]
+    weaknesses: List[WeaknessItem]
     recommendations: List[str]
     checkout: Dict[str, Any]
     premium_preview: bool
     timings: Dict[str, int] = Field(default_factory=dict)
 
 
+@lru_cache(maxsize=4096)
+def _validate_cached(url: str) -> str:
+    """SSRF-validate once per distinct URL; rejections raise and are not cached."""
+    validate_url_or_raise(url)
+    return url
+
+
+async def _fetch_page(url: str) -> tuple[str, Optional[int], str, int]:
+    """Single GET returning (final_url, status, html, ms); falls back to the input URL and empty HTML."""
+    start = time.time()
+    try:
+        timeout_s = int(os.getenv("EXTRACT_TIMEOUT_SECONDS", "20"))
+        # Per-request client: a module-level AsyncClient's pool would be bound to the
+        # first event loop that used it and never closed
+        async with httpx.AsyncClient(follow_redirects=True, timeout=15, headers=HEADERS) as client:
+            async with client.stream("GET", url, timeout=timeout_s) as r:
+                html = decode_body(r, await aread_capped(r)) if r.is_success else ""
+    except Exception:
+        # Non-fatal (including pages over MAX_HTML_BYTES); continue with original URL and
+        # empty HTML to keep response consistent
+        return url, None, "", 0
+    html_ms = int((time.time() - start) * 1000)
+    return str(r.url), r.status_code, html, html_ms
+
+
+async def _fetch_psi_snapshot(url: str) -> Dict[str, Any]:
+    psi_snapshot: Dict[str, Any] = {"performance": None, "seo": None, "accessibility": None, "best_practices": None, "web_vitals": {}}
+    try:
+        psi = await asyncio.to_thread(fetch_psi, url)
+        psi_snapshot.update({
+            "performance": psi.get("performance"),
+            "seo": psi.get("seo"),
+            # Our helper doesn't provide these yet; keep as None for consistent shape
+            "accessibility": None,
+            "best_practices": None,
+            "web_vitals": psi.get("web_vitals", {}),
+            "source": psi.get("source", "psi"),
+        })
+    except Exception:
+        pass
+    return psi_snapshot
+
+
 @router.post("/analyze-url", response_model=AnalyzeUrlResponse)
-def analyze_url(payload: AnalyzeUrlRequest) -> AnalyzeUrlResponse:
+async def analyze_url(payload: AnalyzeUrlRequest, background_tasks: BackgroundTasks) -> AnalyzeUrlResponse:
     start = time.time()
     url = payload.url.strip()
 
     # SSRF guard and URL validation
     try:
-        validate_url_or_raise(url)
+        url = _validate_cached(url)
     except SSRFProtectionError as e:
         raise HTTPException(status_code=400, detail=f"URL rejected: {e}")
 
-    # Resolve final URL + status with a quick HEAD/GET
-    final_url = url
-    http_status: Optional[int] = None
+    # One GET yields final URL, status and body; PSI for the input URL runs alongside it.
+    # If the GET was redirected, that speculative run is dropped and PSI is re-run on the
+    # final URL, so Lighthouse scores (and their cache entry) belong to the page after
+    # redirects, not the redirect hop.
+    psi_task = asyncio.create_task(_fetch_psi_snapshot(url))
     try:
-        import httpx
-        with httpx.Client(follow_redirects=True, timeout=15) as client:
-            r = client.get(url)
-            final_url = str(r.url)
-            http_status = r.status_code
-    except Exception:
-        # Non-fatal; continue with original URL
-        pass
+        final_url, http_status, html, html_ms = await _fetch_page(url)
+    except BaseException:
+        psi_task.cancel()
+        raise
+    if final_url == url:
+        psi_snapshot = await psi_task
+    else:
+        psi_task.cancel()
+        psi_snapshot = await _fetch_psi_snapshot(final_url)
 
-    # Fetch HTML (async function bridged via anyio)
-    html: str = ""
-    html_ms = 0
-    try:
-        import anyio
-        timeout_s = int(os.getenv("EXTRACT_TIMEOUT_SECONDS", "20"))
-        html, html_ms = anyio.run(fetch_html, final_url, timeout_s)
-    except Exception:
-        # Continue with empty HTML to keep response consistent
-        html = ""
+    # Re-warm PSI for this URL after responding so hot URLs keep hitting the cache
+    if psi_needs_refresh(final_url):
+        background_tasks.add_task(fetch_psi, final_url, refresh=True)
+
+    # Parsing and scoring are CPU-bound; keep them off the event loop
+    return await asyncio.to_thread(
+        _build_response, payload, url, final_url, http_status, html, html_ms, psi_snapshot, start
+    )
+
+
+def _build_response(
+    payload: AnalyzeUrlRequest,
+    url: str,
+    final_url: str,
+    http_status: Optional[int],
+    html: str,
+    html_ms: int,
+    psi_snapshot: Dict[str, Any],
+    start: float,
+) -> AnalyzeUrlResponse:
+    # Parse once with lxml; the tree is shared by every extractor below
+    tree = parse_html_tree(html)
 
     # Parse HTML summary (never throws)
-    summary = parse_html_summary(html, final_url)
+    summary = parse_html_summary_from_tree(tree, final_url, html)
 
     # Structured data summary & FAQ count (defensive, never throws)
+    sd_summary: Optional[StructuredDataSummary] = None
     stypes: List[str]
     faq_count: int
     schema_raw: Dict[str, Any]
     try:
-        sd_summary, faq_count, schema_raw = _extract_structured_data_summary(html or "", final_url)
+        sd_summary, faq_count, schema_raw = _extract_structured_data_summary(html or "", final_url, tree=tree)
         stypes = sd_summary.types
     except Exception:
         stypes, faq_count, schema_raw = [], 0, {}
@@ -101,8 +171,7 @@ def analyze_url(payload: AnalyzeUrlRequest) -> AnalyzeUrlResponse:
     text = ""
     text_len = 0
     try:
-        import trafilatura
-        text = trafilatura.extract(html or "", output_format="txt", include_comments=False) or ""
+        text = extract_text(tree, html) if tree is not None else ""
         text_len = len(text)
     except Exception:
         pass
@@ -112,38 +181,28 @@ def analyze_url(payload: AnalyzeUrlRequest) -> AnalyzeUrlResponse:
     try:
         top_n = int(os.getenv("KEYPHRASES_TOP_N", "8"))
         timeout_ms = int(os.getenv("KEYPHRASES_TIMEOUT_MS", "2000"))
-        kp = extract_keyphrases(text or "", top_n=top_n, timeout_ms=timeout_ms, cache_key=final_url)
+        kp = extract_keyphrases(text or "", top_n=top_n, timeout_ms=timeout_ms)
+        # Page-level signal, so scan the text once rather than per phrase
+        intent = keyphrase_intent(text)
         for i, p in enumerate(kp or []):
             phrases.append({
                 "phrase": p,
                 "weight": max(0.1, 1.0 - i * 0.05),
-                "intent": "Local" if (" tx" in (text or "").lower() or " texas" in (text or "").lower()) else "Informational",
+                "intent": intent,
             })
     except Exception:
         pass
 
-    # PSI snapshot
-    psi_snapshot: Dict[str, Any] = {"performance": None, "seo": None, "accessibility": None, "best_practices": None, "web_vitals": {}}
-    try:
-        psi = fetch_psi(final_url)
-        psi_snapshot.update({
-            "performance": psi.get("performance"),
-            "seo": psi.get("seo"),
-            # Our helper doesn't provide these yet; keep as None for consistent shape
-            "accessibility": None,
-            "best_practices": None,
-            "web_vitals": psi.get("web_vitals", {}),
-            "source": psi.get("source", "psi"),
-        })
-    except Exception:
-        pass
-
     # Build page + business dicts for scoring reuse
-    from bs4 import BeautifulSoup
-    soup = BeautifulSoup(html or "", "html.parser")
-    links_text = [a.get_text(strip=True) for a in soup.find_all("a") if a.get_text(strip=True)]
-    out_links = [a.get("href") or "" for a in soup.find_all("a")]
-    html_lower = (html or "").lower()
+    links_text: List[str] = []
+    out_links: List[str] = []
+    if tree is not None:
+        for a in tree.iter("a"):
+            label = a.text_content().strip()
+            if label:
+                links_text.append(label)
+            out_links.append(a.get("href") or "")
+    html_signals = scan_html_signals(html)
 
     page = {
         "title": summary.get("title"),
@@ -156,10 +215,10 @@ def analyze_url(payload: AnalyzeUrlRequest) -> AnalyzeUrlResponse:
         "text_len": text_len,
         "links_text": links_text,
         "out_links": out_links,
-        "html_lower": html_lower,
+        "html_signals": html_signals,
     }
 
-    biz = _extract_business_entity(schema_raw, html or "")
+    biz = _extract_business_entity(schema_raw, html or "", html_signals, out_links)
 
     # Compute AEO/GEO scores and weaknesses
     aeo, geo_scores, weaknesses = _compute_scores(page, biz, psi_snapshot)
@@ -190,9 +249,9 @@ def analyze_url(payload: AnalyzeUrlRequest) -> AnalyzeUrlResponse:
 
     # Structured data summary
     structured_data_summary = {
-        "json_ld_count": getattr(sd_summary, "json_ld_count", 0) if 'sd_summary' in locals() else 0,
-        "microdata_count": getattr(sd_summary, "microdata_count", 0) if 'sd_summary' in locals() else 0,
-        "opengraph_count": getattr(sd_summary, "opengraph_count", 0) if 'sd_summary' in locals() else 0,
+        "json_ld_count": sd_summary.json_ld_count if sd_summary is not None else 0,
+        "microdata_count": sd_summary.microdata_count if sd_summary is not None else 0,
+        "opengraph_count": sd_summary.opengraph_count if sd_summary is not None else 0,
         "types": stypes,
         "faq_count": faq_count,
         "missing_elements": missing,
@@ -222,9 +281,9 @@ def analyze_url(payload: AnalyzeUrlRequest) -> AnalyzeUrlResponse:
         psi_snapshot=psi_snapshot,
         aeo_score=aeo.total,
         geo_score=geo_scores.total,
-        aeo_dimensions=[d.model_dump() for d in aeo.dimensions],
-        geo_dimensions=[d.model_dump() for d in geo_scores.dimensions],
-        weaknesses=[w.model_dump() for w in weaknesses],
+        aeo_dimensions=aeo.dimensions,
+        geo_dimensions=geo_scores.dimensions,
+        weaknesses=weaknesses,
         recommendations=recommendations,
         checkout=checkout,
         premium_preview=True,
@@ -1,6 +1,9 @@
+import asyncio
 import os
+import threading
+import time
 import stripe
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from sqlmodel import Session
@@ -12,6 +15,33 @@ router = APIRouter(prefix="/billing", tags=["billing"])
 
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 
+# Checkout Sessions stay valid for 24h, so a URL can be reused across /billing/me calls.
+# Keyed by (user_id, price_id, frontend, email) -> (url, created_at)
+CHECKOUT_URL_TTL_SECONDS = 23 * 3600
+_CHECKOUT_CACHE_MAX = 10_000
+_checkout_url_cache: Dict[tuple, tuple[str, float]] = {}
+_checkout_cache_lock = threading.Lock()
+
+
+def _cached_checkout_url(key: tuple) -> Optional[str]:
+    with _checkout_cache_lock:
+        hit = _checkout_url_cache.get(key)
+        if hit and time.time() - hit[1] < CHECKOUT_URL_TTL_SECONDS:
+            return hit[0]
+        _checkout_url_cache.pop(key, None)
+    return None
+
+
+def _store_checkout_url(key: tuple, url: str) -> None:
+    now = time.time()
+    with _checkout_cache_lock:
+        if len(_checkout_url_cache) >= _CHECKOUT_CACHE_MAX:
+            for k in [k for k, (_, ts) in _checkout_url_cache.items() if now - ts >= CHECKOUT_URL_TTL_SECONDS]:
+                del _checkout_url_cache[k]
+            if len(_checkout_url_cache) >= _CHECKOUT_CACHE_MAX:
+                _checkout_url_cache.clear()
+        _checkout_url_cache[key] = (url, now)
+
 
 class BillingMe(BaseModel):
     premium: bool
@@ -20,14 +50,15 @@ class BillingMe(BaseModel):
 
 
 @router.get("/me", response_model=BillingMe)
-def billing_me(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def billing_me(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Return billing status and a ready-to-use checkout URL if not premium.
 
     Behavior:
     - If user.premium → premium=true, plan=premium, no checkout URL.
     - If Stripe not configured in env → premium=false, plan=free, return a dev/fake checkout URL
       pointing to the frontend (doesn't error).
-    - If Stripe is configured → create a Checkout Session and return its URL.
+    - If Stripe is configured → create a Checkout Session and return its URL. The URL is
+      cached per user for CHECKOUT_URL_TTL_SECONDS and the Stripe call runs off the event loop.
     """
     frontend = (
         os.getenv("FRONTEND_PUBLIC_URL")
@@ -45,15 +76,25 @@ def billing_me(user: User = Depends(get_current_user), db: Session = Depends(get
         dev_url = f"{frontend}/paywall/dev-checkout?plan=premium"
         return BillingMe(premium=False, plan="free", stripe_checkout_url=dev_url)
 
+    email = getattr(user, "email", None)
+    user_id = str(getattr(user, "id", ""))
+    cache_key = (user_id, price_id, frontend, email)
+    cached_url = _cached_checkout_url(cache_key)
+    if cached_url:
+        return BillingMe(premium=False, plan="free", stripe_checkout_url=cached_url)
+
     # Real Stripe Checkout Session
-    session = stripe.checkout.Session.create(
+    session = await asyncio.to_thread(
+        stripe.checkout.Session.create,
         mode="subscription",
         line_items=[{"price": price_id, "quantity": 1}],
         success_url=f"{frontend}/success?session_id={{CHECKOUT_SESSION_ID}}",
         cancel_url=f"{frontend}/paywall/cancel",
-        customer_email=getattr(user, "email", None),
-        metadata={"user_id": str(getattr(user, "id", ""))},
+        customer_email=email,
+        metadata={"user_id": user_id},
     )
+    if session.url:
+        _store_checkout_url(cache_key, session.url)
     return BillingMe(premium=False, plan="free", stripe_checkout_url=session.url)
 
 
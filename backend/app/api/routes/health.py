@@ -1,10 +1,18 @@
 from fastapi import APIRouter, HTTPException
+import asyncio
 import time
+from typing import Any, Optional
 from app.services.llm_factory import get_llm
 from app.core.config import settings
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# Probes can arrive at high rates; reuse the last LLM ping result for a few seconds
+LLM_HEALTH_CACHE_SECONDS = 5.0
+# (checked_at, status_code, body) where body is the response dict or the error detail
+_llm_health_last: Optional[tuple[float, int, Any]] = None
+_llm_health_lock = asyncio.Lock()
+
 
 @router.get("/")
 def health() -> dict:
@@ -17,23 +25,37 @@ def health() -> dict:
 
 
 @router.get("/llm")
-def llm_health() -> dict:
+async def llm_health() -> dict:
     """Calls the local LLM with a trivial prompt to verify connectivity.
 
     Returns the raw string to prove end-to-end local inference without cloud keys.
+    Results are cached for LLM_HEALTH_CACHE_SECONDS and concurrent probes share one call.
     """
+    global _llm_health_last
     if not settings.CREW_AI_ENABLED:
         return {"ok": False, "message": "AI disabled via CREW_AI_ENABLED=false"}
-    
+
+    async with _llm_health_lock:
+        last = _llm_health_last
+        if last is None or time.time() - last[0] >= LLM_HEALTH_CACHE_SECONDS:
+            last = _llm_health_last = (time.time(), *await _ping_llm())
+
+    _checked_at, status_code, body = last
+    if status_code != 200:
+        raise HTTPException(status_code=status_code, detail=body)
+    return body
+
+
+async def _ping_llm() -> tuple[int, Any]:
     try:
         start = time.time()
         llm = get_llm()
-        out = llm.call("ping")  # type: ignore[attr-defined]
+        out = await asyncio.to_thread(llm.call, "ping")  # type: ignore[attr-defined]
         duration_ms = int((time.time() - start) * 1000)
-        
+
         if not out or not str(out).strip():
-            raise HTTPException(status_code=502, detail="Empty response from LLM")
-        return {"ok": True, "response": str(out), "duration_ms": duration_ms}
+            return 502, "Empty response from LLM"
+        return 200, {"ok": True, "response": str(out), "duration_ms": duration_ms}
     except Exception as e:
         # Common failure when Ollama isn't running or not reachable from container
-        raise HTTPException(status_code=503, detail=f"LLM not ready: {e}")
+        return 503, f"LLM not ready: {e}"
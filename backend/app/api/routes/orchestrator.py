@@ -1,40 +1,90 @@
 from __future__ import annotations
 
+import ast
+import asyncio
+import atexit
+import copy
+import importlib.util
 import json
+import logging
 import os
 import re
+import string
+import threading
 import time
+from functools import lru_cache, partial
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
-import requests
+import httpx
 import yaml
 from fastapi import APIRouter
+from lxml import etree
+from lxml.html import HtmlElement
 from pydantic import BaseModel, Field
 from urllib.parse import urlparse, urljoin
 
-from app.services.fetcher import fetch_html
+from app.services.fetcher import (
+    HEADERS,
+    aread_capped,
+    decode_body,
+    extract_structured_data,
+    extract_text,
+    extract_title_from_tree,
+    html_digest,
+    parse_html_tree,
+    read_capped,
+    resolve_base_url,
+)
 from app.services.keyphrases import extract_keyphrases
 from app.services.lighthouse import fetch_psi
+from app.services.page_signals import PHONE_RE, ZIP_RE, business_hints, keyphrase_intent, scan_html_signals
 from app.utils.url_validator import validate_url_or_raise, SSRFProtectionError
+from app.core.config import settings
 from app.core.self_url import get_self_base_url
+from app.services.llm_factory import _resolve_base_url as _resolve_llm_base_url
 
+# orjson encodes in C; fall back to stdlib json (same compact output) when it isn't installed
+try:
+    import orjson  # type: ignore
 
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/orchestrator", tags=["orchestrator"], include_in_schema=True)
 
 # ============================
 # Load scoring rules at module import
 # ============================
 _SCORING_RULES: Dict[str, Any] = {}
+_RULES_PATH = Path(__file__).parent.parent.parent.parent / "scoring_rules.yaml"
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 
-def _load_scoring_rules() -> Dict[str, Any]:
-    """Load scoring rules from YAML file on first use."""
+def _rules_mtime_ns() -> int:
+    try:
+        return _RULES_PATH.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _load_scoring_rules(reload: bool = False) -> Dict[str, Any]:
+    """Load scoring rules from YAML once (reload=True re-reads); compiled into _COMPILED_RULES."""
     global _SCORING_RULES
-    if not _SCORING_RULES:
-        rules_path = Path(__file__).parent.parent.parent.parent / "scoring_rules.yaml"
-        if rules_path.exists():
-            with open(rules_path, "r", encoding="utf-8") as f:
-                _SCORING_RULES = yaml.safe_load(f) or {}
+    if reload or not _SCORING_RULES:
+        if _RULES_PATH.exists():
+            with open(_RULES_PATH, "r", encoding="utf-8") as f:
+                _SCORING_RULES = yaml.load(f, Loader=_YamlLoader) or {}
         else:
             # Fallback to empty rules if file not found
             _SCORING_RULES = {"aeo_dimensions": [], "geo_dimensions": [], "weaknesses": []}
@@ -236,88 +286,178 @@ class StructuredDataSummary(BaseModel):
     types: List[str] = Field(default_factory=list)
 
 
+# Dashboard layout is the same for every run; built once and shared by all responses
+_DASHBOARDS = DashboardsOutput(
+    preview=DashPreview(business_header=True, map_pin=True, components=["scores_dials", "psi_snapshot", "weakness_list", "benefit_blurb", "cta"]),
+    premium=DashPremium(enabled=False, components=["deep_tasks", "competitor_table", "citation_audit", "history_trends", "report_export"]),
+)
+
+
 # ============================
 # Helpers
 # ============================
 
 
-def _resolve_final_url(url: str, timeout: int = 10) -> tuple[str, Optional[int]]:
-    """Follow redirects to get final URL and a status code with minimal overhead."""
-    try:
-        import httpx
-        with httpx.Client(follow_redirects=True, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"}) as client:
-            r = client.get(url)
-            return str(r.url), r.status_code
-    except Exception:
-        return url, None
+# Shared keep-alive pool so repeated fetches reuse TCP/TLS connections; HTTP/2 when h2 is installed
+_HTTP_CLIENT = httpx.Client(
+    follow_redirects=True,
+    timeout=20,
+    headers=HEADERS,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    http2=importlib.util.find_spec("h2") is not None,
+)
+atexit.register(_HTTP_CLIENT.close)
+
+
+def _fetch_page_body(url: str, timeout: int = 20) -> tuple[str, Optional[int], str, bytes, str, int]:
+    """Fetch a page once, returning (final_url, status_code, html, body, encoding, elapsed_ms).
+
+    Redirects are followed, so the response carries the final URL and body together.
+    body is the raw bytes html was decoded from with ``encoding``; both are empty for
+    non-2xx responses, whose bodies are never read. Bodies over MAX_HTML_BYTES raise
+    HTMLTooLargeError while streaming; that and network errors propagate to the caller.
+    """
+    start = time.time()
+    with _HTTP_CLIENT.stream("GET", url, timeout=timeout) as r:
+        body = read_capped(r) if r.is_success else b""
+    elapsed_ms = int((time.time() - start) * 1000)
+    if not r.is_success:
+        return str(r.url), r.status_code, "", b"", r.encoding or "utf-8", elapsed_ms
+    return str(r.url), r.status_code, decode_body(r, body), body, r.encoding or "utf-8", elapsed_ms
+
+
+def _fetch_page(url: str, timeout: int = 20) -> tuple[str, Optional[int], str, int]:
+    """Fetch a page once, returning (final_url, status_code, html, elapsed_ms); see _fetch_page_body."""
+    final_url, status_code, html, _body, _encoding, elapsed_ms = _fetch_page_body(url, timeout)
+    return final_url, status_code, html, elapsed_ms
 
 
-def _get_canonical(soup) -> Optional[str]:
+async def _fetch_pages(
+    urls: List[str], timeout: int = 20, headers: Optional[Dict[str, str]] = None
+) -> List[tuple[str, Optional[int], str, int]]:
+    """Concurrent _fetch_page over one pooled AsyncClient; results keep the order of urls.
+
+    headers replaces the default browser HEADERS (the crawler sends its own User-Agent).
+    Failed fetches yield (url, None, "", 0) instead of raising.
+    """
+    async def fetch_one(client: httpx.AsyncClient, url: str) -> tuple[str, Optional[int], str, int]:
+        start = time.time()
+        try:
+            async with client.stream("GET", url) as r:
+                html = decode_body(r, await aread_capped(r)) if r.is_success else ""
+        except Exception:
+            return url, None, "", 0
+        elapsed_ms = int((time.time() - start) * 1000)
+        return str(r.url), r.status_code, html, elapsed_ms
+
+    # AsyncClient is bound to the running loop, so each batch gets its own pool
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=timeout,
+        headers=headers or HEADERS,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    ) as client:
+        return list(await asyncio.gather(*(fetch_one(client, u) for u in urls)))
+
+
+# First <link> whose rel contains "canonical" (ASCII case-insensitive), matched inside libxml2
+_CANONICAL_XPATH = etree.XPath(
+    '(descendant-or-self::link[contains(translate(@rel, "CANONIL", "canonil"), "canonical")])[1]'
+)
+
+
+def _get_canonical(tree: Optional[HtmlElement]) -> Optional[str]:
     try:
-        link = soup.find("link", rel=lambda v: v and "canonical" in v.lower())
-        href = link.get("href") if link else None
+        links = _CANONICAL_XPATH(tree) if tree is not None else []
+        if not links:
+            return None
+        href = links[0].get("href")
         return href.strip() if href else None
     except Exception:
         return None
 
 
-def _parse_html_basic(html: str, base: str) -> dict:
-    from bs4 import BeautifulSoup
-    # Prefer robust title extraction with multiple fallbacks
-    from app.services.fetcher import extract_title as robust_extract_title
-    soup = BeautifulSoup(html or "", "html.parser")
+# Absolute or protocol-relative href with a plain host, e.g. "https://example.com/x" or "//cdn.example.com"
+_ABS_HREF_HOST_RE = re.compile(r"(?:https?:)?//([A-Za-z0-9.-]+)(?:[/?#]|\Z)")
+
+
+def _link_host(href: str, base: str, base_host: str) -> str:
+    """Hostname href resolves to against base, lowercased ("" if none).
+
+    Root-relative, plain-relative and simple absolute hrefs are classified with
+    string checks; anything else (other schemes, ports, userinfo, odd spacing)
+    falls back to urljoin + urlparse.
+    """
+    if href[0] == "/" and href[1:2] != "/":
+        return base_host
+    m = _ABS_HREF_HOST_RE.match(href)
+    if m:
+        return m.group(1).lower()
+    if not href[0].isspace() and ":" not in href.split("/", 1)[0]:
+        return base_host
+    return urlparse(urljoin(base, href)).hostname or ""
+
+
+def _parse_html_basic(html: Union[str, bytes], base: str, tree: Optional[HtmlElement] = None) -> dict:
+    """Title, meta description, h1-h3, link counts and canonical from one walk of the lxml tree.
+
+    Pass ``tree`` from parse_html_tree() to reuse an existing parse.
+    """
+    if tree is None:
+        tree = parse_html_tree(html)
     # Title via robust extractor: <title> -> og:title -> twitter:title -> <h1> -> hostname
-    title = robust_extract_title(html or "", url=base)
-    meta_desc = None
-    md_tag = soup.find("meta", attrs={"name": "description"})
-    if md_tag and md_tag.get("content"):
-        meta_desc = md_tag.get("content").strip()
-    # OG description fallback
-    if not meta_desc:
-        ogd = soup.find("meta", property="og:description")
-        if ogd and ogd.get("content"):
-            meta_desc = ogd.get("content").strip()
-
-    # Headings
-    def texts(tags):
-        return [t.get_text(strip=True) for t in soup.find_all(tags) if t.get_text(strip=True)]
-
-    h1 = texts("h1")
-    h2 = texts("h2")
-    h3 = texts("h3")
-
-    # Links
+    title, _src = extract_title_from_tree(tree, base)
+
+    meta_desc: Optional[str] = None
+    og_desc: Optional[str] = None
+    seen_desc = seen_og = False
+    headings: Dict[str, List[str]] = {"h1": [], "h2": [], "h3": []}
     parsed_host = urlparse(base).hostname or ""
     internal = 0
     external = 0
-    for a in soup.find_all("a"):
-        href = a.get("href") or ""
-        if not href or href.startswith("#"):
-            continue
-        full = urljoin(base, href)
-        h = urlparse(full).hostname or ""
-        if h and h == parsed_host:
-            internal += 1
-        elif h:
-            external += 1
-
-    # Canonical
-    canonical = _get_canonical(soup)
+
+    for el in tree.iter("h1", "h2", "h3", "a", "meta") if tree is not None else ():
+        tag = el.tag
+        if tag == "a":
+            href = el.get("href") or ""
+            if not href or href.startswith("#"):
+                continue
+            h = _link_host(href, base, parsed_host)
+            if h and h == parsed_host:
+                internal += 1
+            elif h:
+                external += 1
+        elif tag == "meta":
+            # First matching tag wins, as with a find() lookup
+            if not seen_desc and el.get("name") == "description":
+                seen_desc = True
+                content = el.get("content")
+                meta_desc = content.strip() if content else None
+            elif not seen_og and el.get("property") == "og:description":
+                seen_og = True
+                content = el.get("content")
+                og_desc = content.strip() if content else None
+        else:
+            text = el.text_content().strip()
+            if text:
+                headings[tag].append(text)
 
     return {
         "title": title,
-        "meta_description": meta_desc,
-        "headings": {"h1": h1, "h2": h2, "h3": h3},
+        # OG description fallback
+        "meta_description": meta_desc or og_desc,
+        "headings": headings,
         "internal_links": internal,
         "external_links": external,
-        "canonical": canonical,
+        "canonical": _get_canonical(tree),
     }
 
 
-def _extract_structured_data_summary(html: str, base_url: str) -> tuple[StructuredDataSummary, int, dict]:
+def _extract_structured_data_summary(html: str, base_url: str, tree: Any = None) -> tuple[StructuredDataSummary, int, dict]:
     """Fast, safe structured-data extraction.
 
     - Never raises; on error, returns empty summary.
+    - Pass an lxml ``tree`` (see fetcher.parse_html_tree) to skip re-parsing ``html``.
     - Counts json-ld/microdata/opengraph blocks.
     - Collects detected @type values (normalized) from JSON-LD and Microdata.
     - Also derives faq_count by detecting FAQPage in JSON-LD.
@@ -330,26 +470,22 @@ def _extract_structured_data_summary(html: str, base_url: str) -> tuple[Structur
     def _as_list(x: Any) -> List[Any]:
         return x if isinstance(x, list) else ([] if x is None else [x]) if isinstance(x, (dict, str)) else []
 
-    def _norm_type_name(val: Any) -> List[str]:
-        out: List[str] = []
-        if val is None:
-            return out
+    def _iter_type_names(val: Any):
         if isinstance(val, list):
             for v in val:
-                out.extend(_norm_type_name(v))
-            return out
-        s = str(val)
-        if not s:
-            return out
-        # Take the last path segment for IRIs
-        out.append(s.split("/")[-1])
-        return out
+                yield from _iter_type_names(v)
+        elif val is not None:
+            # Take the last path segment for IRIs
+            yield str(val).split("/")[-1]
 
     try:
-        import extruct
-        from w3lib.html import get_base_url  # type: ignore
-        base = get_base_url(html, base_url) if html else base_url
-        data = extruct.extract(html or "", base_url=base, syntaxes=["json-ld", "microdata", "opengraph"]) or {}
+        doc = tree if tree is not None else parse_html_tree(html)
+        if doc is None:
+            return summary, faq_count, raw
+        base = resolve_base_url(doc, html, base_url)
+        # JSON-LD comes straight off the tree; extruct only runs for microdata/opengraph,
+        # and only when the page has their markers
+        data = extract_structured_data(doc, base, ["json-ld", "microdata", "opengraph"]) or {}
         raw = data if isinstance(data, dict) else {}
 
         jsonld_list = raw.get("json-ld") if isinstance(raw, dict) else None
@@ -364,37 +500,32 @@ def _extract_structured_data_summary(html: str, base_url: str) -> tuple[Structur
         summary.microdata_count = len(md)
         summary.opengraph_count = len(og)
 
-        types: List[str] = []
+        # Normalize and de-duplicate (case-insensitive, order preserved) in one pass
+        seen: set[str] = set()
+        uniq: List[str] = []
+
+        def _add_types(val: Any) -> None:
+            for name in _iter_type_names(val):
+                key = name.strip()
+                key_lower = key.lower()
+                if key and key_lower not in seen:
+                    seen.add(key_lower)
+                    uniq.append(key)
 
         # JSON-LD types and FAQ detection
         for item in jl:
             if not isinstance(item, dict):
                 continue
             t = item.get("@type")
-            t_norm = _norm_type_name(t)
             if any(str(x).lower() == "faqpage" for x in _as_list(t)):
                 faq_count += 1
-            types.extend(t_norm)
+            _add_types(t)
 
         # Microdata types
         for md_item in md:
-            if not isinstance(md_item, dict):
-                continue
-            t = md_item.get("type")
-            types.extend(_norm_type_name(t))
+            if isinstance(md_item, dict):
+                _add_types(md_item.get("type"))
 
-        # De-duplicate, preserve order
-        seen = set()
-        uniq: List[str] = []
-        for t in types:
-            key = t.strip()
-            if not key:
-                continue
-            key_lower = key.lower()
-            if key_lower in seen:
-                continue
-            seen.add(key_lower)
-            uniq.append(key)
         summary.types = uniq
     except Exception:
         # On any failure, return empty but safe summary
@@ -403,7 +534,17 @@ def _extract_structured_data_summary(html: str, base_url: str) -> tuple[Structur
     return summary, faq_count, raw
 
 
-def _extract_business_entity(schema_data: dict, html_text: str, html_lower: str, out_links: List[str]) -> dict:
+# NAP fallback patterns for pages without LocalBusiness/Organization JSON-LD (PHONE_RE and
+# ZIP_RE are shared with the worker from app.services.page_signals)
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# City, ST 12345 (e.g., "San Francisco, CA 94102")
+_CITY_STATE_ZIP_RE = re.compile(r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)")
+_STATE_ZIP_RE = re.compile(r"\b([A-Z]{2})\s+\d{5}")
+# Every address pattern needs a 5-digit run; one cheap scan for it gates (and offsets) the rest
+_FIVE_DIGITS_RE = re.compile(r"\d{5}")
+
+
+def _extract_business_entity(schema_data: dict, html_text: str, html_signals: set[str], out_links: List[str]) -> dict:
     """Extract comprehensive business NAP and local SEO signals."""
     name = None
     dba = None
@@ -462,9 +603,9 @@ def _extract_business_entity(schema_data: dict, html_text: str, html_lower: str,
                 # Opening hours
                 oh = item.get("openingHours") or item.get("openingHoursSpecification")
                 if isinstance(oh, list):
-                    hours = hours or "; ".join([json.dumps(x) if isinstance(x, dict) else str(x) for x in oh])
+                    hours = hours or "; ".join(_json_dumps(x) if isinstance(x, dict) else str(x) for x in oh)
                 elif isinstance(oh, (str, dict)):
-                    hours = hours or (json.dumps(oh) if isinstance(oh, dict) else oh)
+                    hours = hours or (_json_dumps(oh) if isinstance(oh, dict) else oh)
                 # Category
                 tp = item.get("@type")
                 if isinstance(tp, list):
@@ -483,33 +624,34 @@ def _extract_business_entity(schema_data: dict, html_text: str, html_lower: str,
     # Fallback regex from HTML text for phone and email
     try:
         if not phone:
-            m = re.search(r"(\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", html_text)
+            m = PHONE_RE.search(html_text)
             phone = m.group(0) if m else None
         if not email:
-            m = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", html_text)
+            m = _EMAIL_RE.search(html_text)
             email = m.group(0) if m else None
     except Exception:
         pass
     
     # Fallback regex for US address components if not in schema
     try:
-        if not city:
+        digits = _FIVE_DIGITS_RE.search(html_text) if not (city and postal_code) else None
+        if digits is not None and not city:
             # Look for city, state zip pattern (e.g., "San Francisco, CA 94102")
-            city_pattern = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z]{2})\s+(\d{5}(?:-\d{4})?)', html_text)
+            city_pattern = _CITY_STATE_ZIP_RE.search(html_text)
             if city_pattern:
                 city = city or city_pattern.group(1)
                 state = state or city_pattern.group(2)
                 postal_code = postal_code or city_pattern.group(3)
         
-        if not postal_code:
-            # Look for 5-digit or 9-digit zip code
-            zip_match = re.search(r'\b\d{5}(?:-\d{4})?\b', html_text)
+        if digits is not None and not postal_code:
+            # Look for 5-digit or 9-digit zip code; none can start before the first digit run
+            zip_match = ZIP_RE.search(html_text, digits.start())
             if zip_match:
                 postal_code = postal_code or zip_match.group(0)
         
-        if not state and not city:
+        if digits is not None and not state and not city:
             # Look for state abbreviation
-            state_match = re.search(r'\b([A-Z]{2})\s+\d{5}', html_text)
+            state_match = _STATE_ZIP_RE.search(html_text)
             if state_match:
                 state = state or state_match.group(1)
     except Exception:
@@ -520,11 +662,7 @@ def _extract_business_entity(schema_data: dict, html_text: str, html_lower: str,
     apple_business_connect_hint = False
     
     try:
-        all_links = " ".join(out_links + [html_lower])
-        if "google.com/maps" in all_links or "maps.google.com" in all_links or "g.page" in all_links or "business.google.com" in all_links:
-            google_business_hint = True
-        if "maps.apple.com" in all_links or "businessconnect.apple.com" in all_links:
-            apple_business_connect_hint = True
+        google_business_hint, apple_business_connect_hint = business_hints(html_signals, out_links)
     except Exception:
         pass
 
@@ -532,7 +670,7 @@ def _extract_business_entity(schema_data: dict, html_text: str, html_lower: str,
     nap_detected = bool(name and phone and (address or (city and state)))
 
     # Normalize categories
-    categories = list({c.split("/")[-1] for c in categories if c})
+    categories = list(dict.fromkeys(c.split("/")[-1] for c in categories if c))
 
     return {
         "name": name,
@@ -555,141 +693,427 @@ def _extract_business_entity(schema_data: dict, html_text: str, html_lower: str,
     }
 
 
-def _get_nested_value(data: dict, field: str) -> Any:
-    """Get nested field value from dict using dot notation (e.g., 'business.name')."""
-    keys = field.split(".")
-    value = data
-    for key in keys:
-        if isinstance(value, dict):
+# Compiled rule: per-page slot values -> (points, evidence)
+_RuleFn = Callable[[tuple], tuple[int, List[str]]]
+_SlotGetter = Callable[[tuple], Any]
+
+
+def _compile_getter(field: str) -> Callable[[dict], Any]:
+    """Compile a dot-notation field (e.g. 'business.name') into a getter over the data dict."""
+    keys = tuple(field.split("."))
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda data: data.get(key)
+
+    def get(data: dict) -> Any:
+        value: Any = data
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
             value = value.get(key)
-        else:
-            return None
-    return value
+        return value
 
+    return get
 
-def _apply_rule(rule: dict, data: dict, rules_config: dict) -> tuple[int, List[str]]:
-    """Apply a single scoring rule and return points + evidence."""
-    rule_type = rule.get("type", "")
-    field = rule.get("field", "")
-    value = _get_nested_value(data, field)
-    evidence = []
-    points = 0
-
-    # Handle different rule types
-    if rule_type == "faq_count":
-        faq_count = value or 0
-        points = faq_count * rule.get("multiplier", 1)
-        evidence.append(f"faq_count={faq_count}")
-
-    elif rule_type == "question_headings":
-        h2_list = value or []
-        patterns = rules_config.get("question_patterns", [])
-        q_heads = [h for h in h2_list if "?" in h or h.lower().startswith(tuple(patterns))]
-        points = len(q_heads) * rule.get("multiplier", 1)
-        evidence.append(f"q_heads={len(q_heads)}")
-
-    elif rule_type == "schema_diversity":
-        schema_types = value or []
-        unique_count = len(set(schema_types))
-        contrib = min(rule.get("max_contribution", 70), unique_count * rule.get("multiplier", 1))
-        points = contrib
-        evidence.extend(schema_types[:5])
-
-    elif rule_type == "local_business_bonus":
-        schema_types = value or []
-        if any(s.lower() == "localbusiness" for s in schema_types):
-            points = rule.get("bonus", 0)
-            evidence.append("LocalBusiness present")
-
-    elif rule_type in ("business_name", "business_phone", "business_address"):
-        if value:
-            points = rule.get("points", 0)
-            evidence.append(f"{field}=present")
-
-    elif rule_type == "internal_links":
-        internal_links = value or 0
-        formula = rule.get("formula", "")
-        if "min(50, value // 10)" in formula:
-            points = min(50, internal_links // 10)
-        evidence.append(f"internal_links={internal_links}")
-
-    elif rule_type == "text_length":
-        text_len = value or 0
-        formula = rule.get("formula", "")
-        if "min(70, value // 800)" in formula:
-            points = min(70, text_len // 800)
-        evidence.append(f"text_len={text_len}")
-
-    elif rule_type == "about_link":
-        links_text = " ".join(value or []).lower()
-        if "about" in links_text:
-            points = rule.get("points", 0)
-            evidence.append("About link detected")
-
-    elif rule_type == "review_content":
-        html_lower = value or ""
-        if "review" in html_lower:
-            points = rule.get("points", 0)
-            evidence.append("Review content detected")
-
-    elif rule_type == "citation_sources":
-        out_links_text = " ".join(value or [])
-        targets = rule.get("targets", [])
+
+class _FieldSlots:
+    """Gives each distinct field the compiled rules read a fixed slot in a per-page tuple.
+
+    Rules, conditions and evidence templates capture an itemgetter into that
+    tuple, so every dotted field is resolved once per page instead of per use.
+    """
+
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+
+    def getter(self, field: str) -> _SlotGetter:
+        return itemgetter(self.index.setdefault(field, len(self.index)))
+
+    def loader(self) -> Callable[[dict], tuple]:
+        getters = tuple(_compile_getter(field) for field in self.index)
+        return lambda data: tuple(get(data) for get in getters)
+
+
+_FORMULA_FUNCS = {"min": min, "max": max}
+_FORMULA_OPS = (ast.Add, ast.Sub, ast.Mult, ast.FloorDiv)
+
+
+def _formula_node_ok(node: ast.AST) -> bool:
+    if isinstance(node, ast.Name):
+        return node.id == "value"
+    if isinstance(node, ast.Constant):
+        return type(node.value) is int
+    if isinstance(node, ast.BinOp):
+        return isinstance(node.op, _FORMULA_OPS) and _formula_node_ok(node.left) and _formula_node_ok(node.right)
+    if isinstance(node, ast.Call):
+        return (
+            isinstance(node.func, ast.Name)
+            and node.func.id in _FORMULA_FUNCS
+            and not node.keywords
+            and len(node.args) >= 2
+            and all(_formula_node_ok(arg) for arg in node.args)
+        )
+    return False
+
+
+def _compile_formula(formula: str) -> Optional[Callable[[int], int]]:
+    """Compile an integer formula over `value` (e.g. 'min(50, value // 10)') into a function.
+
+    Only integer constants, + - * //, and min()/max() are accepted; anything else
+    (or a syntax error) yields None and the rule scores zero, as before.
+    """
+    try:
+        body = ast.parse(formula.strip(), mode="eval").body
+    except SyntaxError:
+        return None
+    if not _formula_node_ok(body):
+        return None
+    fn = ast.Expression(ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg("value")], kwonlyargs=[], kw_defaults=[], defaults=[]),
+        body=body,
+    ))
+    return eval(compile(ast.fix_missing_locations(fn), "<formula>", "eval"), {"__builtins__": {}, **_FORMULA_FUNCS})
+
+
+def _build_faq_count(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    multiplier = rule.get("multiplier", 1)
+
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        faq_count = get(data) or 0
+        return faq_count * multiplier, [f"faq_count={faq_count}"]
+    return apply
+
+
+def _build_question_headings(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    multiplier = rule.get("multiplier", 1)
+    # Headings are lowercased before matching, so lowercase the prefixes once
+    prefixes = tuple(str(p).lower() for p in rules_config.get("question_patterns", []))
+
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        q_heads = sum(1 for h in get(data) or [] if "?" in h or h.lower().startswith(prefixes))
+        return q_heads * multiplier, [f"q_heads={q_heads}"]
+    return apply
+
+
+def _build_schema_diversity(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    multiplier = rule.get("multiplier", 1)
+    max_contribution = rule.get("max_contribution", 70)
+
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        schema_types = get(data) or []
+        return min(max_contribution, len(set(schema_types)) * multiplier), list(schema_types[:5])
+    return apply
+
+
+def _build_local_business_bonus(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    bonus = rule.get("bonus", 0)
+
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        if any(s.lower() == "localbusiness" for s in get(data) or []):
+            return bonus, ["LocalBusiness present"]
+        return 0, []
+    return apply
+
+
+def _build_present(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    points = rule.get("points", 0)
+    present = "address=present" if rule.get("type") == "address_present" else f"{rule.get('field', '')}=present"
+
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        return (points, [present]) if get(data) else (0, [])
+    return apply
+
+
+def _build_count_formula(label: str) -> Callable[[dict, _SlotGetter, dict], _RuleFn]:
+    def build(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+        formula = _compile_formula(rule.get("formula", ""))
+
+        def apply(data: tuple) -> tuple[int, List[str]]:
+            value = get(data) or 0
+            return (formula(value) if formula else 0), [f"{label}={value}"]
+        return apply
+    return build
+
+
+def _build_about_link(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    points = rule.get("points", 0)
+
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        if any("about" in t.lower() for t in get(data) or []):
+            return points, ["About link detected"]
+        return 0, []
+    return apply
+
+
+def _build_html_signal(needle: str, hit: str) -> Callable[[dict, _SlotGetter, dict], _RuleFn]:
+    def build(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+        points = rule.get("points", 0)
+
+        def apply(data: tuple) -> tuple[int, List[str]]:
+            return (points, [hit]) if needle in (get(data) or ()) else (0, [])
+        return apply
+    return build
+
+
+def _build_citation_sources(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    multiplier = rule.get("multiplier", 1)
+    targets = tuple(rule.get("targets", []))
+
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        # A handful of str.__contains__ scans (C two-way search) beats one regex pass
+        # that stops at every position and every repeated hit
+        out_links_text = " ".join(get(data) or [])
         cites = sum(1 for t in targets if t in out_links_text)
-        points = cites * rule.get("multiplier", 1)
-        evidence.append(f"matches={cites}")
+        return cites * multiplier, [f"matches={cites}"]
+    return apply
 
-    elif rule_type == "address_present":
-        if value:
-            points = rule.get("points", 0)
-            evidence.append(f"address=present")
 
-    elif rule_type == "map_embed":
-        html_lower = value or ""
-        if "maps.google" in html_lower:
-            points = rule.get("points", 0)
-            evidence.append("Google Maps embed detected")
+def _build_service_areas(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    points = rule.get("points", 0)
 
-    elif rule_type == "service_areas":
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        value = get(data)
         if value:
-            points = rule.get("points", 0)
-            evidence.append(f"areas={len(value) if isinstance(value, list) else 1}")
+            return points, [f"areas={len(value) if isinstance(value, list) else 1}"]
+        return 0, []
+    return apply
+
+
+def _build_location_schema_types(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    points = rule.get("points", 0)
+    targets = frozenset(rule.get("targets", []))
+
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        if any(s.lower() in targets for s in get(data) or []):
+            return points, ["Location schema present"]
+        return 0, []
+    return apply
+
+
+def _build_psi_performance(rule: dict, get: _SlotGetter, rules_config: dict) -> _RuleFn:
+    formula = _compile_formula(rule.get("formula", ""))
+    fallback = rule.get("fallback_score", 0) - rule.get("base_score", 0)
+
+    def apply(data: tuple) -> tuple[int, List[str]]:
+        perf = get(data)
+        if perf is None:
+            return fallback, [f"performance={perf}"]
+        return (formula(perf) if formula else 0), [f"performance={perf}"]
+    return apply
+
+
+# rule type -> builder(rule, field getter, rules_config) returning the rule closure
+_RULE_BUILDERS: Dict[str, Callable[[dict, _SlotGetter, dict], _RuleFn]] = {
+    "faq_count": _build_faq_count,
+    "question_headings": _build_question_headings,
+    "schema_diversity": _build_schema_diversity,
+    "local_business_bonus": _build_local_business_bonus,
+    "business_name": _build_present,
+    "business_phone": _build_present,
+    "business_address": _build_present,
+    "address_present": _build_present,
+    "phone_clickable": _build_present,
+    "email_clickable": _build_present,
+    "internal_links": _build_count_formula("internal_links"),
+    "text_length": _build_count_formula("text_len"),
+    "about_link": _build_about_link,
+    "review_content": _build_html_signal("review", "Review content detected"),
+    "review_mentions": _build_html_signal("review", "Review mentions detected"),
+    "map_embed": _build_html_signal("maps.google", "Google Maps embed detected"),
+    "citation_sources": _build_citation_sources,
+    "service_areas": _build_service_areas,
+    "location_schema_types": _build_location_schema_types,
+    "psi_performance": _build_psi_performance,
+}
+
+
+# Rule fields kept for rules files: html_lower rules (review/map checks) read the page's
+# signal set, which holds every needle those rule types test for
+_RULE_FIELD_ALIASES = {"html_lower": "html_signals"}
+
+
+def _no_points(data: tuple) -> tuple[int, List[str]]:
+    return 0, []
+
+
+def _compile_rule(rule: dict, rules_config: dict, slots: _FieldSlots) -> _RuleFn:
+    """Compile a single scoring rule into a closure returning points + evidence."""
+    builder = _RULE_BUILDERS.get(rule.get("type", ""))
+    if builder is None:
+        return _no_points
+    field = rule.get("field", "")
+    return builder(rule, slots.getter(_RULE_FIELD_ALIASES.get(field, field)), rules_config)
 
-    elif rule_type == "location_schema_types":
-        schema_types = value or []
-        targets = rule.get("targets", [])
-        if any(s.lower() in targets for s in schema_types):
-            points = rule.get("points", 0)
-            evidence.append("Location schema present")
 
-    elif rule_type in ("phone_clickable", "email_clickable"):
-        if value:
-            points = rule.get("points", 0)
-            evidence.append(f"{field}=present")
-
-    elif rule_type == "review_mentions":
-        html_lower = value or ""
-        if "review" in html_lower:
-            points = rule.get("points", 0)
-            evidence.append("Review mentions detected")
-
-    elif rule_type == "psi_performance":
-        perf = value
-        if perf is not None:
-            formula = rule.get("formula", "")
-            if "value // 2" in formula:
-                points = perf // 2
-        else:
-            points = rule.get("fallback_score", 0) - rule.get("base_score", 0)
-        evidence.append(f"performance={perf}")
+def _compile_condition(condition: dict, slots: _FieldSlots) -> Callable[[tuple], bool]:
+    """Compile a weakness condition into a predicate over the per-page slot values."""
+    get = slots.getter(condition.get("field", ""))
+    operator = condition.get("operator", "")
+    expected = condition.get("value")
+
+    if operator == "not_present":
+        return lambda data: not get(data)
+    if operator == "not_contains":
+        needle = str(expected).lower()
+
+        def not_contains(data: tuple) -> bool:
+            value = get(data)
+            return isinstance(value, list) and not any(str(v).lower() == needle for v in value)
+
+        return not_contains
+    if operator == "less_than":
+        return lambda data: (get(data) or 0) < expected
+    if operator == "equals":
+        return lambda data: get(data) == expected
+    return lambda data: False
+
+
+class _TemplateField:
+    """Wraps a data value so str.format can resolve dotted fields like {psi.performance}."""
+
+    __slots__ = ("value",)
 
-    return points, evidence
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __getattr__(self, name: str) -> "_TemplateField":
+        return _TemplateField(self.value.get(name) if isinstance(self.value, dict) else None)
+
+    def __format__(self, spec: str) -> str:
+        return format(self.value, spec)
+
+
+def _compile_evidence(weak_config: dict, slots: _FieldSlots) -> Callable[[tuple], List[str]]:
+    template = weak_config.get("evidence_template", "")
+    if not template:
+        evidence = list(weak_config.get("evidence", []))
+        return lambda data: list(evidence)
+    parsed = list(string.Formatter().parse(template))
+    if any(f is not None and (not f or "[" in f or "{" in (spec or "")) for _, f, spec, _ in parsed):
+        # Indexing, positional or nested fields: let str.format resolve them
+        roots = tuple((r, slots.getter(r)) for r in {f.split(".")[0].split("[")[0] for _, f, _, _ in parsed if f})
+        return lambda data: [template.format_map({r: _TemplateField(get(data)) for r, get in roots})]
+
+    # Plain dotted fields: resolve each through a getter split once here
+    convert = {None: None, "s": str, "r": repr, "a": ascii}
+    parts = tuple(
+        (literal, slots.getter(f) if f is not None else None, spec or "", convert[conv])
+        for literal, f, spec, conv in parsed
+    )
+
+    def render(data: tuple) -> List[str]:
+        out: List[str] = []
+        for literal, get, spec, conv in parts:
+            out.append(literal)
+            if get is not None:
+                value = get(data)
+                out.append(format(conv(value) if conv else value, spec))
+        return ["".join(out)]
+    return render
+
+
+def _compile_dimensions(dim_configs: List[dict], rules_config: dict, slots: _FieldSlots) -> tuple:
+    # (name, rationale, base_score, max_score, rule closures)
+    return tuple(
+        (
+            dim_config["name"],
+            dim_config.get("rationale", ""),
+            dim_config.get("base_score", 0),
+            dim_config.get("max_score", 100),
+            tuple(_compile_rule(rule, rules_config, slots) for rule in dim_config.get("rules", [])),
+        )
+        for dim_config in dim_configs
+    )
+
+
+def _compile_scoring_rules(rules_config: Dict[str, Any]) -> tuple:
+    """Compile the YAML rules into flat tuples of closures so scoring skips dict plumbing.
+
+    Returns (aeo, geo, weaknesses, load_slots); load_slots turns the scoring data
+    dict into the slot tuple every compiled closure reads.
+    """
+    slots = _FieldSlots()
+    weaknesses = tuple(
+        (
+            _compile_condition(weak_config.get("condition", {}), slots),
+            weak_config["title"],
+            weak_config.get("impact", "med"),
+            _compile_evidence(weak_config, slots),
+            weak_config.get("fix_summary", ""),
+        )
+        for weak_config in rules_config.get("weaknesses", [])
+    )
+    aeo = _compile_dimensions(rules_config.get("aeo_dimensions", []), rules_config, slots)
+    geo = _compile_dimensions(rules_config.get("geo_dimensions", []), rules_config, slots)
+    return aeo, geo, weaknesses, slots.loader()
+
+
+# A broken rules file must not stop the app (or the worker) importing this module:
+# leave the rules uncompiled and let scoring compile them on first use
+_COMPILED_RULES: Optional[tuple]
+try:
+    _COMPILED_RULES = _compile_scoring_rules(_load_scoring_rules())
+except Exception as e:
+    logger.error(f"Scoring rules failed to compile at import, compiling on first use: {e}")
+    _COMPILED_RULES = None
+_compiled_rules_mtime_ns = _rules_mtime_ns()
+_compiled_rules_checked_at = time.monotonic()
+_compiled_rules_lock = threading.Lock()
+# How often scoring re-stats the YAML so edits are picked up without a restart
+RULES_RECHECK_SECONDS = 5.0
+
+
+def _compiled_scoring_rules() -> tuple:
+    """Return the compiled rules, recompiling if scoring_rules.yaml changed on disk.
+
+    A reload that fails keeps the last good rules; with none compiled yet, the error propagates.
+    """
+    global _COMPILED_RULES, _compiled_rules_mtime_ns, _compiled_rules_checked_at
+    if _COMPILED_RULES is not None and time.monotonic() - _compiled_rules_checked_at < RULES_RECHECK_SECONDS:
+        return _COMPILED_RULES
+    with _compiled_rules_lock:
+        _compiled_rules_checked_at = time.monotonic()
+        mtime_ns = _rules_mtime_ns()
+        if _COMPILED_RULES is None or mtime_ns != _compiled_rules_mtime_ns:
+            try:
+                _COMPILED_RULES = _compile_scoring_rules(_load_scoring_rules(reload=True))
+            except Exception as e:
+                if _COMPILED_RULES is None:
+                    raise
+                logger.error(f"Scoring rules reload failed, keeping the previous rules: {e}")
+            # Recorded even after a failed reload, so a broken file is only retried once it changes
+            _compiled_rules_mtime_ns = mtime_ns
+    return _COMPILED_RULES
+
+
+def _score_dimensions(compiled_dims: tuple, data: tuple) -> List[ScoreDimension]:
+    dims: List[ScoreDimension] = []
+    for name, rationale, base_score, max_score, rules in compiled_dims:
+        score = base_score
+        all_evidence: List[str] = []
+        for apply in rules:
+            rule_points, rule_evidence = apply(data)
+            score += rule_points
+            all_evidence.extend(rule_evidence)
+        dims.append(ScoreDimension(
+            name=name,
+            score=min(max_score, score),
+            rationale=rationale,
+            evidence=all_evidence
+        ))
+    return dims
+
+
+def _mean_score(dims: List[ScoreDimension]) -> int:
+    """Mean of the integer dimension scores, rounded half up in integer math (0 if none)."""
+    n = len(dims)
+    return (sum(d.score for d in dims) + n // 2) // n if n else 0
 
 
 def _compute_scores(page: dict, biz: dict, psi: dict) -> tuple[ScoresAEO, ScoresGEO, List[WeaknessItem]]:
     """Compute AEO and GEO scores based on external rules file."""
-    rules_config = _load_scoring_rules()
-    
+    aeo_rules, geo_rules, weakness_rules, load_slots = _compiled_scoring_rules()
+
     # Prepare unified data dict for rule evaluation
     data = {
         "faq_count": page.get("faq_count", 0),
@@ -699,89 +1123,25 @@ def _compute_scores(page: dict, biz: dict, psi: dict) -> tuple[ScoresAEO, Scores
         "internal_links": page.get("internal_links", 0),
         "text_len": page.get("text_len", 0),
         "links_text": page.get("links_text", []),
-        "html_lower": page.get("html_lower", ""),
+        "html_signals": page.get("html_signals", set()),
         "out_links": page.get("out_links", []),
         "psi": psi,
     }
+    # Resolve every field the rules read once; closures index into this tuple
+    values = load_slots(data)
 
-    # AEO dimensions
-    dims_aeo: List[ScoreDimension] = []
-    for dim_config in rules_config.get("aeo_dimensions", []):
-        score = dim_config.get("base_score", 0)
-        all_evidence = []
-        
-        for rule in dim_config.get("rules", []):
-            rule_points, rule_evidence = _apply_rule(rule, data, rules_config)
-            score += rule_points
-            all_evidence.extend(rule_evidence)
-        
-        score = min(dim_config.get("max_score", 100), score)
-        dims_aeo.append(ScoreDimension(
-            name=dim_config["name"],
-            score=score,
-            rationale=dim_config.get("rationale", ""),
-            evidence=all_evidence
-        ))
-    
-    total_aeo = int(round(sum(d.score for d in dims_aeo) / len(dims_aeo))) if dims_aeo else 0
+    dims_aeo = _score_dimensions(aeo_rules, values)
+    total_aeo = _mean_score(dims_aeo)
 
-    # GEO dimensions
-    dims_geo: List[ScoreDimension] = []
-    for dim_config in rules_config.get("geo_dimensions", []):
-        score = dim_config.get("base_score", 0)
-        all_evidence = []
-        
-        for rule in dim_config.get("rules", []):
-            rule_points, rule_evidence = _apply_rule(rule, data, rules_config)
-            score += rule_points
-            all_evidence.extend(rule_evidence)
-        
-        score = min(dim_config.get("max_score", 100), score)
-        dims_geo.append(ScoreDimension(
-            name=dim_config["name"],
-            score=score,
-            rationale=dim_config.get("rationale", ""),
-            evidence=all_evidence
-        ))
-    
-    total_geo = int(round(sum(d.score for d in dims_geo) / len(dims_geo))) if dims_geo else 0
+    dims_geo = _score_dimensions(geo_rules, values)
+    total_geo = _mean_score(dims_geo)
 
     # Weaknesses
-    weaknesses: List[WeaknessItem] = []
-    for weak_config in rules_config.get("weaknesses", []):
-        condition = weak_config.get("condition", {})
-        field = condition.get("field", "")
-        operator = condition.get("operator", "")
-        expected_value = condition.get("value")
-        
-        field_value = _get_nested_value(data, field)
-        triggered = False
-        
-        if operator == "not_present":
-            triggered = not field_value
-        elif operator == "not_contains":
-            if isinstance(field_value, list):
-                triggered = not any(str(v).lower() == str(expected_value).lower() for v in field_value)
-            else:
-                triggered = False
-        elif operator == "less_than":
-            triggered = (field_value or 0) < expected_value
-        elif operator == "equals":
-            triggered = field_value == expected_value
-        
-        if triggered:
-            evidence = weak_config.get("evidence", [])
-            evidence_template = weak_config.get("evidence_template", "")
-            if evidence_template:
-                # Simple template substitution
-                evidence = [evidence_template.format(**{k: _get_nested_value(data, k) for k in ["psi.performance", "internal_links", "text_len"]})]
-            
-            weaknesses.append(WeaknessItem(
-                title=weak_config["title"],
-                impact=weak_config.get("impact", "med"),
-                evidence=evidence,
-                fix_summary=weak_config.get("fix_summary", "")
-            ))
+    weaknesses: List[WeaknessItem] = [
+        WeaknessItem(title=title, impact=impact, evidence=evidence(values), fix_summary=fix_summary)
+        for triggered, title, impact, evidence, fix_summary in weakness_rules
+        if triggered(values)
+    ]
 
     return (
         ScoresAEO(total=total_aeo, dimensions=dims_aeo),
@@ -795,24 +1155,48 @@ def _compute_scores(page: dict, biz: dict, psi: dict) -> tuple[ScoresAEO, Scores
 # ============================
 
 
-@router.post("/run", response_model=OrchestratorOutput)
-def run_orchestration(payload: OrchestratorInput) -> OrchestratorOutput:
-    start = time.time()
+# The PSI and KeyBERT probes hit the same constant inputs on every /run, so their results
+# are reused across requests: successes for HEALTH_CACHE_TTL_SECONDS, failures only for
+# HEALTH_CACHE_FAILURE_TTL_SECONDS so a broken dependency is retried soon but not pounded.
+# Process-local; a restart starts cold.
+HEALTH_CACHE_TTL_SECONDS = 60
+HEALTH_CACHE_FAILURE_TTL_SECONDS = 10
+_HEALTH_CACHE: Dict[str, tuple[float, Any]] = {}
+_health_cache_lock = threading.Lock()
+
+
+def _cached(key: str, ttl: float, fn: Callable[[], tuple[HealthService, List[str]]]) -> tuple[HealthService, List[str]]:
+    """Return fn()'s (service, notes), reusing a result younger than its TTL."""
+    now = time.monotonic()
+    with _health_cache_lock:
+        hit = _HEALTH_CACHE.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    result = fn()
+    if not result[0].ok:
+        ttl = min(ttl, HEALTH_CACHE_FAILURE_TTL_SECONDS)
+    with _health_cache_lock:
+        _HEALTH_CACHE[key] = (time.monotonic() + ttl, result)
+    return result
+
+
+# Health results for services that are disabled or not wired up yet; shared, never mutated
+_PSI_DISABLED_RESULT: tuple[HealthService, List[str]] = (HealthService(name="psi", ok=True, details={"perf": None}), [])
+_SCHEMA_PARSER_RESULT: tuple[HealthService, List[str]] = (HealthService(name="schema_parser", ok=True, details={}), [])
+_GBP_LOOKUP_RESULT: tuple[HealthService, List[str]] = (HealthService(name="gbp_lookup", ok=False, details={}), [])
+_GEOCODER_RESULT: tuple[HealthService, List[str]] = (HealthService(name="geocoder", ok=False, details={}), [])
+
+
+def _probe_backend(backend_base_url: Optional[str]) -> tuple[HealthService, List[str]]:
+    """Backend health: internal (8000) first, then the external base URL if given."""
     notes: List[str] = []
-
-    # Health checks
-    services: List[HealthService] = []
-    errors: List[str] = []
-    all_ok = True
-
-    # 1) backend health
     ok = False
     bh_details: Dict[str, Any] = {}
     internal_url = f"{get_self_base_url()}/api/v1/utils/health-check/"
-    external_url = f"{payload.backend_base_url}/api/v1/utils/health-check/" if payload.backend_base_url else None
+    external_url = f"{backend_base_url}/api/v1/utils/health-check/" if backend_base_url else None
     # Try internal (8000) first
     try:
-        r = requests.get(internal_url, timeout=5)
+        r = _HTTP_CLIENT.get(internal_url, timeout=5)
         if r.status_code == 200:
             ok = True
             bh_details = {"status": 200, "url": internal_url}
@@ -821,47 +1205,60 @@ def run_orchestration(payload: OrchestratorInput) -> OrchestratorOutput:
     # Fallback to external (8001) if needed
     if not ok and external_url:
         try:
-            r2 = requests.get(external_url, timeout=5)
+            r2 = _HTTP_CLIENT.get(external_url, timeout=5)
             if r2.status_code == 200:
                 ok = True
                 bh_details = {"status": 200, "url": external_url}
         except Exception as e:
             notes.append(f"backend_health_external_error: {e}")
-    services.append(HealthService(name="backend_health", ok=ok, details=bh_details)) ; all_ok = all_ok and ok
+    return HealthService(name="backend_health", ok=ok, details=bh_details), notes
+
+
+def _probe_psi() -> tuple[HealthService, List[str]]:
+    return _cached("psi", HEALTH_CACHE_TTL_SECONDS, _probe_psi_example)
 
-    # 2) PSI
+
+def _probe_psi_example() -> tuple[HealthService, List[str]]:
+    """PSI warmup against example.com."""
+    notes: List[str] = []
     psi_ok = True
     psi_details: Dict[str, Any] = {"perf": None}
-    if payload.features.use_lighthouse:
-        try:
-            psi_test = fetch_psi("https://example.com/")
-            psi_ok = bool(psi_test.get("available"))
-            psi_details["perf"] = psi_test.get("performance")
-            if not psi_ok:
-                notes.append("psi_unavailable")
-        except Exception as e:
-            psi_ok = False
-            notes.append(f"psi_error: {e}")
-    services.append(HealthService(name="psi", ok=psi_ok, details=psi_details)); all_ok = all_ok and psi_ok
+    try:
+        psi_test = fetch_psi("https://example.com/")
+        psi_ok = bool(psi_test.get("available"))
+        psi_details["perf"] = psi_test.get("performance")
+        if not psi_ok:
+            notes.append("psi_unavailable")
+    except Exception as e:
+        psi_ok = False
+        notes.append(f"psi_error: {e}")
+    return HealthService(name="psi", ok=psi_ok, details=psi_details), notes
+
 
-    # 3) KeyBERT
+def _probe_keybert() -> tuple[HealthService, List[str]]:
+    return _cached("keybert", HEALTH_CACHE_TTL_SECONDS, _probe_keybert_sample)
+
+
+def _probe_keybert_sample() -> tuple[HealthService, List[str]]:
+    """KeyBERT warmup on a constant sample sentence."""
+    notes: List[str] = []
     kb_ok = True
     try:
         sample = "Local injury lawyer near Irving TX free consultation personal injury law firm"
-        phrases = extract_keyphrases(sample, top_n=8, timeout_ms=1500, cache_key="healthcheck")
+        phrases = extract_keyphrases(sample, top_n=8, timeout_ms=1500)
         kb_ok = len(phrases) >= 3
         if not kb_ok:
             notes.append("keybert_few_phrases")
     except Exception as e:
         kb_ok = False
         notes.append(f"keybert_error: {e}")
-    services.append(HealthService(name="keybert", ok=kb_ok, details={})) ; all_ok = all_ok and kb_ok
+    return HealthService(name="keybert", ok=kb_ok, details={}), notes
 
-    # 4) Schema parser (we'll validate later after fetch)
-    schema_parser_ok = True
-    services.append(HealthService(name="schema_parser", ok=schema_parser_ok, details={})) ; all_ok = all_ok and schema_parser_ok
 
-    # 5) SSRF guard
+@lru_cache(maxsize=1)
+def _probe_ssrf() -> tuple[HealthService, List[str]]:
+    """SSRF guard self-test; its input is constant, so it runs once per process."""
+    notes: List[str] = []
     ssrf_ok = True
     try:
         try:
@@ -872,115 +1269,219 @@ def run_orchestration(payload: OrchestratorInput) -> OrchestratorOutput:
     except Exception as e:
         ssrf_ok = False
         notes.append(f"ssrf_check_error: {e}")
-    services.append(HealthService(name="ssrf_guard", ok=ssrf_ok, details={})) ; all_ok = all_ok and ssrf_ok
+    return HealthService(name="ssrf_guard", ok=ssrf_ok, details={}), notes
 
-    # 6) Optional GBP lookup / geocoder
-    services.append(HealthService(name="gbp_lookup", ok=False, details={})) ; all_ok = False if payload.features.use_gbp_lookup else all_ok
-    services.append(HealthService(name="geocoder", ok=False, details={})) ; all_ok = False if payload.features.use_map_geocode else all_ok
 
-    # Fetch & normalize
+def _probe_crewai() -> HealthService:
+    """CrewAI / LLM availability: list Ollama tags when CrewAI is enabled."""
     try:
-        validate_url_or_raise(payload.url)
-    except SSRFProtectionError as e:
-        errors.append(str(e))
-    final_url, status_code = _resolve_final_url(payload.url)
+        crew_enabled = bool(settings.CREW_AI_ENABLED)
+        base_url = _resolve_llm_base_url(os.getenv("OLLAMA_HOST"))
+        ok_ai = False
+        details_ai: dict = {"enabled": crew_enabled, "base_url": base_url}
+        if crew_enabled:
+            try:
+                # Ollama health probe: list tags/models
+                r = _HTTP_CLIENT.get(f"{base_url}/api/tags", timeout=2.0)
+                details_ai["status_code"] = r.status_code
+                if r.status_code == 200:
+                    ok_ai = True
+            except Exception as e:
+                details_ai["error"] = str(e)
+        # If disabled, report but do not fail overall health
+        return HealthService(name="crewai", ok=ok_ai if crew_enabled else False, details=details_ai)
+    except Exception as e:
+        return HealthService(name="crewai", ok=False, details={"error": f"probe_failed: {e}"})
+
 
-    # async fetch_html via anyio
+def _fetch_target(url: str) -> tuple[str, Optional[int], str, bytes, str, List[str]]:
+    """Fetch the target page; failures become notes instead of raising."""
+    notes: List[str] = []
+    final_url, status_code = url, None
     html: str = ""
-    html_ms = 0
+    body, encoding = b"", "utf-8"
     try:
-        import anyio
         timeout_s = int(os.getenv("EXTRACT_TIMEOUT_SECONDS", "20"))
-        html, html_ms = anyio.run(fetch_html, final_url, timeout_s)
+        final_url, status_code, html, body, encoding, _ = _fetch_page_body(url, timeout_s)
+        if not html and status_code is not None and status_code >= 400:
+            notes.append(f"html_fetch_error: HTTP {status_code}")
     except Exception as e:
         notes.append(f"html_fetch_error: {e}")
+    return final_url, status_code, html, body, encoding, notes
 
-    # Parse HTML
-    basic = _parse_html_basic(html, final_url)
-    canonical = basic.get("canonical")
+
+def _fetch_target_psi(final_url: str) -> tuple[dict, dict, List[str]]:
+    """PSI on the target page as (raw psi, response block, notes)."""
+    psi_block = {"performance": None, "seo": None, "accessibility": None, "best_practices": None, "top_opportunities": []}
+    psi: dict = {}
+    notes: List[str] = []
+    try:
+        psi = fetch_psi(final_url)
+        psi_block["performance"] = psi.get("performance")
+        psi_block["seo"] = psi.get("seo")
+        # Accessibility & Best Practices not returned by our helper yet
+        psi_block["accessibility"] = None
+        psi_block["best_practices"] = None
+    except Exception as e:
+        notes.append(f"psi_fetch_error: {e}")
+    return psi, psi_block, notes
+
+
+# _analyze_page results for recently fetched (final_url, html digest, use_keybert), oldest
+# first: re-running an unchanged page skips parsing, extraction and keyphrases. The response
+# is built from these dicts without copying, so entries are deep-copied on store and on hit.
+PAGE_CACHE_TTL_SECONDS = 300
+PAGE_CACHE_MAX_ENTRIES = 1024
+_page_cache: Dict[tuple[str, bytes, bool], tuple[Dict[str, Any], float]] = {}
+_page_cache_lock = threading.Lock()
+
+
+def _analyze_page_cached(html: str, body: bytes, encoding: str, final_url: str, use_keybert: bool) -> Dict[str, Any]:
+    """:func:`_analyze_page` memoized on the page content for PAGE_CACHE_TTL_SECONDS."""
+    key = (final_url, html_digest(html), use_keybert)
+    with _page_cache_lock:
+        hit = _page_cache.get(key)
+    if hit is not None and time.time() - hit[1] < PAGE_CACHE_TTL_SECONDS:
+        return copy.deepcopy(hit[0])
+    page = _analyze_page(html, body, encoding, final_url, use_keybert)
+    if not page["notes"]:
+        # Keyphrase errors may be transient, so only clean results are reused
+        with _page_cache_lock:
+            _page_cache.pop(key, None)
+            _page_cache[key] = (copy.deepcopy(page), time.time())
+            while len(_page_cache) > PAGE_CACHE_MAX_ENTRIES:
+                del _page_cache[next(iter(_page_cache))]
+    return page
+
+
+def _analyze_page(html: str, body: bytes, encoding: str, final_url: str, use_keybert: bool) -> Dict[str, Any]:
+    """CPU-bound page analysis: parse once, extract content/business signals and keyphrases."""
+    # Parse HTML once; the lxml tree is shared by every extractor below. lxml takes the
+    # raw bytes directly unless decoding had to replace invalid sequences (U+FFFD in html).
+    tree = parse_html_tree(body, encoding) if body and "\ufffd" not in html else parse_html_tree(html)
+    basic = _parse_html_basic(html, final_url, tree=tree)
 
     # Structured data summary (safe & compact)
-    sd_summary, faq_count, schema_raw = _extract_structured_data_summary(html, final_url)
+    sd_summary, faq_count, schema_raw = _extract_structured_data_summary(html, final_url, tree=tree)
     basic["schema_types"] = sd_summary.types
     basic["faq_count"] = faq_count
 
-    # Text length
+    # Text length. Text extraction dominates this function and holds the GIL for most
+    # of its run, so it stays inline: a side thread for it measured no gain.
     text_len = 0
-    html_lower = (html or "").lower()
+    html_signals = scan_html_signals(html)
     try:
-        import trafilatura
-        text = trafilatura.extract(html, output_format="txt", include_comments=False) or ""
+        text = extract_text(tree, html) if tree is not None else ""
         text_len = len(text)
     except Exception:
         text = ""
     basic["text_len"] = text_len
-    basic["html_lower"] = html_lower
+    basic["html_signals"] = html_signals
 
     # Collect visible link texts for E-E-A-T heuristic
-    from bs4 import BeautifulSoup
-    soup = BeautifulSoup(html or "", "html.parser")
-    links_text = [a.get_text(strip=True) for a in soup.find_all("a") if a.get_text(strip=True)]
-    out_links = [a.get("href") or "" for a in soup.find_all("a")]
+    links_text: List[str] = []
+    out_links: List[str] = []
+    for a in tree.iter("a") if tree is not None else ():
+        label = a.text_content().strip()
+        if label:
+            links_text.append(label)
+        out_links.append(a.get("href") or "")
     basic["links_text"] = links_text
     basic["out_links"] = out_links
 
     # Business entity with local SEO signals
-    biz_data = _extract_business_entity(schema_raw, html, html_lower, out_links)
-
-    # 5) CrewAI / LLM availability (optional)
-    from app.core.config import settings as _settings
-    try:
-        import os as _os
-        from app.services.llm_factory import _resolve_base_url as _llm_resolve
-        crew_enabled = bool(_settings.CREW_AI_ENABLED)
-        base_url = _llm_resolve(_os.getenv("OLLAMA_HOST"))
-        ok_ai = False
-        details_ai: dict = {"enabled": crew_enabled, "base_url": base_url}
-        if crew_enabled:
-            try:
-                with httpx.Client(timeout=2.0) as client:
-                    # Ollama health probe: list tags/models
-                    r = client.get(f"{base_url}/api/tags")
-                    details_ai["status_code"] = r.status_code
-                    if r.status_code == 200:
-                        ok_ai = True
-            except Exception as e:
-                details_ai["error"] = str(e)
-        # If disabled, report but do not fail overall health
-        services.append(HealthService(name="crewai", ok=ok_ai if crew_enabled else False, details=details_ai))
-        all_ok = (all_ok and ok_ai) if crew_enabled else all_ok
-    except Exception as e:
-        services.append(HealthService(name="crewai", ok=False, details={"error": f"probe_failed: {e}"}))
-        all_ok = all_ok
-
-    # GBP & Geocode stubs
-    gbp = {"matched": False, "place_id": None, "short_summary": None}
-    geo = {"lat": None, "lng": None}
-
-    # PSI on target
-    psi_block = {"performance": None, "seo": None, "accessibility": None, "best_practices": None, "top_opportunities": []}
-    psi = {}
-    if payload.features.use_lighthouse:
-        try:
-            psi = fetch_psi(final_url)
-            psi_block["performance"] = psi.get("performance")
-            psi_block["seo"] = psi.get("seo")
-            # Accessibility & Best Practices not returned by our helper yet
-            psi_block["accessibility"] = None
-            psi_block["best_practices"] = None
-        except Exception as e:
-            notes.append(f"psi_fetch_error: {e}")
+    biz_data = _extract_business_entity(schema_raw, html, html_signals, out_links)
 
     # Keyphrases
+    notes: List[str] = []
     phrases: List[PhraseItem] = []
-    if payload.features.use_keybert and text:
+    if use_keybert and text:
         try:
-            kp = extract_keyphrases(text, top_n=8, timeout_ms=int(os.getenv("KEYPHRASES_TIMEOUT_MS", "2000")), cache_key=final_url)
+            kp = extract_keyphrases(text, top_n=8, timeout_ms=int(os.getenv("KEYPHRASES_TIMEOUT_MS", "2000")))
+            # Intent depends only on the page text, so decide it once for every phrase
+            intent = keyphrase_intent(text)
             for i, p in enumerate(kp):
-                phrases.append(PhraseItem(phrase=p, weight=max(0.1, 1.0 - i * 0.05), intent=("Local" if " tx" in text.lower() or " texas" in text.lower() else "Informational")))
+                phrases.append(PhraseItem(phrase=p, weight=max(0.1, 1.0 - i * 0.05), intent=intent))
         except Exception as e:
             notes.append(f"keyphrases_error: {e}")
 
+    return {
+        "basic": basic,
+        "sd_summary": sd_summary,
+        "faq_count": faq_count,
+        "biz_data": biz_data,
+        "phrases": phrases,
+        "notes": notes,
+    }
+
+
+@router.post("/run", response_model=OrchestratorOutput)
+async def run_orchestration(payload: OrchestratorInput) -> OrchestratorOutput:
+    start = time.time()
+    notes: List[str] = []
+
+    f = payload.features
+    services: List[HealthService] = []
+    errors: List[str] = []
+    all_ok = True
+
+    try:
+        validate_url_or_raise(payload.url)
+    except SSRFProtectionError as e:
+        errors.append(str(e))
+
+    # Health services in report order as (probe or static result, counts toward
+    # all_services_ok). Disabled and stub services are shared static records, so only
+    # real probes run; those and the target fetch are independent blocking I/O, run in
+    # worker threads at once so the event loop stays free and the fetch overlaps them
+    health_plan = (
+        (partial(_probe_backend, payload.backend_base_url), True),
+        (_probe_psi if f.use_lighthouse else _PSI_DISABLED_RESULT, True),
+        (_probe_keybert, True),
+        (_SCHEMA_PARSER_RESULT, True),
+        (_probe_ssrf, True),
+        (_GBP_LOOKUP_RESULT, f.use_gbp_lookup),
+        (_GEOCODER_RESULT, f.use_map_geocode),
+    )
+    probes = [probe for probe, _ in health_plan if callable(probe)]
+    *probe_results, crewai_service, (final_url, status_code, html, body, encoding, fetch_notes) = await asyncio.gather(
+        *(asyncio.to_thread(probe) for probe in probes),
+        asyncio.to_thread(_probe_crewai),
+        asyncio.to_thread(_fetch_target, payload.url),
+    )
+    ran = iter(probe_results)
+    for probe, counts in health_plan:
+        service, probe_notes = next(ran) if callable(probe) else probe
+        services.append(service)
+        notes.extend(probe_notes)
+        if counts:
+            all_ok = all_ok and service.ok
+
+    notes.extend(fetch_notes)
+
+    # 7) CrewAI / LLM availability (optional); only fails health when enabled
+    services.append(crewai_service)
+    if crewai_service.details.get("enabled"):
+        all_ok = all_ok and crewai_service.ok
+
+    # GBP & Geocode stubs
+    gbp = {"matched": False, "place_id": None, "short_summary": None}
+    geo = {"lat": None, "lng": None}
+
+    # PSI on the target only needs final_url, so it runs alongside page analysis
+    analyze = asyncio.to_thread(_analyze_page_cached, html, body, encoding, final_url, f.use_keybert)
+    if f.use_lighthouse:
+        page, (psi, psi_block, psi_notes) = await asyncio.gather(analyze, asyncio.to_thread(_fetch_target_psi, final_url))
+    else:
+        page = await analyze
+        psi, psi_notes = {}, []
+        psi_block = {"performance": None, "seo": None, "accessibility": None, "best_practices": None, "top_opportunities": []}
+    notes.extend(psi_notes)
+    notes.extend(page["notes"])
+    basic, sd_summary, faq_count = page["basic"], page["sd_summary"], page["faq_count"]
+    biz_data, phrases = page["biz_data"], page["phrases"]
+    canonical = basic.get("canonical")
+
     # Scores & weaknesses
     aeo, geo_scores, weaknesses = _compute_scores({
         **basic,
@@ -992,34 +1493,35 @@ def run_orchestration(payload: OrchestratorInput) -> OrchestratorOutput:
 
     # Competitors (stub)
     competitors: List[CompetitorItem] = []
-    if payload.features.use_competitors_probe and biz_data.get("name"):
+    if f.use_competitors_probe and biz_data.get("name"):
         # In local dev, skip live search; return empty
         competitors = []
 
     # Checkout gating
     if payload.free_test_mode:
-        checkout = CheckoutOutput(status="skipped_free_test", stripe_checkout_url=None, premium_access=False)
+        checkout = CheckoutOutput.model_construct(status="skipped_free_test", stripe_checkout_url=None, premium_access=False)
     else:
         # Stripe integration not wired here; degrade gracefully
-        checkout = CheckoutOutput(status="error", stripe_checkout_url=None, premium_access=False)
+        checkout = CheckoutOutput.model_construct(status="error", stripe_checkout_url=None, premium_access=False)
         notes.append("stripe_not_configured")
 
     # Health assemble
-    health = HealthOutput(
+    health = HealthOutput.model_construct(
         all_services_ok=all_ok,
         services=services,
         errors=errors,
     )
 
-    # Final output build
+    # Final output build. Everything below is server-generated and FastAPI validates the
+    # response against response_model once, so the models skip their own validation.
     elapsed_ms = int((time.time() - start) * 1000)
     status = "ok" if not errors else ("degraded" if not all_ok else "ok")
 
-    return OrchestratorOutput(
+    return OrchestratorOutput.model_construct(
         status=status if all_ok else "degraded",
         health=health,
-        target=TargetOutput(input_url=payload.url, final_url=final_url, http_status=status_code, canonical=canonical),
-        business=BusinessOutput(
+        target=TargetOutput.model_construct(input_url=payload.url, final_url=final_url, http_status=status_code, canonical=canonical),
+        business=BusinessOutput.model_construct(
             name=biz_data.get("name"),
             dba=biz_data.get("dba"),
             phone=biz_data.get("phone"),
@@ -1032,36 +1534,33 @@ def run_orchestration(payload: OrchestratorInput) -> OrchestratorOutput:
             hours=biz_data.get("hours"),
             categories=biz_data.get("categories") or [],
             service_areas=biz_data.get("service_areas") or [],
-            geo=BusinessGeo(**geo),
-            gbp=BusinessGBP(**gbp),
+            geo=BusinessGeo.model_construct(**geo),
+            gbp=BusinessGBP.model_construct(**gbp),
             nap_detected=biz_data.get("nap_detected", False),
             localbusiness_schema_detected=biz_data.get("localbusiness_schema_detected", False),
             organization_schema_detected=biz_data.get("organization_schema_detected", False),
             google_business_hint=biz_data.get("google_business_hint", False),
             apple_business_connect_hint=biz_data.get("apple_business_connect_hint", False),
         ),
-        content=ContentOutput(
+        content=ContentOutput.model_construct(
             title=basic.get("title"),
             meta_description=basic.get("meta_description"),
-            headings=ContentHeadings(**basic.get("headings", {"h1": [], "h2": [], "h3": []})),
+            headings=ContentHeadings.model_construct(**basic.get("headings", {"h1": [], "h2": [], "h3": []})),
             schema_types=basic.get("schema_types", []),
             structured_data_summary=sd_summary,
             faq_count=basic.get("faq_count", 0),
             internal_links=basic.get("internal_links", 0),
             external_links=basic.get("external_links", 0),
         ),
-        scores=ScoresOutput(
+        scores=ScoresOutput.model_construct(
             aeo=aeo,
             geo=geo_scores,
-            psi=ScoresPSI(**psi_block),
+            psi=ScoresPSI.model_construct(**psi_block),
         ),
         keyphrases=phrases,
         weaknesses=weaknesses,
         competitors=competitors,
-        dashboards=DashboardsOutput(
-            preview=DashPreview(business_header=True, map_pin=True, components=["scores_dials", "psi_snapshot", "weakness_list", "benefit_blurb", "cta"]),
-            premium=DashPremium(enabled=False, components=["deep_tasks", "competitor_table", "citation_audit", "history_trends", "report_export"]),
-        ),
+        dashboards=_DASHBOARDS,
         checkout=checkout,
-        telemetry=TelemetryOutput(elapsed_ms=elapsed_ms, notes=notes),
+        telemetry=TelemetryOutput.model_construct(elapsed_ms=elapsed_ms, notes=notes),
     )
@@ -1,23 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import os
+import re
+import threading
 import time
 import json
+import traceback
+from collections import deque
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 import uuid
 
 import requests
-from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict
 import logging
 from app.services.lighthouse import fetch_psi
 from app.services.crewai_reasoner import generate_recommendations
 from app.services.rules_loader import get_rules
-from app.services.check_engine import evaluate_rules
+from app.services.check_engine import compile_rules, evaluate_rules
 from app.utils.url_validator import validate_url_or_raise, SSRFProtectionError
 from app.services.keyphrases import extract_keyphrases
-from app.services.fetcher import fetch_html, extract_title as bs_extract_title
+from app.services.fetcher import (
+    HTMLTooLargeError,
+    MAX_HTML_BYTES,
+    extract_structured_data,
+    extract_text,
+    extract_title_from_tree,
+    fetch_page_sync,
+    html_digest,
+    parse_html_tree,
+    resolve_base_url,
+)
 from app.metrics import (
     track_scan_request,
     track_scan_stage,
@@ -28,25 +47,104 @@ from app.metrics import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/scan", tags=["scan"]) 
 
+# Extraction libraries; extract_local reports a configuration error when one is missing
+try:
+    import extruct  # noqa: F401
+    import trafilatura  # noqa: F401
+    import w3lib  # noqa: F401
+    _EXTRACT_IMPORT_ERROR: Optional[ImportError] = None
+except ImportError as e:
+    _EXTRACT_IMPORT_ERROR = e
+
+# orjson decodes/encodes in C; fall back to stdlib json when it isn't installed
+try:
+    from orjson import loads as _json_loads  # type: ignore
+    from fastapi.responses import ORJSONResponse as _ScanJSONResponse
+except ImportError:
+    _json_loads = json.loads
+    _ScanJSONResponse = JSONResponse  # type: ignore[misc]
+
 # Basic concurrency and rate limiting
-import asyncio
 _scan_semaphore = asyncio.Semaphore(int(os.getenv("SCAN_MAX_CONCURRENCY", "3")))
 _rate_window_seconds = 60
 _rate_limit_per_min = int(os.getenv("SCAN_RATE_LIMIT_PER_MIN", "30"))
-_rate_counters: dict[str, list[float]] = {}
+_rate_counters: dict[str, deque[float]] = {}
 _rate_lock = asyncio.Lock()
 
+# Fixed-window counter shared by every worker: INCR and the first-hit EXPIRE run
+# atomically server-side, so one round trip decides the request
+_RATE_LUA = """
+local n = redis.call('INCR', KEYS[1])
+if n == 1 then redis.call('EXPIRE', KEYS[1], ARGV[1]) end
+return n
+"""
+# While Redis is down the in-process limiter is used, and Redis is retried after this backoff;
+# the switch and the recovery are each logged once
+RATE_REDIS_RETRY_SECONDS = 30.0
+_rate_redis_down = False
+_rate_redis_retry_at = 0.0
+
+# http(s) scheme prefix, compiled once for the per-request format check
+_SCHEME_RE = re.compile(r"https?://", re.IGNORECASE)
+
+# Shared keep-alive session for third-party scrape APIs (Firecrawl) so TLS is set up once;
+# gateway errors are retried briefly since a scrape has no side effects
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=None),
+))
+atexit.register(_HTTP_SESSION.close)
+
+# Read once at import, like the other scan settings; the fallback is off without a key
+_FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
+_FIRECRAWL_SCRAPE_URL = "https://api.firecrawl.dev/v1/scrape"
+_FIRECRAWL_FORMATS = ["markdown", "html", "extract"]
+
+
+# Extraction results for recently fetched (url, html digest) pairs, oldest first: re-scanning
+# an unchanged page skips parsing, text extraction, extruct and keyphrases
+EXTRACT_CACHE_TTL_SECONDS = 300
+EXTRACT_CACHE_MAX_ENTRIES = 1024
+_extract_cache: Dict[tuple[str, bytes], tuple["ScanResponse", float]] = {}
+_extract_cache_lock = threading.Lock()
+
+# Rules with their JMESPath expressions pre-parsed, rebuilt only when get_rules reports a new mtime
+_RULES_CACHE: Dict[str, Any] = {"mtime": None, "rules": None}
+_rules_cache_lock = threading.Lock()
+
+
+def _compiled_rules() -> List[Any]:
+    """Compiled check rules; stats (and may reload) the YAML, so call it off the event loop."""
+    rules, mtime = get_rules()
+    with _rules_cache_lock:
+        if mtime != _RULES_CACHE["mtime"] or _RULES_CACHE["rules"] is None:
+            _RULES_CACHE["rules"] = compile_rules(rules)
+            _RULES_CACHE["mtime"] = mtime
+        return _RULES_CACHE["rules"]
+
 
 class ScanRequest(BaseModel):
     url: str
 
 
 class MetadataSummary(BaseModel):
+    # Frozen so one instance can be shared between responses
+    model_config = ConfigDict(frozen=True)
+
     json_ld_count: int = 0
     microdata_count: int = 0
     opengraph_count: int = 0
 
 
+# Zero-count summary shared by every error response
+_EMPTY_SUMMARY = MetadataSummary()
+
+# ScanResponse fields the LLM prompt and the YAML rules read (as scan.*)
+_SCAN_SUBSET_FIELDS = {"url", "title", "description", "text_preview", "schemas", "metadata_summary", "keyphrases"}
+
+
 class ScanResponse(BaseModel):
     url: str
     title: Optional[str] = None
@@ -64,36 +162,34 @@ class ScanResponse(BaseModel):
 
 
 @router.get("/", response_model=ScanResponse)
-def scan_url_get(url: str, request: Request) -> ScanResponse:
+async def scan_url_get(url: str, request: Request) -> Response:
     """GET variant for scanning, to support `?url=` usage."""
-    return scan_url(ScanRequest(url=url), request)
+    return await scan_url(ScanRequest(url=url), request)
 
 
 def extract_local(url: str) -> ScanResponse:
     """
-    Download HTML and extract metadata using requests + trafilatura + extruct.
+    Download HTML and extract metadata using httpx + trafilatura + extruct.
+    The page is parsed once with lxml and that tree is handed to every extractor.
     Returns proper error messages for timeout, SSL, DNS, and HTTP errors.
     """
-    try:
-        import trafilatura
-        import extruct
-        from w3lib.html import get_base_url
-    except ImportError as e:
-        logger.error(f"Missing library: {e}")
+    if _EXTRACT_IMPORT_ERROR is not None:
+        logger.error(f"Missing library: {_EXTRACT_IMPORT_ERROR}")
         return ScanResponse(
             url=url,
-            error=f"Server configuration error: Missing library {e}",
-            metadata_summary=MetadataSummary(),
+            error=f"Server configuration error: Missing library {_EXTRACT_IMPORT_ERROR}",
+            metadata_summary=_EMPTY_SUMMARY,
         )
 
-    # Fetch HTML with async httpx client (timed)
+    # Fetch HTML over the shared keep-alive pool (timed)
     try:
-        import anyio
         timeout_s = int(os.getenv("EXTRACT_TIMEOUT_SECONDS", "20"))
-        html, html_ms = anyio.run(fetch_html, url, timeout_s)
+        html, body, encoding, html_ms = fetch_page_sync(url, timeout_s)
     except Exception as e:
         emsg = str(e)
-        if "timed out" in emsg.lower():
+        if isinstance(e, HTMLTooLargeError):
+            detail = f"Response too large - page exceeds {MAX_HTML_BYTES // (1024 * 1024)} MB limit"
+        elif "timed out" in emsg.lower():
             detail = "Request timeout - website took too long to respond"
         elif "ssl" in emsg.lower():
             detail = "SSL certificate error - website may have invalid HTTPS configuration"
@@ -104,19 +200,34 @@ def extract_local(url: str) -> ScanResponse:
         else:
             detail = f"Unexpected error: {emsg}"
         logger.warning(json.dumps({"event": "html_fetch_failed", "url": url, "error": emsg}))
-        return ScanResponse(url=url, error=detail, metadata_summary=MetadataSummary())
+        return ScanResponse(url=url, error=detail, metadata_summary=_EMPTY_SUMMARY)
+
+    # Unchanged page since a recent scan: reuse its extraction, with this fetch's timing
+    cache_key = (url, html_digest(html))
+    with _extract_cache_lock:
+        hit = _extract_cache.get(cache_key)
+    if hit is not None and time.time() - hit[1] < EXTRACT_CACHE_TTL_SECONDS:
+        return hit[0].model_copy(update={"timings": {"html_ms": html_ms, "keyphrases_ms": 0}}, deep=True)
+
+    # Parse once with lxml; the title, trafilatura and extruct all work from this tree. libxml2
+    # takes the raw bytes directly unless decoding had to replace invalid sequences (U+FFFD).
+    tree = parse_html_tree(body, encoding) if body and "\ufffd" not in html else parse_html_tree(html)
+    doc = tree if tree is not None else html
+    base_url = resolve_base_url(tree, html, url)
+
+    # Title from the tree (with meta/h1/hostname fallbacks)
+    title, _title_source = extract_title_from_tree(tree, url)
 
-    # Title via BeautifulSoup (with meta/h1/hostname fallbacks)
-    title = bs_extract_title(html, url)
-    base_url = get_base_url(html, url)
+    # The stages below share one tree and run in order: they hold the GIL for most of their
+    # run, and extruct on a side thread measured no gain (2.5 ms vs 2.2 ms on a 34 KB page).
+    # Whole scans already overlap at the route level (extraction alongside PSI).
 
     try:
         # Extract readable text
         try:
-            text = trafilatura.extract(html, output_format="txt", include_comments=False) or ""
+            text = extract_text(doc, html)
             text_preview = text[:500] if text else None
         except Exception as e:
-            import traceback
             logger.error(f"Trafilatura error for {url}: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
             text = ""
@@ -129,18 +240,19 @@ def extract_local(url: str) -> ScanResponse:
             kp_start = time.time()
             top_n = int(os.getenv("KEYPHRASES_TOP_N", "8"))
             timeout_ms = int(os.getenv("KEYPHRASES_TIMEOUT_MS", "2000"))
-            keyphrases = extract_keyphrases(text or "", top_n=top_n, timeout_ms=timeout_ms, cache_key=url)
+            keyphrases = extract_keyphrases(text or "", top_n=top_n, timeout_ms=timeout_ms)
             keyphrases_ms = int((time.time() - kp_start) * 1000)
         except Exception as e:
             keyphrases_ms = int((time.time() - kp_start) * 1000)
             logger.warning(json.dumps({"event":"keyphrases_failed","url":url,"error":str(e),"duration_ms": keyphrases_ms}))
 
-        # Extract metadata (defensive against library return shape changes)
+        # Extract metadata (defensive against library return shape changes); extruct only
+        # runs for syntaxes whose markers the tree has, so structureless pages skip it
         try:
-            metadata = extruct.extract(
-                html,
-                base_url=base_url,
-                syntaxes=["json-ld", "microdata", "opengraph"],
+            metadata = extract_structured_data(
+                doc,
+                base_url,
+                ["json-ld", "microdata", "opengraph"],
             )
         except Exception as e:
             logger.warning(json.dumps({
@@ -158,13 +270,10 @@ def extract_local(url: str) -> ScanResponse:
             }))
             metadata = {}
 
-        # Build schemas list and counts
-        schemas: List[Dict[str, Any]] = []
-        json_ld_items = metadata.get("json-ld", []) if isinstance(metadata, dict) else []
-        microdata_items = metadata.get("microdata", []) if isinstance(metadata, dict) else []
-        opengraph_items = metadata.get("opengraph", []) if isinstance(metadata, dict) else []
-
-        # Normalize potential unexpected shapes to lists
+        # Build schemas list and counts; unexpected (non-list) shapes count as empty
+        json_ld_items = metadata.get("json-ld")
+        microdata_items = metadata.get("microdata")
+        opengraph_items = metadata.get("opengraph")
         if not isinstance(json_ld_items, list):
             json_ld_items = []
         if not isinstance(microdata_items, list):
@@ -172,12 +281,9 @@ def extract_local(url: str) -> ScanResponse:
         if not isinstance(opengraph_items, list):
             opengraph_items = []
 
-        for item in json_ld_items:
-            schemas.append({"type": "json-ld", "data": item})
-        for item in microdata_items:
-            schemas.append({"type": "microdata", "data": item})
-        for item in opengraph_items:
-            schemas.append({"type": "opengraph", "data": item})
+        schemas: List[Dict[str, Any]] = [{"type": "json-ld", "data": item} for item in json_ld_items]
+        schemas += [{"type": "microdata", "data": item} for item in microdata_items]
+        schemas += [{"type": "opengraph", "data": item} for item in opengraph_items]
 
         summary = MetadataSummary(
             json_ld_count=len(json_ld_items),
@@ -193,34 +299,19 @@ def extract_local(url: str) -> ScanResponse:
             # extruct typically returns objects with a 'properties' dict mapping keys to lists
             if not isinstance(og, dict):
                 continue  # Skip non-dict items
-            
+
             # Safely get properties if it exists and is a dict
             props_raw = og.get("properties")
-            props = props_raw if isinstance(props_raw, dict) else {}
-            
-            # Try direct keys first
+            props = props_raw if isinstance(props_raw, dict) else None
+
             if not title:
-                candidate = og.get("og:title")
-                if isinstance(candidate, list):
-                    candidate = candidate[0] if candidate else None
-                if not candidate and props:
-                    candidate = props.get("og:title")
-                    if isinstance(candidate, list):
-                        candidate = candidate[0] if candidate else None
-                if isinstance(candidate, str) and candidate.strip():
-                    title = candidate.strip()
+                title = _og_value(og, props, "og:title")
             if not description:
-                candidate = og.get("og:description")
-                if isinstance(candidate, list):
-                    candidate = candidate[0] if candidate else None
-                if not candidate and props:
-                    candidate = props.get("og:description")
-                    if isinstance(candidate, list):
-                        candidate = candidate[0] if candidate else None
-                if isinstance(candidate, str) and candidate.strip():
-                    description = candidate.strip()
-
-        # Final fallback already attempted via BeautifulSoup earlier
+                description = _og_value(og, props, "og:description")
+            if title and description:
+                break
+
+        # Final fallback already attempted via the tree earlier
 
         response = ScanResponse(
             url=url,
@@ -237,43 +328,61 @@ def extract_local(url: str) -> ScanResponse:
             response.timings = {"html_ms": html_ms, "keyphrases_ms": keyphrases_ms}
         except Exception:
             pass
+        # Callers get deep copies (schemas hold nested dicts), so their per-scan mutations
+        # never reach the cached entry
+        with _extract_cache_lock:
+            _extract_cache.pop(cache_key, None)
+            _extract_cache[cache_key] = (response.model_copy(update={"timings": None}, deep=True), time.time())
+            while len(_extract_cache) > EXTRACT_CACHE_MAX_ENTRIES:
+                del _extract_cache[next(iter(_extract_cache))]
         return response
     except Exception as e:
-        import traceback
         logger.error(f"Error extracting metadata from {url}: {e}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         return ScanResponse(
             url=url,
             error=f"Extraction error: {str(e)}",
-            metadata_summary=MetadataSummary(),
+            metadata_summary=_EMPTY_SUMMARY,
         )
 
 
+def _og_value(og: Dict[str, Any], props: Optional[Dict[str, Any]], key: str) -> Optional[str]:
+    """Stripped OpenGraph value for key, trying og's direct keys before its properties."""
+    candidate = og.get(key)
+    if isinstance(candidate, list):
+        candidate = candidate[0] if candidate else None
+    if not candidate and props:
+        candidate = props.get(key)
+        if isinstance(candidate, list):
+            candidate = candidate[0] if candidate else None
+    if isinstance(candidate, str) and candidate.strip():
+        return candidate.strip()
+    return None
+
+
 def extract_firecrawl(url: str) -> ScanResponse:
     """
     Use Firecrawl API to scrape and extract metadata (optional fallback).
     """
-    api_key = os.getenv("FIRECRAWL_API_KEY")
+    api_key = _FIRECRAWL_API_KEY
     if not api_key:
         logger.warning("FIRECRAWL_API_KEY not set")
         return ScanResponse(
             url=url,
             error="Firecrawl API key not configured",
-            metadata_summary=MetadataSummary(),
+            metadata_summary=_EMPTY_SUMMARY,
         )
 
-    headers = {"Authorization": f"Bearer {api_key}"}
-    payload = {"url": url, "formats": ["markdown", "html", "extract"]}
-
     try:
-        resp = requests.post(
-            "https://api.firecrawl.dev/v1/scrape",
-            json=payload,
-            headers=headers,
+        resp = _HTTP_SESSION.post(
+            _FIRECRAWL_SCRAPE_URL,
+            json={"url": url, "formats": _FIRECRAWL_FORMATS},
+            headers={"Authorization": f"Bearer {api_key}"},
             timeout=30,
         )
         resp.raise_for_status()
-        data = resp.json()
+        # Firecrawl returns markdown + HTML + extract in one body; decode the raw bytes in C
+        data = _json_loads(resp.content)
 
         return ScanResponse(
             url=url,
@@ -281,38 +390,135 @@ def extract_firecrawl(url: str) -> ScanResponse:
             description=data.get("metadata", {}).get("description"),
             text_preview=data.get("markdown", "")[:500] if data.get("markdown") else None,
             schemas=[],
-            metadata_summary=MetadataSummary(),
+            metadata_summary=_EMPTY_SUMMARY,
         )
     except Exception as e:
         logger.error(f"Firecrawl API error: {e}")
         return ScanResponse(
             url=url,
             error=f"Firecrawl API error: {str(e)}",
-            metadata_summary=MetadataSummary(),
+            metadata_summary=_EMPTY_SUMMARY,
         )
 
 
+def _iter_types(obj: Any, keys: tuple[str, ...] = ("@type",)):
+    """Yield every type name declared under ``keys`` in a schema, breadth first.
+
+    IRIs are reduced to their last path segment (``https://schema.org/FAQPage`` -> ``FAQPage``).
+    """
+    queue = deque([obj])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, dict):
+            for key in keys:
+                val = node.get(key)
+                for name in (val if isinstance(val, list) else [val]):
+                    if isinstance(name, str) and name:
+                        yield name.rsplit("/", 1)[-1]
+            queue.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        elif isinstance(node, list):
+            queue.extend(v for v in node if isinstance(v, (dict, list)))
+
+
+@lru_cache(maxsize=1)
+def _rate_script():
+    """Registered rate-limit script when REDIS_URL is set, else None (in-process limiter)."""
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+    try:
+        from redis.asyncio import Redis  # type: ignore
+
+        return Redis.from_url(redis_url, socket_timeout=0.5).register_script(_RATE_LUA)
+    except Exception:
+        return None
+
+
 async def _rate_check(ip: str) -> bool:
+    global _rate_redis_down, _rate_redis_retry_at
+    script = _rate_script()
+    if script is not None and time.monotonic() >= _rate_redis_retry_at:
+        try:
+            hits = await script(keys=[f"scan:rate:{ip}"], args=[_rate_window_seconds])
+        except Exception as e:
+            if not _rate_redis_down:
+                logger.warning("Redis rate limit unavailable, using in-process limiter: %s", e)
+            _rate_redis_down = True
+            _rate_redis_retry_at = time.monotonic() + RATE_REDIS_RETRY_SECONDS
+        else:
+            if _rate_redis_down:
+                logger.info("Redis rate limit recovered")
+                _rate_redis_down = False
+            return int(hits) <= _rate_limit_per_min
     now = time.time()
     cutoff = now - _rate_window_seconds
     async with _rate_lock:
-        hist = _rate_counters.get(ip, [])
-        hist = [t for t in hist if t >= cutoff]
+        hist = _rate_counters.get(ip)
+        if hist is None:
+            hist = _rate_counters[ip] = deque()
+        # Timestamps are appended in order, so expired ones sit at the left end
+        while hist and hist[0] < cutoff:
+            hist.popleft()
         if len(hist) >= _rate_limit_per_min:
-            _rate_counters[ip] = hist
             return False
         hist.append(now)
-        _rate_counters[ip] = hist
         return True
 
 
+async def _extract_async(url: str, scan_id: str) -> tuple[ScanResponse, int]:
+    """extract_local off the event loop, then Firecrawl if it failed and a key is configured.
+
+    Returns (result, extract_ms), where extract_ms covers the local extraction only. The
+    fallback runs here, so it overlaps the PSI fetch instead of waiting for it.
+    """
+    start = time.time()
+    result = await asyncio.to_thread(extract_local, url)
+    extract_ms = int((time.time() - start) * 1000)
+    logger.info(json.dumps({
+        "event": "extract_complete",
+        "scan_id": scan_id,
+        "url": url,
+        "duration_ms": extract_ms,
+        "has_error": bool(result.error),
+    }))
+
+    # If local extraction failed and Firecrawl is configured, try it
+    if result.error and _FIRECRAWL_API_KEY:
+        logger.info(f"Local extraction failed for {url}, trying Firecrawl...")
+        firecrawl_start = time.time()
+        result = await asyncio.to_thread(extract_firecrawl, url)
+        firecrawl_ms = int((time.time() - firecrawl_start) * 1000)
+        logger.info(json.dumps({
+            "event": "firecrawl_complete",
+            "scan_id": scan_id,
+            "url": url,
+            "duration_ms": firecrawl_ms,
+        }))
+    return result, extract_ms
+
+
+async def _fetch_psi_async(url: str) -> tuple[Dict[str, Any], int]:
+    """fetch_psi off the event loop; returns (lighthouse, duration_ms)."""
+    start = time.time()
+    lighthouse = await asyncio.to_thread(fetch_psi, url)
+    return lighthouse, int((time.time() - start) * 1000)
+
+
 @router.post("/", response_model=ScanResponse)
-def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
+async def scan_url(payload: ScanRequest, request: Request) -> Response:
     """
     Scan a URL and extract metadata.
     Uses local extraction (trafilatura + extruct) by default.
     Falls back to Firecrawl API if FIRECRAWL_API_KEY is set.
+
+    The ScanResponse is serialized here and returned as a response, so FastAPI does not
+    re-validate it (and every nested schema) against response_model on the way out.
     """
+    result = await _run_scan(payload, request)
+    return _ScanJSONResponse(result.model_dump(mode="json"))
+
+
+async def _run_scan(payload: ScanRequest, request: Request) -> ScanResponse:
     # Generate scan ID for observability
     scan_id = str(uuid.uuid4())[:8]
     start_time = time.time()
@@ -336,9 +542,7 @@ def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
     with track_scan_request("/api/v1/scan") as metrics_ctx:
         # Rate limit per-IP
         try:
-            import anyio
-            # Run async rate-check in a blocking context
-            ok = anyio.run(_rate_check, client_ip)
+            ok = await _rate_check(client_ip)
         except Exception:
             ok = True
         if not ok:
@@ -360,7 +564,7 @@ def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
             raise HTTPException(status_code=400, detail=f"URL rejected: {str(e)}")
 
         # Validate URL format (redundant after SSRF check, but kept for clarity)
-        if not url.startswith(("http://", "https://")):
+        if not _SCHEME_RE.match(url):
             logger.warning(json.dumps({
                 "event": "scan_rejected",
                 "scan_id": scan_id,
@@ -370,43 +574,28 @@ def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
             return ScanResponse(
                 url=url,
                 error="Invalid URL - must start with http:// or https://",
-                metadata_summary=MetadataSummary(),
+                metadata_summary=_EMPTY_SUMMARY,
             )
 
-        # Step 1: Extract metadata
-        extract_start = time.time()
-        result = extract_local(url)
-        extract_ms = int((time.time() - extract_start) * 1000)
-    
-    logger.info(json.dumps({
-        "event": "extract_complete",
-        "scan_id": scan_id,
-        "url": url,
-        "duration_ms": extract_ms,
-        "has_error": bool(result.error),
-    }))
-
-    # If local extraction failed and Firecrawl is configured, try it
-    if result.error and os.getenv("FIRECRAWL_API_KEY"):
-        logger.info(f"Local extraction failed for {url}, trying Firecrawl...")
-        firecrawl_start = time.time()
-        result = extract_firecrawl(url)
-        firecrawl_ms = int((time.time() - firecrawl_start) * 1000)
-        logger.info(json.dumps({
-            "event": "firecrawl_complete",
-            "scan_id": scan_id,
-            "url": url,
-            "duration_ms": firecrawl_ms,
-        }))
-
-    # Convert ScanResponse -> dict for augmentation
-    scan_dict = result.model_dump() if hasattr(result, "model_dump") else result.__dict__
-
-    # Step 2: Fetch Lighthouse (PSI) results
-    psi_start = time.time()
-    try:
-        lighthouse = fetch_psi(url)
-        psi_ms = int((time.time() - psi_start) * 1000)
+        # Steps 1 + 2: extract metadata (with any Firecrawl fallback) and fetch Lighthouse
+        # (PSI) concurrently; PSI only needs the URL, so the scan waits for the slower of the
+        # two rather than both. AI insights (step 3) read the PSI summary, so they follow.
+        # The check rules (stat, and a reload when the YAML changed) resolve on a thread alongside.
+        gather_start = time.time()
+        extracted, psi_out, check_rules = await asyncio.gather(
+            _extract_async(url, scan_id),
+            _fetch_psi_async(url),
+            asyncio.to_thread(_compiled_rules),
+            return_exceptions=True,
+        )
+        gather_ms = int((time.time() - gather_start) * 1000)
+        if isinstance(extracted, BaseException):
+            raise extracted
+        result, extract_ms = extracted
+
+    # Step 2: Lighthouse (PSI) results gathered alongside extraction
+    if not isinstance(psi_out, BaseException):
+        lighthouse, psi_ms = psi_out
         logger.info(json.dumps({
             "event": "psi_complete",
             "scan_id": scan_id,
@@ -414,8 +603,9 @@ def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
             "duration_ms": psi_ms,
             "available": lighthouse.get("available", False),
         }))
-    except Exception as e:
-        psi_ms = int((time.time() - psi_start) * 1000)
+    else:
+        e = psi_out
+        psi_ms = gather_ms
         logger.warning(json.dumps({
             "event": "psi_failed",
             "scan_id": scan_id,
@@ -425,16 +615,9 @@ def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
         }))
         lighthouse = {"source": "psi", "available": False, "error": str(e)}
 
-    # Prepare lightweight scan payload subset for CrewAI
-    scan_payload_subset = {
-        "url": url,
-        "title": scan_dict.get("title"),
-        "description": scan_dict.get("description"),
-        "text_preview": scan_dict.get("text_preview"),
-        "schemas": scan_dict.get("schemas", []),
-        "metadata_summary": scan_dict.get("metadata_summary", {}),
-        "keyphrases": scan_dict.get("keyphrases", []),
-    }
+    # Lightweight scan payload subset for CrewAI and the rules engine, dumped in one pass
+    scan_payload_subset = result.model_dump(include=_SCAN_SUBSET_FIELDS)
+    scan_payload_subset["url"] = url
 
     # Step 3: Generate AI insights
     insights_start = time.time()
@@ -461,12 +644,10 @@ def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
             insights_ms = 0
         else:
             try:
-                def _run_gen() -> Dict[str, Any]:
-                    return generate_recommendations(scan_payload_subset, lighthouse, timeout_seconds=15)
-
-                with ThreadPoolExecutor(max_workers=1) as ex:
-                    fut = ex.submit(_run_gen)
-                    insights = fut.result(timeout=20)  # slightly above internal LLM timeout
+                insights = await asyncio.wait_for(
+                    asyncio.to_thread(generate_recommendations, scan_payload_subset, lighthouse, timeout_seconds=15),
+                    timeout=20,  # slightly above internal LLM timeout
+                )
                 insights_ms = int((time.time() - insights_start) * 1000)
                 logger.info(json.dumps({
                     "event": "ai_complete",
@@ -474,7 +655,7 @@ def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
                     "url": url,
                     "duration_ms": insights_ms,
                 }))
-            except FuturesTimeoutError as e:
+            except asyncio.TimeoutError:
                 insights_ms = int((time.time() - insights_start) * 1000)
                 logger.warning(json.dumps({
                     "event": "ai_timeout",
@@ -528,9 +709,13 @@ def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
         md = {}
     if md.get("json_ld_count", 0) > 0:
         # look for LocalBusiness/FAQ in schemas
-        schemas = scan_payload_subset.get("schemas", [])
-        found_local = any("LocalBusiness" in str(s.get("data", "")) for s in schemas)
-        found_faq = any("FAQPage" in str(s.get("data", "")) or "Question" in str(s.get("data", "")) for s in schemas)
+        # Collect declared types once (microdata keeps them under "type") and test the set
+        types = set()
+        for s in scan_payload_subset.get("schemas", []):
+            keys = ("@type", "type") if s.get("type") == "microdata" else ("@type",)
+            types.update(_iter_types(s.get("data"), keys))
+        found_local = "LocalBusiness" in types
+        found_faq = "FAQPage" in types or "Question" in types
         if found_local:
             score += 10
             signals.append("LocalBusiness schema present")
@@ -567,68 +752,56 @@ def scan_url(payload: ScanRequest, request: Request) -> ScanResponse:
 
     # Rules engine: evaluate YAML-driven checks and merge
     try:
-        rules, last_mtime = get_rules()
-        eval_out = evaluate_rules({"scan": scan_dict, "lighthouse": lighthouse}, rules)
+        if isinstance(check_rules, BaseException):
+            raise check_rules
+        eval_out = evaluate_rules({"scan": scan_payload_subset, "lighthouse": lighthouse}, check_rules)
 
-        # Merge signals (dedup)
+        # Merge signals (dedup); visibility is the dict built above
         rule_signals = eval_out.get("signals", [])
-        if isinstance(result.visibility, dict):
-            existing = set(result.visibility.get("signals", []))
-            merged = list(existing.union(rule_signals))
-            result.visibility["signals"] = merged
+        visibility["signals"] = list(set(visibility["signals"]).union(rule_signals))
 
         # Adjust score with clamp (-30..+30) and cap 0..100
-        delta = int(eval_out.get("score_delta", 0))
-        if delta > 30:
-            delta = 30
-        if delta < -30:
-            delta = -30
-        if isinstance(result.visibility, dict):
-            new_score = int(result.visibility.get("score", 0)) + delta
-            if new_score > 100:
-                new_score = 100
-            if new_score < 0:
-                new_score = 0
-            result.visibility["score"] = new_score
-
-        # Merge recommendations
+        delta = max(-30, min(30, int(eval_out.get("score_delta", 0))))
+        visibility["score"] = max(0, min(100, int(visibility["score"]) + delta))
+
+        # Merge recommendations; insights comes from the LLM, so normalize it once
         rule_recs = eval_out.get("recommendations", [])
         if not isinstance(result.insights, dict):
             result.insights = {}
-        rec_list = result.insights.get("recommendations", []) if isinstance(result.insights, dict) else []
+        insights_out = result.insights
+        rec_list = insights_out.get("recommendations", [])
         # Deduplicate by rule_id+title
-        seen = {f"{r.get('rule_id')}::{r.get('title')}" for r in rec_list if isinstance(r, dict)}
+        seen = {(r.get("rule_id"), r.get("title")) for r in rec_list if isinstance(r, dict)}
         for r in rule_recs:
-            key = f"{r.get('rule_id')}::{r.get('title')}"
+            key = (r.get("rule_id"), r.get("title"))
             if key not in seen:
                 rec_list.append(r)
                 seen.add(key)
-        if isinstance(result.insights, dict):
-            result.insights["recommendations"] = rec_list
+        insights_out["recommendations"] = rec_list
     except Exception as e:
         # Non-fatal: keep response usable even if rules fail
         logger.warning(f"Rules evaluation failed: {e}")
+
+    # Final structured logging with total scan time
+    total_ms = int((time.time() - start_time) * 1000)
+    logger.info(json.dumps({
+        "event": "scan_complete",
+        "scan_id": scan_id,
+        "url": url,
+        "extract_ms": extract_ms,
+        "psi_ms": psi_ms,
+        "insights_ms": insights_ms,
+        "total_ms": total_ms,
+        "has_error": bool(result.error),
+    }))
     
-        # Final structured logging with total scan time
-        total_ms = int((time.time() - start_time) * 1000)
-        logger.info(json.dumps({
-            "event": "scan_complete",
-            "scan_id": scan_id,
-            "url": url,
-            "extract_ms": extract_ms,
-            "psi_ms": psi_ms,
-            "insights_ms": insights_ms,
-            "total_ms": total_ms,
-            "has_error": bool(result.error),
-        }))
-        
-        # Track metrics for each stage
-        track_scan_stage("/api/v1/scan", "html_fetch", extract_ms / 1000.0)
-        track_scan_stage("/api/v1/scan", "psi", psi_ms / 1000.0)
-        track_scan_stage("/api/v1/scan", "ai", insights_ms / 1000.0)
-        
-        # Mark scan as successful if no errors
-        if not result.error:
-            metrics_ctx["result"] = "success"
-        
-        return result
+    # Track metrics for each stage
+    track_scan_stage("/api/v1/scan", "html_fetch", extract_ms / 1000.0)
+    track_scan_stage("/api/v1/scan", "psi", psi_ms / 1000.0)
+    track_scan_stage("/api/v1/scan", "ai", insights_ms / 1000.0)
+    
+    # Mark scan as successful if no errors
+    if not result.error:
+        metrics_ctx["result"] = "success"
+    
+    return result
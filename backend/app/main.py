@@ -1,5 +1,6 @@
 import sentry_sdk
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 import logging
 import sys
 from fastapi.routing import APIRoute
@@ -24,10 +25,19 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+# orjson encodes response bodies in C; fall back to stdlib json when it isn't installed
+try:
+    import orjson  # type: ignore  # noqa: F401
+
+    default_response_class: type[JSONResponse] = ORJSONResponse
+except ImportError:
+    default_response_class = JSONResponse
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=default_response_class,
 )
 
 # Prometheus metrics instrumentation (fully guarded)
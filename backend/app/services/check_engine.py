@@ -46,16 +46,33 @@ def _build_ctx(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def evaluate_rules(data: Dict[str, Any], rules_file: Dict[str, Any] | Any) -> Dict[str, Any]:
-    # rules_file may be a pydantic model with .rules or a dict
-    rules = getattr(rules_file, "rules", None) or rules_file.get("rules", [])
+@dataclass
+class CompiledRule:
+    id: Any
+    title: Any
+    category: Any
+    severity: Any
+    when: List[Any]
+    unless: Optional[List[Any]]
+    details: str
+    recommendation: str
+    score_impact: Any
+
+
+def _compile_expr(expr: str) -> Any:
+    # Invalid expressions evaluate to None, as jmespath.search errors always have
+    try:
+        return jmespath.compile(expr)
+    except Exception:
+        return None
 
-    signals: List[str] = []
-    score_delta = 0
-    recs: List[Dict[str, Any]] = []
 
-    ctx = _build_ctx(data)
+def compile_rules(rules_file: Dict[str, Any] | Any) -> List[CompiledRule]:
+    """Normalize rules and pre-parse their JMESPath expressions for repeated evaluation."""
+    # rules_file may be a pydantic model with .rules or a dict
+    rules = getattr(rules_file, "rules", None) or rules_file.get("rules", [])
 
+    compiled: List[CompiledRule] = []
     for r in rules:
         # r may be pydantic model or dict
         if hasattr(r, "model_dump") or hasattr(r, "id"):
@@ -79,14 +96,49 @@ def evaluate_rules(data: Dict[str, Any], rules_file: Dict[str, Any] | Any) -> Di
             recommendation = r.get("recommendation", "")
             impact = r.get("score_impact", 0)
 
+        compiled.append(
+            CompiledRule(
+                id=rid,
+                title=title,
+                category=category,
+                severity=severity,
+                when=[_compile_expr(expr) for expr in when],
+                unless=[_compile_expr(expr) for expr in unless] if unless else None,
+                details=details,
+                recommendation=recommendation,
+                score_impact=impact,
+            )
+        )
+    return compiled
+
+
+def _search(expr: Any, data: Dict[str, Any]) -> Any:
+    if expr is None:
+        return None
+    try:
+        return expr.search(data)
+    except Exception:
+        return None
+
+
+def evaluate_rules(data: Dict[str, Any], rules_file: Dict[str, Any] | Any) -> Dict[str, Any]:
+    """Evaluate rules against scan data; rules_file may come from compile_rules to skip re-parsing."""
+    if isinstance(rules_file, list):
+        rules = rules_file
+    else:
+        rules = compile_rules(rules_file)
+
+    signals: List[str] = []
+    score_delta = 0
+    recs: List[Dict[str, Any]] = []
+
+    ctx = _build_ctx(data)
+
+    for r in rules:
         # All `when` expressions must be truthy
         all_when = True
-        for expr in when:
-            try:
-                val = jmespath.search(expr, data)
-            except Exception:
-                val = None
-            if not _truthy(val):
+        for expr in r.when:
+            if not _truthy(_search(expr, data)):
                 all_when = False
                 break
 
@@ -94,30 +146,26 @@ def evaluate_rules(data: Dict[str, Any], rules_file: Dict[str, Any] | Any) -> Di
             continue
 
         # If any unless expression is truthy, skip
-        if unless:
+        if r.unless:
             skip = False
-            for expr in unless:
-                try:
-                    val = jmespath.search(expr, data)
-                except Exception:
-                    val = None
-                if _truthy(val):
+            for expr in r.unless:
+                if _truthy(_search(expr, data)):
                     skip = True
                     break
             if skip:
                 continue
 
         # Matched
-        signals.append(title)
-        score_delta += int(impact)
+        signals.append(r.title)
+        score_delta += int(r.score_impact)
         recs.append(
             {
-                "rule_id": rid,
-                "title": title,
-                "category": category,
-                "impact": int(severity),
-                "details": _format(details, ctx),
-                "recommendation": _format(recommendation, ctx),
+                "rule_id": r.id,
+                "title": r.title,
+                "category": r.category,
+                "impact": int(r.severity),
+                "details": _format(r.details, ctx),
+                "recommendation": _format(r.recommendation, ctx),
             }
         )
 
@@ -6,14 +6,18 @@ insights and recommendations from a scan payload and lighthouse metrics.
 Env:
     MODEL or CREWAI_MODEL - model string (default: 'ollama/llama3')
     OLLAMA_HOST - Ollama host (e.g., http://localhost:11434)
+    INSIGHTS_CACHE_TTL_SECONDS - reuse validated insights for an identical prompt (default 3600)
 
 If the model or CrewAI stack is not available, generate_recommendations
 returns a graceful fallback message explaining the situation.
 """
 from __future__ import annotations
 
+import hashlib
 import os
 import logging
+import threading
+import time
 from typing import Any, Dict, List
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 import json
@@ -22,6 +26,13 @@ from pydantic import BaseModel, Field, ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Validated insights per prompt digest, oldest first. The prompt captures every scan and PSI
+# field the model sees, so identical inputs reuse the answer instead of another LLM call.
+INSIGHTS_CACHE_TTL_SECONDS = int(os.getenv("INSIGHTS_CACHE_TTL_SECONDS", "3600"))
+INSIGHTS_CACHE_MAX_ENTRIES = 1024
+_insights_cache: Dict[bytes, tuple["InsightsResponse", float]] = {}
+_insights_cache_lock = threading.Lock()
+
 
 class Recommendation(BaseModel):
     title: str
@@ -117,6 +128,12 @@ def generate_recommendations(
 
     # Create prompt
     prompt = _build_prompt(scan, lighthouse)
+    cache_key = hashlib.blake2b(prompt.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _insights_cache_lock:
+        hit = _insights_cache.get(cache_key)
+    if hit is not None and time.time() - hit[1] < INSIGHTS_CACHE_TTL_SECONDS:
+        # Fresh dicts per call: callers append rule recommendations to the result
+        return hit[0].model_dump()
 
     # Try to get a local LLM (Ollama) client
     try:
@@ -137,13 +154,16 @@ def generate_recommendations(
             # CrewAI/LiteLLM typically exposes a .call() method
             return llm.call(prompt)  # type: ignore[attr-defined]
 
-        with ThreadPoolExecutor(max_workers=1) as ex:
+        # Not a with-block: its exit would wait for a timed-out call to finish
+        ex = ThreadPoolExecutor(max_workers=1)
+        try:
             future = ex.submit(_invoke)
-            try:
-                text = future.result(timeout=timeout_seconds)
-            except FuturesTimeoutError:
-                logger.error("LLM call timed out")
-                return _create_fallback_insights()
+            text = future.result(timeout=timeout_seconds)
+        except FuturesTimeoutError:
+            logger.error("LLM call timed out")
+            return _create_fallback_insights()
+        finally:
+            ex.shutdown(wait=False)
 
         # Validate raw output before JSON parsing
         if not isinstance(text, str):
@@ -177,6 +197,11 @@ def generate_recommendations(
 
         try:
             validated = InsightsResponse(**parsed)
+            with _insights_cache_lock:
+                _insights_cache.pop(cache_key, None)
+                _insights_cache[cache_key] = (validated, time.time())
+                while len(_insights_cache) > INSIGHTS_CACHE_MAX_ENTRIES:
+                    del _insights_cache[next(iter(_insights_cache))]
             return validated.model_dump()
         except ValidationError as ve:
             logger.warning(f"CrewAI output validation failed: {ve}")
@@ -1,15 +1,30 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
+import importlib.util
 import json
 import logging
+import os
+import threading
 import time
-from typing import Optional, Any, Dict, List
+from functools import lru_cache
+from typing import Optional, Any, Dict, List, Union
+from urllib.parse import urljoin, urlparse
 
 import httpx
-from bs4 import BeautifulSoup, FeatureNotFound
+import lxml.html
+from lxml import etree
+from lxml.html import HtmlElement
 
 logger = logging.getLogger(__name__)
 
+# orjson decodes in C; fall back to stdlib json when it isn't installed
+try:
+    from orjson import loads as _json_loads  # type: ignore
+except ImportError:
+    _json_loads = json.loads
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -18,7 +33,12 @@ HEADERS = {
     ),
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
-    "Accept-Encoding": "gzip, deflate, br",
+    # Only offer brotli when httpx can decode it; otherwise a br body would arrive undecodable
+    "Accept-Encoding": (
+        "gzip, deflate, br"
+        if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+        else "gzip, deflate"
+    ),
     "DNT": "1",
     "Connection": "keep-alive",
     "Upgrade-Insecure-Requests": "1",
@@ -29,134 +49,376 @@ HEADERS = {
 }
 
 
+# Page bodies past this size are rejected while streaming instead of being buffered whole
+MAX_HTML_BYTES = int(os.getenv("MAX_HTML_BYTES", str(5 * 1024 * 1024)))
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+class HTMLTooLargeError(httpx.RequestError):
+    """Raised when a response body exceeds MAX_HTML_BYTES."""
+
+
+def _check_declared_size(resp: httpx.Response, limit: int) -> None:
+    declared = resp.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise HTMLTooLargeError(f"Response too large: {declared} bytes (max {limit})", request=resp.request)
+
+
+def read_capped(resp: httpx.Response, limit: int = MAX_HTML_BYTES) -> bytes:
+    """Read a streamed response body, raising HTMLTooLargeError past ``limit`` bytes."""
+    _check_declared_size(resp, limit)
+    chunks: List[bytes] = []
+    total = 0
+    for chunk in resp.iter_bytes(_READ_CHUNK_BYTES):
+        total += len(chunk)
+        if total > limit:
+            raise HTMLTooLargeError(f"Response too large: over {limit} bytes", request=resp.request)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def aread_capped(resp: httpx.Response, limit: int = MAX_HTML_BYTES) -> bytes:
+    """Async :func:`read_capped`."""
+    _check_declared_size(resp, limit)
+    chunks: List[bytes] = []
+    total = 0
+    async for chunk in resp.aiter_bytes(_READ_CHUNK_BYTES):
+        total += len(chunk)
+        if total > limit:
+            raise HTMLTooLargeError(f"Response too large: over {limit} bytes", request=resp.request)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def decode_body(resp: httpx.Response, body: bytes) -> str:
+    """Decode a body read with :func:`read_capped` the way ``resp.text`` would."""
+    return body.decode(resp.encoding or "utf-8", errors="replace")
+
+
+# Shared keep-alive pool for synchronous page fetches (scan endpoint, worker); httpx.Client is
+# thread-safe, so threads reuse TCP/TLS connections to hosts scanned before. HTTP/2 when h2
+# is installed, so concurrent fetches to one host share a connection.
+_PAGE_CLIENT = httpx.Client(
+    follow_redirects=True,
+    headers=HEADERS,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    http2=importlib.util.find_spec("h2") is not None,
+)
+atexit.register(_PAGE_CLIENT.close)
+
+
+def _log_fetch_success(url: str, resp: httpx.Response, html: str, elapsed_ms: int) -> None:
+    logger.info(
+        json.dumps(
+            {
+                "event": "html_fetch_success",
+                "url": url,
+                "status_code": resp.status_code,
+                "final_url": str(resp.url),
+                "elapsed_ms": elapsed_ms,
+                "bytes": len(html),
+            }
+        )
+    )
+
+
+def _log_fetch_error(url: str, e: httpx.HTTPError, body: bytes, elapsed_ms: int) -> None:
+    if isinstance(e, httpx.HTTPStatusError):
+        content_preview = decode_body(e.response, body)[:500] if e.response is not None else ""
+        logger.warning(
+            json.dumps(
+                {
+                    "event": "html_fetch_http_error",
+                    "url": url,
+                    "status_code": e.response.status_code if e.response else None,
+                    "elapsed_ms": elapsed_ms,
+                    "headers": dict(e.response.headers) if e.response else {},
+                    "text_preview": content_preview,
+                }
+            )
+        )
+    else:
+        logger.warning(
+            json.dumps(
+                {
+                    "event": "html_fetch_request_error",
+                    "url": url,
+                    "error": f"{type(e).__name__}: {e}",
+                    "elapsed_ms": elapsed_ms,
+                }
+            )
+        )
+
+
 async def fetch_html(url: str, timeout: int = 20) -> tuple[str, int]:
     """Fetch HTML for a URL with redirects, headers, and explicit timing.
 
+    The body is streamed and capped at MAX_HTML_BYTES.
     Returns a tuple of (html_text, elapsed_ms).
-    Raises httpx.HTTPStatusError or httpx.RequestError on failure.
+    Raises httpx.HTTPStatusError or httpx.RequestError (including HTMLTooLargeError) on failure.
     """
     start = time.time()
+    body = b""
     async with httpx.AsyncClient(follow_redirects=True, headers=HEADERS, timeout=timeout) as client:
         try:
-            resp = await client.get(url)
-            resp.raise_for_status()
+            async with client.stream("GET", url) as resp:
+                body = await aread_capped(resp)
+                resp.raise_for_status()
+            html = decode_body(resp, body)
             elapsed_ms = int((time.time() - start) * 1000)
-            logger.info(
-                json.dumps(
-                    {
-                        "event": "html_fetch_success",
-                        "url": url,
-                        "status_code": resp.status_code,
-                        "final_url": str(resp.url),
-                        "elapsed_ms": elapsed_ms,
-                        "bytes": len(resp.text or ""),
-                    }
-                )
-            )
-            return resp.text, elapsed_ms
-        except httpx.HTTPStatusError as e:
-            elapsed_ms = int((time.time() - start) * 1000)
-            content_preview = (e.response.text or "")[:500] if e.response is not None else ""
-            logger.warning(
-                json.dumps(
-                    {
-                        "event": "html_fetch_http_error",
-                        "url": url,
-                        "status_code": e.response.status_code if e.response else None,
-                        "elapsed_ms": elapsed_ms,
-                        "headers": dict(e.response.headers) if e.response else {},
-                        "text_preview": content_preview,
-                    }
-                )
-            )
-            raise
-        except httpx.RequestError as e:
-            elapsed_ms = int((time.time() - start) * 1000)
-            logger.warning(
-                json.dumps(
-                    {
-                        "event": "html_fetch_request_error",
-                        "url": url,
-                        "error": f"{type(e).__name__}: {e}",
-                        "elapsed_ms": elapsed_ms,
-                    }
-                )
-            )
+            _log_fetch_success(url, resp, html, elapsed_ms)
+            return html, elapsed_ms
+        except (httpx.HTTPStatusError, httpx.RequestError) as e:
+            _log_fetch_error(url, e, body, int((time.time() - start) * 1000))
             raise
 
 
+def fetch_page_sync(url: str, timeout: int = 20) -> tuple[str, bytes, str, int]:
+    """Blocking fetch over the shared keep-alive pool, returning (html, body, encoding, elapsed_ms).
+
+    body is the raw bytes html was decoded from with ``encoding``, so callers can hand
+    them straight to :func:`parse_html_tree`. Errors are those of :func:`fetch_html`.
+    """
+    start = time.time()
+    body = b""
+    try:
+        with _PAGE_CLIENT.stream("GET", url, timeout=timeout) as resp:
+            body = read_capped(resp)
+            resp.raise_for_status()
+        html = decode_body(resp, body)
+        elapsed_ms = int((time.time() - start) * 1000)
+        _log_fetch_success(url, resp, html, elapsed_ms)
+        return html, body, resp.encoding or "utf-8", elapsed_ms
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        _log_fetch_error(url, e, body, int((time.time() - start) * 1000))
+        raise
+
+
+def fetch_html_sync(url: str, timeout: int = 20) -> tuple[str, int]:
+    """Blocking :func:`fetch_html` over the shared keep-alive pool; same result and errors."""
+    html, _body, _encoding, elapsed_ms = fetch_page_sync(url, timeout)
+    return html, elapsed_ms
+
+
 def _normalize_title(text: str, limit: int = 80) -> str:
     """Collapse whitespace, strip, and trim to limit characters."""
     t = " ".join((text or "").split()).strip()
     return t[:limit] if len(t) > limit else t
 
 
-def extract_title_with_source(html: str, url: str = "") -> tuple[Optional[str], Optional[str]]:
-    """Extract a best-effort title and indicate the source used.
+def parse_html_tree(html: Union[str, bytes], encoding: Optional[str] = None) -> Optional[HtmlElement]:
+    """Parse HTML once with lxml so callers can share the tree across extractors.
 
-    Priority: <title> → og:title → twitter:title → first <h1> → domain fallback.
-    Always normalizes whitespace and trims to 80 chars.
-    Returns (title, source) where source is one of: "title", "og:title",
-    "twitter:title", "h1", "hostname", or None if not found.
+    Raw response bytes are handed to libxml2 as-is, skipping the str round-trip;
+    ``encoding`` names their charset (None lets lxml sniff BOM/meta) and the
+    bytes must be valid in it. Returns None for empty or unparseable input (never raises).
     """
     if not html:
-        fb = _extract_hostname_fallback(url) if url else None
-        return (_normalize_title(fb) if fb else None, "hostname" if fb else None)
-
+        return None
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        if isinstance(html, bytes):
+            try:
+                return lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(encoding=encoding))
+            except LookupError:
+                # Charset libxml2 doesn't know; decode in Python instead
+                html = html.decode(encoding or "utf-8", errors="replace")
+        return lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(encoding="utf-8"))
     except Exception as e:
-        logger.warning(f"BeautifulSoup parsing failed: {e}")
-        fb = _extract_hostname_fallback(url) if url else None
-        return (_normalize_title(fb) if fb else None, "hostname" if fb else None)
-
-    # 1) <title>
-    if soup.title:
-        raw = soup.title.string if soup.title.string else soup.title.get_text()
-        if raw:
-            t = _normalize_title(raw)
-            if t:
-                return (t, "title")
-
-    # 2) og:title
-    try:
-        og = soup.find("meta", property="og:title")
-        if og and og.get("content"):
-            t = _normalize_title(str(og.get("content")))
-            if t:
-                return (t, "og:title")
-    except Exception:
-        pass
+        logger.warning(f"lxml parsing failed: {e}")
+        return None
 
-    # 3) twitter:title
-    try:
-        tw = soup.find("meta", attrs={"name": "twitter:title"})
-        if tw and tw.get("content"):
-            t = _normalize_title(str(tw.get("content")))
-            if t:
-                return (t, "twitter:title")
-    except Exception:
-        pass
 
-    # 4) first <h1>
+_JSON_LD_XPATH = etree.XPath('descendant-or-self::script[@type="application/ld+json"]')
+
+
+def extract_json_ld(tree: HtmlElement) -> List[Any]:
+    """JSON-LD items from every ld+json script in tree, in document order.
+
+    Blocks are decoded with orjson when available; anything it rejects (control
+    characters, leading HTML/JS comments) goes through extruct's lenient decoder.
+    """
+    items: List[Any] = []
+    for node in _JSON_LD_XPATH(tree):
+        script = node.text or ""
+        try:
+            data = _json_loads(script)
+        except ValueError:
+            try:
+                from extruct.jsonld import JsonLdExtractor
+                items.extend(JsonLdExtractor().extract_items(node))
+            except Exception:
+                pass
+            continue
+        for item in (data if isinstance(data, list) else [data] if isinstance(data, dict) else []):
+            if item:
+                items.append(item)
+    return items
+
+
+# Cheap presence checks run before extruct: each syntax only yields items when its marker
+# exists, so pages without one skip that extractor's full-document walk
+_SYNTAX_MARKERS = {
+    "microdata": etree.XPath("boolean(//*[@itemscope])"),
+    "opengraph": etree.XPath("boolean(//head/meta[@property and @content])"),
+}
+
+
+def resolve_base_url(tree: Optional[HtmlElement], html: Union[str, bytes], url: str) -> str:
+    """``w3lib.html.get_base_url`` for a page, skipping its full-document scan when the
+    parsed tree has no ``<base>`` element (most pages); the result is then ``url`` made safe.
+    """
+    if tree is not None and next(tree.iter("base"), None) is None:
+        from w3lib.url import safe_url_string
+
+        return safe_url_string(url)
+    from w3lib.html import get_base_url
+
+    return get_base_url(html, url)
+
+
+def extract_structured_data(doc: Any, base_url: Optional[str], syntaxes: List[str]) -> Dict[str, Any]:
+    """``extruct.extract`` limited to the syntaxes whose markers appear in ``doc``.
+
+    ``doc`` is a tree from :func:`parse_html_tree` or an HTML string (strings run every
+    syntax through extruct). For a tree, JSON-LD is read by :func:`extract_json_ld`
+    instead of extruct. Skipped syntaxes map to ``[]`` so the result has the usual keys,
+    in ``syntaxes`` order. Raises whatever extruct raises.
+    """
+    import extruct
+
+    if not isinstance(doc, HtmlElement):
+        return extruct.extract(doc, base_url=base_url, syntaxes=list(syntaxes))
+    present = [
+        s for s in syntaxes
+        if s != "json-ld" and (s not in _SYNTAX_MARKERS or _SYNTAX_MARKERS[s](doc))
+    ]
+    data = extruct.extract(doc, base_url=base_url, syntaxes=present) if present else {}
+    if not isinstance(data, dict):
+        return data
+    return {s: extract_json_ld(doc) if s == "json-ld" else data.get(s, []) for s in syntaxes}
+
+
+# resiliparse extracts main-content text in C++; optional, trafilatura is used without it
+try:
+    from resiliparse.extract.html2text import extract_plain_text as _extract_plain_text  # type: ignore
+except ImportError:
+    _extract_plain_text = None
+
+
+@lru_cache(maxsize=1)
+def _text_extractor_options() -> Any:
+    """Shared trafilatura options for plain-text extraction, built once per process."""
     try:
-        h1 = soup.find("h1")
-        if h1:
-            t = _normalize_title(h1.get_text())
-            if t:
-                return (t, "h1")
-    except Exception:
-        pass
+        from trafilatura.settings import Extractor  # type: ignore
+    except ImportError:
+        # Older trafilatura builds its options on every call
+        return None
+    return Extractor(output_format="txt", comments=False)
+
+
+def extract_text(doc: Any, html: Optional[str] = None) -> str:
+    """Extract readable text from HTML or a tree from :func:`parse_html_tree`.
+
+    When resiliparse is installed and the HTML string is available (``doc`` itself, or
+    ``html`` alongside a tree), its main-content extractor is used; it is several times
+    faster than trafilatura. trafilatura remains the fallback when resiliparse is missing,
+    fails, or finds no text. Passing the tree skips trafilatura's own parse; it works on a
+    copy, so the tree is unchanged. Raises ImportError if trafilatura is needed but missing.
+    """
+    source = doc if isinstance(doc, str) else html
+    if _extract_plain_text is not None and source:
+        try:
+            text = _extract_plain_text(source, main_content=True, alt_texts=False, links=False)
+            if text:
+                return text
+        except Exception as e:
+            logger.debug(f"resiliparse extraction failed, falling back to trafilatura: {e}")
+
+    import trafilatura
+
+    options = _text_extractor_options()
+    if options is not None:
+        return trafilatura.extract(doc, options=options) or ""
+    return trafilatura.extract(doc, output_format="txt", include_comments=False) or ""
+
+
+def _first_meta_content(tree: HtmlElement, attr: str, value: str) -> Optional[str]:
+    for m in tree.iter("meta"):
+        if m.get(attr) == value:
+            return m.get("content")
+    return None
+
+
+def _first_text(tree: HtmlElement, tag: str) -> Optional[str]:
+    for el in tree.iter(tag):
+        return el.text_content()
+    return None
+
+
+def extract_title_from_tree(tree: Optional[HtmlElement], url: str = "") -> tuple[Optional[str], Optional[str]]:
+    """Tree-based variant of :func:`extract_title_with_source` for an already-parsed document."""
+    if tree is not None:
+        # 1) <title>, 2) og:title, 3) twitter:title, 4) first <h1>
+        candidates = (
+            ("title", lambda: _first_text(tree, "title")),
+            ("og:title", lambda: _first_meta_content(tree, "property", "og:title")),
+            ("twitter:title", lambda: _first_meta_content(tree, "name", "twitter:title")),
+            ("h1", lambda: _first_text(tree, "h1")),
+        )
+        for source, get in candidates:
+            try:
+                raw = get()
+            except Exception:
+                continue
+            if raw:
+                t = _normalize_title(str(raw))
+                if t:
+                    return (t, source)
 
     # 5) hostname fallback
     fb = _extract_hostname_fallback(url) if url else None
     if fb:
         return (_normalize_title(fb), "hostname")
 
-    logger.warning("No title found using any extraction strategy")
+    if tree is not None:
+        logger.warning("No title found using any extraction strategy")
     return (None, None)
 
 
+def html_digest(html: str) -> bytes:
+    """Short content digest of a page, for keying caches of per-page results."""
+    return hashlib.blake2b((html or "").encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+# Titles for recently seen (html digest, url) pairs, oldest first; a hit skips the full parse
+_title_cache: Dict[tuple[bytes, str], tuple[Optional[str], Optional[str]]] = {}
+_title_cache_lock = threading.Lock()
+TITLE_CACHE_MAX_ENTRIES = 256
+
+
+def extract_title_with_source(html: str, url: str = "") -> tuple[Optional[str], Optional[str]]:
+    """Extract a best-effort title and indicate the source used.
+
+    Priority: <title> → og:title → twitter:title → first <h1> → domain fallback.
+    Always normalizes whitespace and trims to 80 chars.
+    Returns (title, source) where source is one of: "title", "og:title",
+    "twitter:title", "h1", "hostname", or None if not found.
+    Results are memoized on a blake2b digest of the HTML, so re-scoring the
+    same page doesn't re-parse it.
+    """
+    key = (html_digest(html), url)
+    with _title_cache_lock:
+        hit = _title_cache.get(key)
+    if hit is not None:
+        return hit
+    result = extract_title_from_tree(parse_html_tree(html), url)
+    with _title_cache_lock:
+        _title_cache[key] = result
+        while len(_title_cache) > TITLE_CACHE_MAX_ENTRIES:
+            del _title_cache[next(iter(_title_cache))]
+    return result
+
+
 def extract_title(html: str, url: str = "") -> Optional[str]:
     """Backwards-compatible title extractor (returns only the title)."""
     t, _src = extract_title_with_source(html, url)
@@ -168,7 +430,6 @@ def _extract_hostname_fallback(url: str) -> Optional[str]:
     if not url:
         return None
     try:
-        from urllib.parse import urlparse
         parsed = urlparse(url)
         hostname = parsed.hostname or parsed.netloc
         if hostname:
@@ -219,6 +480,11 @@ def parse_html_summary(html: str, url: str) -> Dict[str, Any]:
       "raw_html": str
     }
     """
+    return parse_html_summary_from_tree(parse_html_tree(html), url, html)
+
+
+def parse_html_summary_from_tree(tree: Optional[HtmlElement], url: str, html: str = "") -> Dict[str, Any]:
+    """Same as :func:`parse_html_summary` but reuses a tree from :func:`parse_html_tree`."""
     result: Dict[str, Any] = {
         "title": None,
         "title_source": None,
@@ -230,54 +496,43 @@ def parse_html_summary(html: str, url: str) -> Dict[str, Any]:
         "raw_html": html or "",
     }
 
-    # Short-circuit if no HTML
-    if not html:
-        t, src = extract_title_with_source(html, url)
-        result["title"], result["title_source"] = t, src
-        return result
+    # Title and description
+    t, src = extract_title_from_tree(tree, url)
+    result["title"], result["title_source"] = t, src
 
-    try:
-        soup = BeautifulSoup(html, "html.parser")
-    except Exception as e:
-        logger.warning(f"BeautifulSoup parse failed: {e}")
-        result["title"] = extract_title(html, url)
+    # Short-circuit if no HTML
+    if tree is None:
         return result
 
-    # Title and description
-    t, src = extract_title_with_source(html, url)
-    result["title"], result["title_source"] = t, src
     try:
-        md = soup.find("meta", attrs={"name": "description"})
-        if md and md.get("content"):
-            result["meta_description"] = str(md.get("content")).strip()
-        elif not result["meta_description"]:
-            ogd = soup.find("meta", property="og:description")
-            if ogd and ogd.get("content"):
-                result["meta_description"] = str(ogd.get("content")).strip()
+        md = _first_meta_content(tree, "name", "description")
+        if md:
+            result["meta_description"] = str(md).strip()
+        else:
+            ogd = _first_meta_content(tree, "property", "og:description")
+            if ogd:
+                result["meta_description"] = str(ogd).strip()
     except Exception:
         # Non-fatal
         pass
 
     # Headings
     try:
-        def _texts(tag: str) -> List[str]:
-            return [t.get_text(strip=True) for t in soup.find_all(tag) if t.get_text(strip=True)]
-
-        result["headings"] = {
-            "h1": _texts("h1"),
-            "h2": _texts("h2"),
-            "h3": _texts("h3"),
-        }
+        headings: Dict[str, List[str]] = {"h1": [], "h2": [], "h3": []}
+        for el in tree.iter("h1", "h2", "h3"):
+            text = el.text_content().strip()
+            if text:
+                headings[el.tag].append(text)
+        result["headings"] = headings
     except Exception:
         pass
 
     # Links internal/external
     try:
-        from urllib.parse import urlparse, urljoin
         parsed_host = (urlparse(url).hostname or "").lower()
         internal = 0
         external = 0
-        for a in soup.find_all("a"):
+        for a in tree.iter("a"):
             href = a.get("href") or ""
             if not href or href.startswith("#"):
                 continue
@@ -292,29 +547,11 @@ def parse_html_summary(html: str, url: str) -> Dict[str, Any]:
     except Exception:
         pass
 
-    # Schema: use extruct defensively, and return JSON-LD blocks only in schema_blocks
+    # Schema: only JSON-LD blocks are returned, so read them with the precompiled
+    # ld+json XPath instead of running every extruct syntax over the tree
     try:
-        try:
-            import extruct  # type: ignore
-            from w3lib.html import get_base_url  # type: ignore
-        except Exception as e:
-            logger.warning(f"extruct not available: {e}")
-            return result
-
-        base = get_base_url(html, url) if "get_base_url" in globals() else url
-        data = extruct.extract(html, base_url=base, syntaxes=["json-ld", "microdata", "opengraph"]) or {}
-
-        if not isinstance(data, dict):
-            logger.warning(f"extruct returned non-dict: {type(data)}")
-            data = {}
-
-        json_ld = data.get("json-ld", []) if isinstance(data, dict) else []
-        # Normalize unexpected shapes
-        if isinstance(json_ld, list):
-            # Flatten one level for list-of-lists
-            json_ld = _flatten_list(json_ld)
-        else:
-            json_ld = []
+        # Flatten one level for list-of-lists
+        json_ld = _flatten_list(extract_json_ld(tree))
 
         # Only include dict blocks
         blocks: List[Dict[str, Any]] = [b for b in json_ld if isinstance(b, dict)]
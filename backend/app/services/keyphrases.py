@@ -4,15 +4,21 @@ Provides a thin wrapper around KeyBERT with:
 - Singleton model instance
 - Word-length limiting to avoid heavy inputs
 - Timeout guard
-- Optional Redis cache (set REDIS_URL to enable)
+- In-process LRU plus optional Redis cache (set REDIS_URL to enable), keyed by text content
 """
 from __future__ import annotations
 
 import hashlib
 import os
+import threading
 import time
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List
+
+# Phrases for recently seen texts, oldest first; unchanged text skips KeyBERT entirely
+_phrase_cache: Dict[str, List[str]] = {}
+_phrase_cache_lock = threading.Lock()
+PHRASE_CACHE_MAX_ENTRIES = 512
 
 
 @lru_cache(maxsize=1)
@@ -26,56 +32,83 @@ def _kb():
 def _truncate_words(text: str, max_words: int) -> str:
     if not text:
         return ""
-    words = text.split()
+    # maxsplit stops tokenizing after max_words; the remainder stays one string
+    words = text.split(None, max_words)
     if len(words) <= max_words:
         return text
     return " ".join(words[:max_words])
 
 
+# Redis client, kept once created; a failed attempt is retried after REDIS_RETRY_SECONDS
+_redis_client = None
+_redis_retry_at = 0.0
+_redis_lock = threading.Lock()
+REDIS_RETRY_SECONDS = 30.0
+
+
 def _get_redis():
+    global _redis_client, _redis_retry_at
+    if _redis_client is not None:
+        return _redis_client
     url = os.getenv("REDIS_URL")
-    if not url:
-        return None
-    try:
-        import redis
-        return redis.Redis.from_url(url)
-    except Exception:
+    if not url or time.monotonic() < _redis_retry_at:
         return None
+    with _redis_lock:
+        if _redis_client is None:
+            try:
+                import redis
+                _redis_client = redis.Redis.from_url(url)
+            except Exception:
+                _redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+    return _redis_client
+
+
+def _remember(key: str, phrases: List[str]) -> None:
+    with _phrase_cache_lock:
+        _phrase_cache.pop(key, None)
+        _phrase_cache[key] = list(phrases)
+        while len(_phrase_cache) > PHRASE_CACHE_MAX_ENTRIES:
+            del _phrase_cache[next(iter(_phrase_cache))]
 
 
 def extract_keyphrases(
     text: str,
     top_n: int = 8,
     timeout_ms: int = 2000,
-    cache_key: Optional[str] = None,
 ) -> List[str]:
     """Extract keyphrases using KeyBERT.
 
     - Limits input to KEYPHRASES_TEXT_LIMIT words (default 3000)
     - Returns [] if it exceeds timeout_ms
     - De-duplicates phrases case-insensitively, preserving first casing
-    - Uses Redis cache if REDIS_URL is configured
+    - Caches by a digest of the (truncated) text, so a changed page is recomputed
+      and identical text is shared across URLs; Redis backs the cache if configured
     """
     start = time.time()
     max_words = int(os.getenv("KEYPHRASES_TEXT_LIMIT", "3000"))
     text = _truncate_words(text or "", max_words)
 
-    # Redis cache
     phrases: List[str] = []
+    key = "kp:{}:{}:{}".format(
+        hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest(), top_n, max_words
+    )
+    with _phrase_cache_lock:
+        hit = _phrase_cache.get(key)
+    if hit is not None:
+        return list(hit)
+
+    # Redis cache
     ttl = int(os.getenv("KEYPHRASES_CACHE_TTL_SECONDS", "43200"))  # 12h default
     cache = _get_redis()
-    key: Optional[str] = None
     if cache is not None:
-        base = cache_key or text[:2048]
-        sha = hashlib.sha1(base.encode("utf-8")).hexdigest()
-        key = f"kp:{sha}:{top_n}:{max_words}"
-        val = cache.get(key)
-        if val:
-            try:
+        try:
+            val = cache.get(key)
+            if val:
                 phrases = [p for p in val.decode("utf-8").split("\n") if p]
+                _remember(key, phrases)
                 return phrases
-            except Exception:
-                pass
+        except Exception:
+            pass
 
     try:
         kw_model = _kb()
@@ -117,11 +150,13 @@ def extract_keyphrases(
     if timeout_ms > 0 and elapsed_ms > timeout_ms:
         return []
 
-    if cache is not None and key and phrases:
-        try:
-            cache.setex(key, ttl, "\n".join(phrases))
-        except Exception:
-            pass
+    if phrases:
+        _remember(key, phrases)
+        if cache is not None:
+            try:
+                cache.setex(key, ttl, "\n".join(phrases))
+            except Exception:
+                pass
 
     # Emit basic metrics
     try:
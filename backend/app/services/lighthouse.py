@@ -6,7 +6,8 @@ using tenacity and returns a normalized dict with key metrics and a small
 raw subset for debugging.
 
 Features:
-- Caching: Results cached for PSI_CACHE_TTL_SECONDS (default 12h)
+- Caching: Results cached for PSI_CACHE_TTL_SECONDS (default 12h), bounded to
+  PSI_CACHE_MAX_ENTRIES; psi_needs_refresh() lets callers re-warm entries near expiry
 - Deduplication: In-flight requests for same URL return same result
 - Circuit breaker: Auto-disable PSI for 5min after 3 consecutive failures
 
@@ -16,8 +17,11 @@ Env:
 """
 from __future__ import annotations
 
+import atexit
+import json
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import threading
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -27,15 +31,28 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Cache structure: {(url, strategy): (result_dict, timestamp)}
+# orjson decodes in C; fall back to stdlib json when it isn't installed
+try:
+    from orjson import loads as _json_loads  # type: ignore
+except ImportError:
+    _json_loads = json.loads
+
+# Cache structure: {(url, strategy): (result_dict, timestamp)}, oldest first
 _psi_cache: Dict[tuple, tuple[Dict[str, Any], float]] = {}
 _cache_lock = threading.Lock()
+PSI_CACHE_MAX_ENTRIES = 4096
+# Entries in the last fraction of their TTL are due for a background refresh
+PSI_REFRESH_MARGIN = 0.1
 
-# Deduplication: track in-flight requests
-_in_flight: Dict[str, threading.Event] = {}
-_in_flight_results: Dict[str, Dict[str, Any]] = {}
+# Deduplication: track in-flight requests per cache key
+_in_flight: Dict[tuple, threading.Event] = {}
 _in_flight_lock = threading.Lock()
 
+# Keep-alive session so repeated PSI calls reuse the TLS connection to googleapis.com
+_PSI_SESSION = requests.Session()
+_PSI_SESSION.mount("https://", HTTPAdapter(pool_maxsize=32))
+atexit.register(_PSI_SESSION.close)
+
 # Circuit breaker state
 _circuit_breaker_failures = 0
 _circuit_breaker_tripped_until = 0.0
@@ -72,15 +89,27 @@ def _call_psi(url: str, key: str, timeout: int = 12) -> Dict[str, Any]:
         "key": key,
     }
     # requests will serialise list params correctly
-    resp = requests.get(endpoint, params=params, timeout=timeout)
+    resp = _PSI_SESSION.get(endpoint, params=params, timeout=timeout)
     resp.raise_for_status()
-    return resp.json()
+    # PSI responses run to hundreds of KB; decode the raw bytes in C
+    return _json_loads(resp.content)
 
 
-def fetch_psi(url: str, strategy: str = "mobile") -> Dict[str, Any]:
+def psi_needs_refresh(url: str, strategy: str = "mobile") -> bool:
+    """True when a cached PSI result for url exists and is close to expiry."""
+    with _cache_lock:
+        hit = _psi_cache.get((url, strategy))
+    if hit is None:
+        return False
+    age = time.time() - hit[1]
+    return age >= settings.PSI_CACHE_TTL_SECONDS * (1 - PSI_REFRESH_MARGIN)
+
+
+def fetch_psi(url: str, strategy: str = "mobile", refresh: bool = False) -> Dict[str, Any]:
     """Fetch PSI data for a URL and normalize some important fields.
     
-    Includes caching, deduplication, and circuit breaker.
+    Includes caching, deduplication, and circuit breaker. refresh=True skips the
+    cache read so a background task can re-warm an entry before it expires.
 
     Returns a dict with keys: source, available(bool), performance, seo,
     web_vitals (lcp_ms, inp_ms, cls, tbt_ms), raw (small debug dict)
@@ -107,35 +136,36 @@ def fetch_psi(url: str, strategy: str = "mobile") -> Dict[str, Any]:
     cache_ttl = settings.PSI_CACHE_TTL_SECONDS
     
     # Check cache
-    with _cache_lock:
-        if cache_key in _psi_cache:
-            cached_result, cached_time = _psi_cache[cache_key]
-            age = time.time() - cached_time
-            if age < cache_ttl:
-                logger.info(f"PSI cache hit for {url} (age={int(age)}s)")
-                return cached_result
-            else:
-                # Expired, remove
-                del _psi_cache[cache_key]
+    if not refresh:
+        with _cache_lock:
+            if cache_key in _psi_cache:
+                cached_result, cached_time = _psi_cache[cache_key]
+                age = time.time() - cached_time
+                if age < cache_ttl:
+                    logger.info(f"PSI cache hit for {url} (age={int(age)}s)")
+                    return cached_result
+                else:
+                    # Expired, remove
+                    del _psi_cache[cache_key]
     
     # Check if request already in flight
     with _in_flight_lock:
-        if url in _in_flight:
-            logger.info(f"PSI request for {url} already in flight, waiting...")
-            event = _in_flight[url]
-        else:
+        event = _in_flight.get(cache_key)
+        is_primary = event is None
+        if is_primary:
             # Mark as in-flight
             event = threading.Event()
-            _in_flight[url] = event
+            _in_flight[cache_key] = event
     
-    # If we're waiting on another request
-    if url in _in_flight_results:
+    # If we're waiting on another request, take its result from the cache
+    if not is_primary:
+        logger.info(f"PSI request for {url} already in flight, waiting...")
         event.wait(timeout=30)
-        with _in_flight_lock:
-            if url in _in_flight_results:
-                result = _in_flight_results[url]
-                del _in_flight_results[url]
-                return result
+        with _cache_lock:
+            hit = _psi_cache.get(cache_key)
+        if hit is not None:
+            return hit[0]
+        # Primary timed out; fall through and fetch ourselves
     
     # We're the primary request, do the fetch
     try:
@@ -158,13 +188,14 @@ def fetch_psi(url: str, strategy: str = "mobile") -> Dict[str, Any]:
                 logger.error(f"PSI circuit breaker TRIPPED after {_circuit_breaker_failures} failures")
         
         result = {"source": "psi", "available": False, "error": str(e), "status_code": status}
-        _store_and_notify(url, cache_key, result, event)
+        # A failed re-warm leaves the good entry it was refreshing in place
+        _store_and_notify(url, cache_key, result, event, store=not refresh)
         return result
         
     except Exception as e:
         logger.warning(f"PSI request failed for {url}: {type(e).__name__}: {e}")
         result = {"source": "psi", "available": False, "error": str(e)}
-        _store_and_notify(url, cache_key, result, event)
+        _store_and_notify(url, cache_key, result, event, store=not refresh)
         return result
 
     # Navigate the response safely
@@ -216,15 +247,20 @@ def fetch_psi(url: str, strategy: str = "mobile") -> Dict[str, Any]:
     return result
 
 
-def _store_and_notify(url: str, cache_key: tuple, result: Dict[str, Any], event: threading.Event) -> None:
-    """Store result in cache and notify waiting threads."""
-    # Cache the result
-    with _cache_lock:
-        _psi_cache[cache_key] = (result, time.time())
+def _store_and_notify(
+    url: str, cache_key: tuple, result: Dict[str, Any], event: threading.Event, store: bool = True
+) -> None:
+    """Store result in cache (unless store=False) and notify waiting threads."""
+    # Cache the result (re-inserted so dict order stays oldest-first for eviction)
+    if store:
+        with _cache_lock:
+            _psi_cache.pop(cache_key, None)
+            _psi_cache[cache_key] = (result, time.time())
+            while len(_psi_cache) > PSI_CACHE_MAX_ENTRIES:
+                del _psi_cache[next(iter(_psi_cache))]
     
     # Notify waiting threads
     with _in_flight_lock:
-        _in_flight_results[url] = result
-        if url in _in_flight:
-            del _in_flight[url]
+        if _in_flight.get(cache_key) is event:
+            del _in_flight[cache_key]
     event.set()
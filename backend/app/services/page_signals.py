@@ -0,0 +1,75 @@
+"""Cheap page signals shared by the orchestrator routes and the RQ worker.
+
+- Case-insensitive scan of raw HTML for review / maps / business-profile needles
+- Google Business / Apple Business Connect hints from those signals plus hrefs
+- NAP fallback patterns (phone, ZIP) for pages without business JSON-LD
+- Keyphrase intent (Local vs Informational) from Texas locality mentions
+"""
+from __future__ import annotations
+
+import re
+from typing import List
+
+# NAP fallback patterns for pages without LocalBusiness/Organization JSON-LD
+PHONE_RE = re.compile(r"(\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+ZIP_RE = re.compile(r"\b\d{5}(?:-\d{4})?\b")
+
+# Literal needles checked by scoring rules and local-SEO hints. Scanning the raw
+# HTML once with a compiled IGNORECASE alternation avoids a full lowercased copy.
+# Needles grouped by the signal they feed, so callers test a category with one set check
+GOOGLE_BUSINESS_NEEDLES = ("google.com/maps", "maps.google.com", "g.page", "business.google.com")
+APPLE_BUSINESS_NEEDLES = ("maps.apple.com", "businessconnect.apple.com")
+HTML_SIGNAL_NEEDLES = (
+    "review",
+    "maps.google",
+    *GOOGLE_BUSINESS_NEEDLES,
+    *APPLE_BUSINESS_NEEDLES,
+)
+_HTML_SIGNAL_RE = re.compile(
+    "|".join(re.escape(n) for n in sorted(HTML_SIGNAL_NEEDLES, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+
+def scan_html_signals(html: str) -> set[str]:
+    """Return the subset of HTML_SIGNAL_NEEDLES present in html (case-insensitive)."""
+    found: set[str] = set()
+    html = html or ""
+    pos = 0
+    while (m := _HTML_SIGNAL_RE.search(html, pos)) is not None:
+        token = m.group(0).lower()
+        if token not in found:
+            # A longer match implies any shorter needle it contains
+            found.update(n for n in HTML_SIGNAL_NEEDLES if n in token)
+        if len(found) == len(HTML_SIGNAL_NEEDLES):
+            break
+        # Resume just past the match start, so a needle overlapping its tail
+        # ("maps.google.com/maps") is still seen
+        pos = m.start() + 1
+    return found
+
+
+def business_hints(html_signals: set[str], out_links: List[str]) -> tuple[bool, bool]:
+    """(google_business_hint, apple_business_connect_hint) from page signals plus hrefs.
+
+    Links are only scanned while a hint is still unresolved, and the scan stops
+    at the first link that settles both.
+    """
+    google = not html_signals.isdisjoint(GOOGLE_BUSINESS_NEEDLES)
+    apple = not html_signals.isdisjoint(APPLE_BUSINESS_NEEDLES)
+    for link in out_links:
+        if google and apple:
+            break
+        link = link.lower()
+        google = google or any(n in link for n in GOOGLE_BUSINESS_NEEDLES)
+        apple = apple or any(n in link for n in APPLE_BUSINESS_NEEDLES)
+    return google, apple
+
+
+# Texas locality mention ("tx" or "texas" as a whole word) marks keyphrase intent as Local
+LOCAL_INTENT_RE = re.compile(r"\b(?:tx|texas)\b", re.IGNORECASE)
+
+
+def keyphrase_intent(text: str) -> str:
+    """Intent shared by every keyphrase of a page: "Local" or "Informational"."""
+    return "Local" if LOCAL_INTENT_RE.search(text or "") else "Informational"
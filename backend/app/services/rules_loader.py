@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 import time
@@ -41,6 +42,7 @@ _cached_path: Optional[Path] = None
 _cached_mtime: Optional[float] = None
 
 
+@lru_cache(maxsize=1)
 def _default_rules_path() -> Path:
     # Code lives under /app/app/...; project root is /app
     root = Path(__file__).resolve().parents[2]  # /app
@@ -67,10 +69,14 @@ def get_rules(path: Optional[str | Path] = None) -> tuple[RulesFile, float]:
     global _cached_rules, _cached_path, _cached_mtime
 
     p = Path(path) if path else _default_rules_path()
-    mtime = p.stat().st_mtime if p.exists() else 0.0
+    # One stat per call; the YAML is only re-parsed when its mtime changes
+    try:
+        mtime = p.stat().st_mtime
+    except OSError:
+        mtime = 0.0
 
     with _lock:
-        if _cached_rules is None or _cached_path != p or (_cached_mtime or 0.0) < mtime:
+        if _cached_rules is None or _cached_path != p or (mtime and mtime != _cached_mtime):
             # Load and cache
             rules = load_rules(p)
             _cached_rules = rules
@@ -7,6 +7,7 @@ and common test/internal domains. Only http/https schemes are allowed.
 from __future__ import annotations
 
 import ipaddress
+from functools import lru_cache
 from urllib.parse import urlparse
 from typing import Optional
 
@@ -22,6 +23,39 @@ def _is_blocked_ip(ip: ipaddress._BaseAddress) -> bool:
     )
 
 
+@lru_cache(maxsize=1024)
+def _host_error(hostname: str) -> Optional[str]:
+    """Rejection message for a blocked hostname, or None if it is allowed.
+
+    Depends only on the hostname (no DNS resolution), so repeat scans of the
+    same host reuse the verdict.
+    """
+    # Block obvious localhost variants early
+    hostname_l = hostname.lower()
+    if (
+        hostname_l == "localhost"
+        or hostname_l.endswith(".localhost")
+        or hostname_l.startswith("127.")
+        or hostname_l == "0.0.0.0"
+        or hostname_l == "::1"
+        or hostname_l == "[::1]"
+        or hostname_l == "[::ffff:127.0.0.1]"
+    ):
+        return f"Localhost/loopback addresses not allowed: {hostname}"
+
+    # If it's an IP literal, evaluate directly
+    try:
+        ip = ipaddress.ip_address(hostname)
+        if _is_blocked_ip(ip):
+            return f"Private/internal IP addresses not allowed: {ip}"
+    except ValueError:
+        # Not an IP literal, check for private/test TLDs (no DNS resolution performed)
+        private_tlds = (".local", ".internal", ".test", ".example", ".invalid")
+        if hostname_l.endswith(private_tlds):
+            return f"Private/test domains not allowed: {hostname}"
+    return None
+
+
 def validate_url_or_raise(url: str) -> None:
     """Validate URL to prevent SSRF attacks.
 
@@ -47,29 +81,9 @@ def validate_url_or_raise(url: str) -> None:
     if not hostname:
         raise SSRFProtectionError("URL must have a valid hostname")
 
-    # Block obvious localhost variants early
-    hostname_l = hostname.lower()
-    if (
-        hostname_l == "localhost"
-        or hostname_l.endswith(".localhost")
-        or hostname_l.startswith("127.")
-        or hostname_l == "0.0.0.0"
-        or hostname_l == "::1"
-        or hostname_l == "[::1]"
-        or hostname_l == "[::ffff:127.0.0.1]"
-    ):
-        raise SSRFProtectionError(f"Localhost/loopback addresses not allowed: {hostname}")
-
-    # If it's an IP literal, evaluate directly
-    try:
-        ip = ipaddress.ip_address(hostname)
-        if _is_blocked_ip(ip):
-            raise SSRFProtectionError(f"Private/internal IP addresses not allowed: {ip}")
-    except ValueError:
-        # Not an IP literal, check for private/test TLDs (no DNS resolution performed)
-        private_tlds = (".local", ".internal", ".test", ".example", ".invalid")
-        if hostname_l.endswith(private_tlds):
-            raise SSRFProtectionError(f"Private/test domains not allowed: {hostname}")
+    error = _host_error(hostname)
+    if error:
+        raise SSRFProtectionError(error)
 
     # Block URLs with embedded credentials
     if parsed.username or parsed.password:
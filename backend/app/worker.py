@@ -12,9 +12,11 @@ Usage:
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import sys
+import threading
 import time
 from typing import Any, Dict, List, Tuple
 from pydantic import BaseModel, Field
@@ -195,7 +197,7 @@ def process_scan_job(job_id: str, url: str, user_id: str | None = None) -> dict:
     from sqlmodel import Session, select
     from app.core.db import engine
     from app.models import ScanJob
-    from app.services.fetcher import fetch_html
+    from app.services.fetcher import extract_structured_data, extract_text, fetch_html_sync, parse_html_tree
     from app.services.lighthouse import fetch_psi
     from app.services.keyphrases import extract_keyphrases
     from app.services.crewai_reasoner import generate_recommendations
@@ -232,37 +234,34 @@ def process_scan_job(job_id: str, url: str, user_id: str | None = None) -> dict:
             db.add(job)
             db.commit()
 
-            import anyio
             timeout_s = int(os.getenv("EXTRACT_TIMEOUT_SECONDS", "20"))
-            html, html_ms = anyio.run(fetch_html, url, timeout_s)
+            html, html_ms = fetch_html_sync(url, timeout_s)
 
             # PARSE
             job.progress = 20
             db.commit()
 
-            import trafilatura
-            from bs4 import BeautifulSoup
-            import extruct
-            import re
-            
-            text = trafilatura.extract(html or "", output_format="txt", include_comments=False) or ""
-            soup = BeautifulSoup(html or "", "html.parser")
-            title_tag = soup.find("title")
-            title = title_tag.get_text(strip=True) if title_tag else None
+            # Parse once with lxml (C); the tree feeds trafilatura, the title, extruct and the links
+            tree = parse_html_tree(html or "")
+            text = extract_text(tree if tree is not None else (html or ""), html)
+            title_tag = tree.find(".//title") if tree is not None else None
+            title = title_tag.text_content().strip() if title_tag is not None else None
             extract = {"title": title, "text": text}
             
             # Extract structured data
             schema = []
             schema_raw = {}
             try:
-                schema_raw = extruct.extract(html or "", base_url=url, syntaxes=["json-ld", "microdata"])
+                doc = tree if tree is not None else (html or "")
+                schema_raw = extract_structured_data(doc, url, ["json-ld", "microdata"])
                 schema = schema_raw.get("json-ld", [])
             except Exception:
                 pass
             
             # Extract business NAP and local SEO signals
-            html_lower = (html or "").lower()
-            out_links = [a.get("href") or "" for a in soup.find_all("a")]
+            from app.services.page_signals import PHONE_RE, ZIP_RE, business_hints, scan_html_signals
+            html_signals = scan_html_signals(html or "")
+            out_links = [a.get("href") or "" for a in tree.iter("a")] if tree is not None else []
             
             business_data = {}
             try:
@@ -301,19 +300,17 @@ def process_scan_job(job_id: str, url: str, user_id: str | None = None) -> dict:
                             parts = [biz_street, biz_city, biz_state, biz_postal]
                             biz_address = biz_address or ", ".join([p for p in parts if p]) or None
                 
-                # Regex fallback
+                # Regex fallback (patterns precompiled in app.services.page_signals)
                 if not biz_phone:
-                    phone_match = re.search(r"(\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text)
+                    phone_match = PHONE_RE.search(text)
                     biz_phone = phone_match.group(0) if phone_match else None
                 
                 if not biz_postal:
-                    zip_match = re.search(r'\b\d{5}(?:-\d{4})?\b', text)
+                    zip_match = ZIP_RE.search(text)
                     biz_postal = zip_match.group(0) if zip_match else None
                 
-                # Detect platform hints
-                all_links = " ".join(out_links + [html_lower])
-                google_hint = bool("google.com/maps" in all_links or "maps.google.com" in all_links or "g.page" in all_links)
-                apple_hint = bool("maps.apple.com" in all_links or "businessconnect.apple.com" in all_links)
+                # Detect platform hints from the one-pass HTML scan plus hrefs, without joining them
+                google_hint, apple_hint = business_hints(html_signals, out_links)
                 
                 nap_detected = bool(biz_name and biz_phone and (biz_address or (biz_city and biz_state)))
                 
@@ -513,51 +510,88 @@ def _same_origin(base: str, candidate: str) -> bool:
 
 
 def _collect_same_origin_links(html: str, base_url: str, limit: int = 5) -> List[str]:
+    """First ``limit`` distinct same-origin links, in document order, from one walk of the anchors."""
     try:
-        from bs4 import BeautifulSoup
         from urllib.parse import urljoin
-        soup = BeautifulSoup(html or "", "html.parser")
-        links: List[str] = []
-        for a in soup.find_all("a"):
+        from app.services.fetcher import parse_html_tree
+        tree = parse_html_tree(html or "")
+        seen = set()
+        uniq: List[str] = []
+        for a in tree.iter("a") if tree is not None else ():
             href = a.get("href") or ""
             if not href or href.startswith("#"):
                 continue
             full = urljoin(base_url, href)
-            if _same_origin(base_url, full):
-                links.append(full)
-        # Preserve order, uniq
-        seen = set()
-        uniq: List[str] = []
-        for u in links:
-            if u in seen:
+            if full in seen or not _same_origin(base_url, full):
                 continue
-            seen.add(u)
-            uniq.append(u)
-        return uniq[:limit]
+            seen.add(full)
+            uniq.append(full)
+            if len(uniq) >= limit:
+                break
+        return uniq
     except Exception:
         return []
 
 
-def _robots_allows(base_url: str, target_url: str, ua: str = "XenlixAI/1.0") -> bool:
+# The shallow crawler identifies as itself on every request, so the robots.txt rules it
+# obeys (checked for this agent) are the ones that apply to what it sends
+CRAWLER_USER_AGENT = "XenlixAI/1.0"
+CRAWLER_HEADERS = {"User-Agent": CRAWLER_USER_AGENT}
+
+# Parsed robots.txt per URL, oldest first: (expires_at on the monotonic clock, parser or None)
+_ROBOTS_CACHE: Dict[str, tuple[float, Any]] = {}
+_robots_cache_lock = threading.Lock()
+ROBOTS_CACHE_TTL_SECONDS = 3600
+ROBOTS_CACHE_MAX_ENTRIES = 64
+
+
+def _fetch_robots(robots_url: str) -> tuple[Any, bool]:
+    """(parser, cacheable) for robots_url; a None parser means allow everything.
+
+    A missing robots.txt (4xx) is an answer and may be cached; network errors and
+    5xx are not, so the origin is asked again on the next crawl.
+    """
+    import urllib.robotparser as robotparser
+    from app.api.routes.orchestrator import _HTTP_CLIENT
+    rp = robotparser.RobotFileParser()
+    rp.set_url(robots_url)
+    # Short timeout fetch
     try:
-        from urllib.parse import urlparse, urljoin
-        import urllib.robotparser as robotparser
+        r = _HTTP_CLIENT.get(robots_url, timeout=3, headers=CRAWLER_HEADERS)
+        if r.status_code >= 500:
+            return None, False
+        if r.status_code >= 400:
+            # Treat missing robots as allow
+            return None, True
+        rp.parse(r.text.splitlines())
+    except Exception:
+        # Network issues: be permissive for shallow, or set policy to allow
+        return None, False
+    return rp, True
+
+
+def _robots_parser(robots_url: str) -> Any:
+    """Parsed robots.txt for robots_url, reused for ROBOTS_CACHE_TTL_SECONDS; None means allow everything."""
+    with _robots_cache_lock:
+        hit = _ROBOTS_CACHE.get(robots_url)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    rp, cacheable = _fetch_robots(robots_url)
+    if cacheable:
+        with _robots_cache_lock:
+            _ROBOTS_CACHE.pop(robots_url, None)
+            _ROBOTS_CACHE[robots_url] = (time.monotonic() + ROBOTS_CACHE_TTL_SECONDS, rp)
+            while len(_ROBOTS_CACHE) > ROBOTS_CACHE_MAX_ENTRIES:
+                del _ROBOTS_CACHE[next(iter(_ROBOTS_CACHE))]
+    return rp
+
+
+def _robots_allows(base_url: str, target_url: str, ua: str = CRAWLER_USER_AGENT) -> bool:
+    try:
+        from urllib.parse import urlparse
         parsed = urlparse(base_url)
-        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-        rp = robotparser.RobotFileParser()
-        rp.set_url(robots_url)
-        # Short timeout fetch
-        import requests
-        try:
-            r = requests.get(robots_url, timeout=3)
-            if r.status_code >= 400:
-                # Treat missing robots as allow
-                return True
-            rp.parse(r.text.splitlines())
-        except Exception:
-            # Network issues: be permissive for shallow, or set policy to allow
-            return True
-        return rp.can_fetch(ua, target_url)
+        rp = _robots_parser(f"{parsed.scheme}://{parsed.netloc}/robots.txt")
+        return True if rp is None else rp.can_fetch(ua, target_url)
     except Exception:
         return True
 
@@ -577,10 +611,11 @@ def process_shallow_crawl(job_id: int, url: str, max_pages: int = 5) -> dict:
     # Fetch base page to collect outbound links
     html = ""
     try:
-        import httpx
-        with httpx.Client(follow_redirects=True, headers={"User-Agent": "XenlixAI/1.0"}, timeout=8) as client:
-            r = client.get(url)
-            html = r.text or ""
+        from app.api.routes.orchestrator import _HTTP_CLIENT
+        from app.services.fetcher import decode_body, read_capped
+        # Pooled client: robots.txt and this page share the connection to the origin
+        with _HTTP_CLIENT.stream("GET", url, timeout=8, headers=CRAWLER_HEADERS) as r:
+            html = decode_body(r, read_capped(r))
     except Exception:
         html = ""
 
@@ -588,30 +623,26 @@ def process_shallow_crawl(job_id: int, url: str, max_pages: int = 5) -> dict:
 
     results: List[Dict[str, Any]] = []
     try:
-        from bs4 import BeautifulSoup
-        import httpx
+        from app.services.fetcher import parse_html_tree
         # Reuse analyzers from orchestrator (safe helpers)
         from app.api.routes.orchestrator import (
             _extract_structured_data_summary,
             _compute_scores,
+            _fetch_pages,
         )
-        for link in links:
-            if not _robots_allows(url, link):
-                continue
-            status_code = None
-            page_html = ""
-            try:
-                with httpx.Client(follow_redirects=True, headers={"User-Agent": "XenlixAI/1.0"}, timeout=8) as client:
-                    resp = client.get(link)
-                    status_code = resp.status_code
-                    page_html = resp.text or ""
-            except Exception:
-                pass
+        from app.services.page_signals import scan_html_signals
+        allowed = [link for link in links if _robots_allows(url, link)]
+        # Fetch all allowed pages concurrently over one connection pool
+        pages = asyncio.run(_fetch_pages(allowed, timeout=8, headers=CRAWLER_HEADERS))
+        for link, (_final_url, status_code, page_html, _ms) in zip(allowed, pages):
+            # One lxml parse per page, shared by the title lookup and structured data
+            tree = parse_html_tree(page_html or "")
+
             # Title
             title = None
             try:
-                soup = BeautifulSoup(page_html or "", "html.parser")
-                title = soup.title.string if soup.title and soup.title.string else (soup.title.get_text() if soup.title else None)
+                title_tag = tree.find(".//title") if tree is not None else None
+                title = title_tag.text_content() if title_tag is not None else None
                 if title:
                     title = " ".join(title.split()).strip()[:80]
             except Exception:
@@ -619,7 +650,7 @@ def process_shallow_crawl(job_id: int, url: str, max_pages: int = 5) -> dict:
 
             # Structured data summary
             try:
-                sd_summary, faq_count, _raw = _extract_structured_data_summary(page_html or "", link)
+                sd_summary, faq_count, _raw = _extract_structured_data_summary(page_html or "", link, tree=tree)
                 stypes = sd_summary.types
             except Exception:
                 faq_count = 0
@@ -632,7 +663,7 @@ def process_shallow_crawl(job_id: int, url: str, max_pages: int = 5) -> dict:
                 "internal_links": 0,
                 "text_len": 0,
                 "headings": {"h1": [], "h2": [], "h3": []},
-                "html_lower": (page_html or "").lower(),
+                "html_signals": scan_html_signals(page_html or ""),
             }
             biz_dict = {"name": None, "phone": None, "address": None, "geo": {"lat": None, "lng": None}}
             psi_stub = {"performance": None}
@@ -11,6 +11,7 @@ backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from app.api.routes.orchestrator import _load_scoring_rules, _compute_scores
+from app.services.page_signals import scan_html_signals
 
 def test_rules_loading():
     """Test that rules load from YAML file."""
@@ -48,7 +49,7 @@ def test_scoring_computation():
         "internal_links": 35,
         "text_len": 2400,
         "links_text": ["Home", "About", "Services", "Contact"],
-        "html_lower": "reviews from customers show we're trusted. maps.google embed here.",
+        "html_signals": scan_html_signals("Reviews from customers show we're trusted. maps.google embed here."),
         "out_links": ["https://yelp.com/biz/example", "https://facebook.com/example"],
     }
     
@@ -102,7 +103,7 @@ def test_missing_data_scenario():
         "internal_links": 5,
         "text_len": 400,
         "links_text": [],
-        "html_lower": "",
+        "html_signals": set(),
         "out_links": [],
     }
     
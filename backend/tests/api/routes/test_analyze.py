@@ -0,0 +1,52 @@
+from app.api.routes.analyze import (
+    _PREVIEW_MAX_HEADINGS,
+    _PreviewParser,
+    _extract_preview,
+)
+
+
+def test_extract_preview_collects_title_headings_and_meta() -> None:
+    html = (
+        "<html><head><TITLE> Acme &amp; Co </TITLE>"
+        '<meta name="Description" content=" Plumbers ">'
+        '<meta name="keywords" content="a,b"></head>'
+        "<body><h1>Welcome <b>home</b></h1><h2>Why?</h2><h3>Sub</h3><h4>skip</h4></body></html>"
+    )
+    preview = _extract_preview(html)
+    assert preview.title == "Acme & Co"
+    assert preview.headings == ["Welcome home", "Why?", "Sub"]
+    assert preview.meta == {"description": "Plumbers", "keywords": "a,b"}
+
+
+def test_extract_preview_first_title_and_meta_win() -> None:
+    html = (
+        "<title>first</title><title>second</title>"
+        '<meta name="description" content="one"><meta name="description" content="two">'
+    )
+    preview = _extract_preview(html)
+    assert preview.title == "first"
+    assert preview.meta == {"description": "one"}
+
+
+def test_extract_preview_mismatched_heading_close_ends_heading() -> None:
+    assert _extract_preview("<h1>a</h2><h2>b</h2>").headings == ["a", "b"]
+
+
+def test_extract_preview_caps_headings() -> None:
+    html = "<h2>h</h2>" * (_PREVIEW_MAX_HEADINGS + 10)
+    assert len(_extract_preview(html).headings) == _PREVIEW_MAX_HEADINGS
+
+
+def test_extract_preview_empty_html() -> None:
+    preview = _extract_preview("")
+    assert preview.title is None
+    assert preview.headings == []
+    assert preview.meta == {}
+
+
+def test_preview_parser_done_only_waits_for_expected_parts() -> None:
+    parser = _PreviewParser(expect_title=True, expect_headings=False, expect_meta=("description",))
+    parser.feed("<title>t</title>")
+    assert not parser.done
+    parser.feed('<meta name="description" content="d">')
+    assert parser.done
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Any, List, Optional
+
+import pytest
+from fastapi import BackgroundTasks
+
+from app.api.routes import analyze_url as route
+
+
+def _run(monkeypatch: pytest.MonkeyPatch, final_url: str) -> tuple[List[str], Any]:
+    events: List[str] = []
+
+    async def fetch_page(url: str) -> tuple[str, Optional[int], str, int]:
+        events.append("page:start")
+        await asyncio.sleep(0.05)
+        events.append("page:done")
+        return final_url, 200, "", 50
+
+    async def fetch_psi_snapshot(url: str) -> dict:
+        events.append(f"psi:start {url}")
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            events.append(f"psi:cancelled {url}")
+            raise
+        events.append(f"psi:done {url}")
+        return {"performance": 90, "url": url}
+
+    monkeypatch.setattr(route, "_validate_cached", lambda url: url)
+    monkeypatch.setattr(route, "_fetch_page", fetch_page)
+    monkeypatch.setattr(route, "_fetch_psi_snapshot", fetch_psi_snapshot)
+    monkeypatch.setattr(route, "psi_needs_refresh", lambda url: False)
+    monkeypatch.setattr(route, "_build_response", lambda *args: args)
+    payload = route.AnalyzeUrlRequest(url="https://acme.com/")
+    return events, asyncio.run(route.analyze_url(payload, BackgroundTasks()))
+
+
+def test_psi_runs_alongside_the_page_fetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    events, args = _run(monkeypatch, "https://acme.com/")
+    assert events.index("psi:start https://acme.com/") < events.index("page:done")
+    assert args[6] == {"performance": 90, "url": "https://acme.com/"}
+
+
+def test_redirect_drops_speculative_psi_and_scores_final_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    events, args = _run(monkeypatch, "https://www.acme.com/home")
+    assert "psi:cancelled https://acme.com/" in events
+    assert "psi:done https://acme.com/" not in events
+    assert events[-1] == "psi:done https://www.acme.com/home"
+    assert args[6] == {"performance": 90, "url": "https://www.acme.com/home"}
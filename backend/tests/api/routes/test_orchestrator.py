@@ -0,0 +1,209 @@
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from app.api.routes import orchestrator
+from app.api.routes.orchestrator import (
+    _FieldSlots,
+    _compile_formula,
+    _compile_scoring_rules,
+    _compute_scores,
+    _score_dimensions,
+)
+from app.services.page_signals import scan_html_signals
+
+
+def _aeo_scores(rules: List[Dict[str, Any]], data: Dict[str, Any]) -> List[int]:
+    config = {"aeo_dimensions": [{"name": "d", "base_score": 0, "rules": rules}]}
+    aeo, _geo, _weak, load_slots = _compile_scoring_rules(config)
+    return [d.score for d in _score_dimensions(aeo, load_slots(data))]
+
+
+def _dims(scores: Any) -> List[tuple]:
+    return [(d.name, d.score, d.evidence) for d in scores.dimensions]
+
+
+# Expected values below come from the per-call _apply_rule scorer the compiled rules
+# replaced, run over scoring_rules.yaml with the same pages
+def test_compiled_rules_match_original_scorer_on_rich_page() -> None:
+    page = {
+        "faq_count": 3,
+        "headings": {"h1": ["Acme"], "h2": ["How do I book?", "Why us", "What is AEO"]},
+        "schema_types": ["LocalBusiness", "FAQPage", "Organization", "FAQPage"],
+        "internal_links": 234,
+        "text_len": 12000,
+        "links_text": ["Home", "About us"],
+        "html_signals": scan_html_signals("<p>Read our Reviews</p><iframe src='https://maps.google.com/x'></iframe>"),
+        "out_links": ["https://www.yelp.com/biz/acme", "https://www.facebook.com/acme"],
+    }
+    biz = {"name": "Acme", "phone": "555", "address": "1 Main St", "service_areas": ["Irving", "Dallas"], "tel_link": True}
+    aeo, geo, weaknesses = _compute_scores(page, biz, {"performance": 81})
+
+    assert aeo.total == 71
+    assert _dims(aeo) == [
+        ("Answerability", 100, ["faq_count=3", "q_heads=3"]),
+        ("Schema Coverage & Quality", 70, ["LocalBusiness", "FAQPage", "Organization", "FAQPage", "LocalBusiness present"]),
+        ("Entity/NAP Consistency", 100, ["business.name=present", "business.phone=present", "business.address=present"]),
+        ("Topical Authority", 53, ["internal_links=234"]),
+        ("Content Quality", 45, ["text_len=12000"]),
+        ("E-E-A-T", 70, ["About link detected", "Review content detected"]),
+        ("Citations/Backlinks (light)", 60, ["matches=2"]),
+    ]
+    assert geo.total == 52
+    assert _dims(geo) == [
+        ("Local Signals", 60, ["address=present", "Google Maps embed detected"]),
+        ("Service Area Clarity", 40, ["areas=2"]),
+        ("Location Schema", 30, []),
+        ("NAP Prominence", 50, ["business.phone=present"]),
+        ("Local Reviews/Proof", 40, ["Review mentions detected"]),
+        ("Local Speed Snapshot", 90, ["performance=81"]),
+    ]
+    assert weaknesses == []
+
+
+def test_compiled_rules_match_original_scorer_on_weak_page() -> None:
+    page = {"internal_links": 25, "text_len": 1500, "schema_types": ["WebPage"]}
+    aeo, geo, weaknesses = _compute_scores(page, {}, {"performance": 75})
+
+    assert aeo.total == 38
+    assert [d.score for d in aeo.dimensions] == [40, 40, 50, 32, 31, 50, 20]
+    assert aeo.dimensions[0].evidence == ["faq_count=0", "q_heads=0"]
+    assert geo.total == 41
+    assert [d.score for d in geo.dimensions] == [30, 30, 30, 40, 30, 87]
+    assert [(w.title, w.impact, w.evidence) for w in weaknesses] == [
+        ("Missing address on page", "high", ["No PostalAddress/visible address"]),
+        ("Missing LocalBusiness schema", "high", ["schema_types lacks LocalBusiness"]),
+        ("Missing FAQ schema", "med", ["No FAQPage schema detected"]),
+    ]
+
+
+def test_psi_rule_falls_back_without_performance() -> None:
+    rule = {"type": "psi_performance", "field": "psi.performance", "formula": "value // 2", "fallback_score": 40}
+    assert _aeo_scores([rule], {"psi": {"performance": 81}}) == [40]
+    assert _aeo_scores([rule], {"psi": {}}) == [40]
+    assert _aeo_scores([dict(rule, base_score=10)], {"psi": {}}) == [30]
+
+
+@pytest.mark.parametrize(
+    "formula, value, expected",
+    [
+        ("min(50, value // 10)", 234, 23),
+        ("min(50, value // 10)", 9000, 50),
+        ("min(70, value // 800)", 12000, 15),
+        ("value // 2", 81, 40),
+        (" max(0, value - 5) * 2 + 1 ", 3, 1),
+        ("min(10, 20, value)", 15, 10),
+    ],
+)
+def test_compile_formula_evaluates_integer_expressions(formula: str, value: int, expected: int) -> None:
+    fn = _compile_formula(formula)
+    assert fn is not None
+    assert fn(value) == expected
+
+
+@pytest.mark.parametrize(
+    "formula",
+    [
+        "",
+        "value //",
+        "value.bit_length()",
+        "other // 2",
+        "value / 2",
+        "value // 2.0",
+        "value ** 2",
+        "-value",
+        "min(value)",
+        "min(50, value, key=abs)",
+        "abs(value)",
+        "__import__('os').system('true')",
+        "[value][0]",
+    ],
+)
+def test_compile_formula_rejects_anything_else(formula: str) -> None:
+    assert _compile_formula(formula) is None
+
+
+def test_unknown_formula_scores_zero() -> None:
+    rule = {"type": "internal_links", "field": "internal_links", "formula": "value / 10"}
+    assert _aeo_scores([rule], {"internal_links": 500}) == [0]
+    assert _aeo_scores([dict(rule, formula="min(50, value // 10)")], {"internal_links": 500}) == [50]
+
+
+def test_field_slots_share_a_slot_per_field() -> None:
+    slots = _FieldSlots()
+    get_name = slots.getter("business.name")
+    get_links = slots.getter("internal_links")
+    get_name_again = slots.getter("business.name")
+    get_missing = slots.getter("business.geo.lat")
+    assert slots.index == {"business.name": 0, "internal_links": 1, "business.geo.lat": 2}
+
+    values = slots.loader()({"business": {"name": "Acme", "geo": "n/a"}, "internal_links": 12})
+    assert values == ("Acme", 12, None)
+    assert get_name(values) == get_name_again(values) == "Acme"
+    assert get_links(values) == 12
+    assert get_missing(values) is None
+
+
+def test_uncompiled_rules_compile_on_first_use(monkeypatch: pytest.MonkeyPatch) -> None:
+    # What import leaves behind when scoring_rules.yaml fails to compile
+    monkeypatch.setattr(orchestrator, "_COMPILED_RULES", None)
+    aeo, _geo, _weaknesses = _compute_scores({}, {}, {"performance": 75})
+    assert orchestrator._COMPILED_RULES is not None
+    assert len(aeo.dimensions) == 7
+
+
+def test_failed_reload_keeps_last_good_rules(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    rules_path = tmp_path / "scoring_rules.yaml"
+    rules_path.write_text('aeo_dimensions: [{name: "A", base_score: 7, rules: []}]\n')
+    monkeypatch.setattr(orchestrator, "_RULES_PATH", rules_path)
+    monkeypatch.setattr(orchestrator, "_SCORING_RULES", {})
+    monkeypatch.setattr(orchestrator, "_COMPILED_RULES", None)
+    monkeypatch.setattr(orchestrator, "RULES_RECHECK_SECONDS", 0.0)
+    assert _compute_scores({}, {}, {})[0].total == 7
+
+    rules_path.write_text("aeo_dimensions: [{rules: []}]\n")  # dimension without a name
+    os.utime(rules_path, ns=(0, rules_path.stat().st_mtime_ns + 1_000_000))
+    assert _compute_scores({}, {}, {})[0].total == 7
+    assert orchestrator._compiled_rules_mtime_ns == rules_path.stat().st_mtime_ns
+
+
+def test_html_lower_rule_field_reads_the_signal_set() -> None:
+    data = {"html_signals": scan_html_signals("<p>Customer Reviews</p><iframe src='https://maps.google.com'>")}
+    for field in ("html_lower", "html_signals"):
+        rules = [
+            {"type": "review_content", "field": field, "points": 10},
+            {"type": "map_embed", "field": field, "points": 5},
+        ]
+        assert _aeo_scores(rules, data) == [15]
+    assert _aeo_scores([{"type": "review_content", "field": "html_lower", "points": 10}], {"html_signals": set()}) == [0]
+
+
+def test_page_cache_entry_is_not_shared_with_callers(monkeypatch: pytest.MonkeyPatch) -> None:
+    html = (
+        "<html><head><title>Acme</title></head><body><h2>Why us?</h2>"
+        '<a href="/about">About</a><p>Plumbers serving Irving TX since 1990.</p></body></html>'
+    )
+    calls: List[str] = []
+
+    def extract_keyphrases(text: str, **kwargs: Any) -> List[str]:
+        calls.append(text)
+        return ["irving plumbers"]
+
+    monkeypatch.setattr(orchestrator, "_page_cache", {})
+    monkeypatch.setattr(orchestrator, "extract_keyphrases", extract_keyphrases)
+    args = (html, html.encode(), "utf-8", "https://acme.com/", True)
+
+    first = orchestrator._analyze_page_cached(*args)
+    expected = (first["basic"]["headings"]["h2"][:], first["phrases"][:], first["sd_summary"].types[:])
+    first["basic"]["headings"]["h2"].append("changed")
+    first["phrases"].append({"phrase": "changed"})
+    first["sd_summary"].types.append("changed")
+    first["biz_data"]["name"] = "changed"
+
+    second = orchestrator._analyze_page_cached(*args)
+    assert len(calls) == 1
+    assert (second["basic"]["headings"]["h2"], second["phrases"], second["sd_summary"].types) == expected
+    assert second["biz_data"].get("name") != "changed"
+    second["phrases"].clear()
+    assert orchestrator._analyze_page_cached(*args)["phrases"] == expected[1]
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from typing import Any, List
+
+import pytest
+
+from app.api.routes import scan
+
+_HTML = (
+    "<html><head><title>Acme Plumbing</title>"
+    '<script type="application/ld+json">{"@type": "LocalBusiness", "name": "Acme"}</script>'
+    "</head><body><p>We fix pipes in Irving and Dallas.</p></body></html>"
+)
+
+
+@pytest.fixture
+def fetch(monkeypatch: pytest.MonkeyPatch) -> List[Any]:
+    """Serve _HTML from fetch_page_sync with increasing html_ms; count keyphrase runs."""
+    calls: List[Any] = []
+
+    def fetch_page_sync(url: str, timeout: int) -> tuple:
+        calls.append(url)
+        return _HTML, _HTML.encode(), "utf-8", calls.count(url)
+
+    def extract_keyphrases(text: str, **kwargs: Any) -> List[str]:
+        calls.append("keyphrases")
+        return ["acme plumbing"]
+
+    monkeypatch.setattr(scan, "_extract_cache", {})
+    monkeypatch.setattr(scan, "fetch_page_sync", fetch_page_sync)
+    monkeypatch.setattr(scan, "extract_keyphrases", extract_keyphrases)
+    return calls
+
+
+def test_extract_cache_hit_skips_extraction_and_reports_new_timing(fetch: List[Any]) -> None:
+    first = scan.extract_local("https://acme.com/")
+    second = scan.extract_local("https://acme.com/")
+
+    assert fetch == ["https://acme.com/", "keyphrases", "https://acme.com/"]
+    assert first.timings == {"html_ms": 1, "keyphrases_ms": first.timings["keyphrases_ms"]}
+    assert second.timings == {"html_ms": 2, "keyphrases_ms": 0}
+    assert second.model_dump(exclude={"timings"}) == first.model_dump(exclude={"timings"})
+    assert second.title == "Acme Plumbing"
+
+
+def test_extract_cache_entry_is_not_shared_with_callers(fetch: List[Any]) -> None:
+    first = scan.extract_local("https://acme.com/")
+    first.title = "changed"
+    first.keyphrases.append("changed")
+    first.schemas[0]["data"]["name"] = "changed"
+
+    second = scan.extract_local("https://acme.com/")
+    second.keyphrases.append("again")
+    third = scan.extract_local("https://acme.com/")
+
+    assert fetch.count("keyphrases") == 1
+    for response in (second, third):
+        assert response.title == "Acme Plumbing"
+        assert response.schemas[0]["data"]["name"] == "Acme"
+    assert third.keyphrases == ["acme plumbing"]
+
+
+def test_extract_cache_misses_on_changed_page(fetch: List[Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    scan.extract_local("https://acme.com/")
+    html = _HTML.replace("Acme Plumbing", "Acme Heating")
+    monkeypatch.setattr(scan, "fetch_page_sync", lambda url, timeout: (html, html.encode(), "utf-8", 3))
+    assert scan.extract_local("https://acme.com/").title == "Acme Heating"
+    assert fetch.count("keyphrases") == 2
+
+
+def test_iter_types_walks_nested_graph_and_lists() -> None:
+    data = {
+        "@context": "https://schema.org",
+        "@graph": [
+            {"@type": ["LocalBusiness", "Plumber"], "address": {"@type": "PostalAddress"}},
+            {"@type": "https://schema.org/FAQPage", "mainEntity": [{"@type": "Question"}]},
+            {"@type": ""},
+            {"@type": 5},
+        ],
+    }
+    assert list(scan._iter_types(data)) == ["LocalBusiness", "Plumber", "FAQPage", "PostalAddress", "Question"]
+
+
+def test_iter_types_reads_only_the_given_keys() -> None:
+    microdata = {"type": "http://schema.org/LocalBusiness", "properties": {"review": {"type": "http://schema.org/Review"}}}
+    assert list(scan._iter_types(microdata)) == []
+    assert list(scan._iter_types(microdata, ("@type", "type"))) == ["LocalBusiness", "Review"]
+    assert list(scan._iter_types([microdata, None, "LocalBusiness"], ("type",))) == ["LocalBusiness", "Review"]
+
+
+def test_check_rules_resolve_off_the_event_loop(fetch: List[Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    real_get_rules = scan.get_rules
+    threads: List[str] = []
+
+    def get_rules() -> Any:
+        threads.append(threading.current_thread().name)
+        return real_get_rules()
+
+    class _Request:
+        client = None
+
+    monkeypatch.setenv("DISABLE_AI", "1")
+    monkeypatch.setattr(scan, "get_rules", get_rules)
+    monkeypatch.setattr(scan, "validate_url_or_raise", lambda url: None)
+    monkeypatch.setattr(scan, "fetch_psi", lambda url: {"source": "psi", "available": True, "performance": 80})
+    result = asyncio.run(scan._run_scan(scan.ScanRequest(url="https://acme.com/"), _Request()))
+
+    assert threads and threading.main_thread().name not in threads
+    assert "LocalBusiness schema present" in result.visibility["signals"]
+
+
+def test_rate_check_backs_off_while_redis_is_down(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    state = {"up": False, "calls": 0}
+
+    async def script(keys: List[str], args: List[int]) -> int:
+        state["calls"] += 1
+        if not state["up"]:
+            raise ConnectionError("redis down")
+        return 1
+
+    monkeypatch.setattr(scan, "_rate_script", lambda: script)
+    monkeypatch.setattr(scan, "_rate_redis_down", False)
+    monkeypatch.setattr(scan, "_rate_redis_retry_at", 0.0)
+    monkeypatch.setattr(scan, "_rate_counters", {})
+
+    async def checks(n: int) -> List[bool]:
+        return [await scan._rate_check("1.2.3.4") for _ in range(n)]
+
+    with caplog.at_level("INFO", logger=scan.logger.name):
+        assert asyncio.run(checks(3)) == [True, True, True]
+        # One failed round trip, then the in-process limiter until the backoff passes
+        assert state["calls"] == 1
+        assert len(scan._rate_counters["1.2.3.4"]) == 3
+
+        monkeypatch.setattr(scan, "_rate_redis_retry_at", 0.0)
+        state["up"] = True
+        assert asyncio.run(checks(2)) == [True, True]
+        assert state["calls"] == 3
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert sum("Redis rate limit unavailable" in m for m in messages) == 1
+    assert sum("Redis rate limit recovered" in m for m in messages) == 1
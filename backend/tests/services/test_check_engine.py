@@ -0,0 +1,76 @@
+from typing import Any, Dict
+
+import pytest
+
+from app.services.check_engine import compile_rules, evaluate_rules
+from app.services.rules_loader import load_rules
+
+_RULES: Dict[str, Any] = {
+    "rules": [
+        {
+            "id": "slow",
+            "title": "Slow page",
+            "category": "performance",
+            "severity": 4,
+            "when": ["lighthouse.performance < `50`"],
+            "details": "Performance {performance}, LCP {lcp_ms} ms{missing}",
+            "recommendation": "Speed up {url}",
+            "score_impact": -5,
+        },
+        {
+            "id": "no-faq",
+            "title": "No FAQ",
+            "category": "schema",
+            "when": ["scan.title"],
+            "unless": ["contains(scan.schema_types, 'FAQPage')"],
+            "details": "",
+            "recommendation": "Add FAQPage {",
+            "score_impact": -2,
+        },
+        {
+            "id": "broken",
+            "title": "Never matches",
+            "category": "content",
+            "when": ["scan.[["],
+            "details": "",
+            "recommendation": "",
+        },
+    ]
+}
+
+_DATA = [
+    {},
+    {"scan": {"url": "https://acme.com", "title": "Acme", "schema_types": ["FAQPage"]}, "lighthouse": {"performance": 90}},
+    {
+        "scan": {"url": "https://acme.com", "title": "Acme", "schema_types": []},
+        "lighthouse": {"performance": 42, "web_vitals": {"lcp_ms": 4100}},
+    },
+]
+
+
+@pytest.mark.parametrize("data", _DATA)
+def test_compiled_rules_evaluate_like_the_rules_file(data: Dict[str, Any]) -> None:
+    assert evaluate_rules(data, compile_rules(_RULES)) == evaluate_rules(data, _RULES)
+
+
+def test_evaluate_rules_matches_when_and_unless() -> None:
+    result = evaluate_rules(_DATA[2], compile_rules(_RULES))
+    assert result["signals"] == ["Slow page", "No FAQ"]
+    assert result["score_delta"] == -7
+    assert result["recommendations"][0] == {
+        "rule_id": "slow",
+        "title": "Slow page",
+        "category": "performance",
+        "impact": 4,
+        "details": "Performance 42, LCP 4100 ms",
+        "recommendation": "Speed up https://acme.com",
+    }
+    # Unformattable text is returned as written
+    assert result["recommendations"][1]["recommendation"] == "Add FAQPage {"
+    assert evaluate_rules(_DATA[1], compile_rules(_RULES))["signals"] == []
+
+
+@pytest.mark.parametrize("data", _DATA)
+def test_compiled_shipped_rules_evaluate_like_the_rules_file(data: Dict[str, Any]) -> None:
+    rules_file = load_rules()
+    assert evaluate_rules(data, compile_rules(rules_file)) == evaluate_rules(data, rules_file)
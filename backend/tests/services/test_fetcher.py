@@ -0,0 +1,68 @@
+import asyncio
+from typing import Iterator
+
+import httpx
+import pytest
+
+from app.services.fetcher import HTMLTooLargeError, aread_capped, decode_body, read_capped
+
+
+def _chunks(n: int, size: int = 10) -> Iterator[bytes]:
+    for _ in range(n):
+        yield b"x" * size
+
+
+def _client(response: httpx.Response) -> httpx.Client:
+    return httpx.Client(transport=httpx.MockTransport(lambda request: response))
+
+
+def test_read_capped_returns_body_within_limit() -> None:
+    with _client(httpx.Response(200, content=_chunks(3))) as client:
+        with client.stream("GET", "https://example.com/") as resp:
+            assert read_capped(resp, limit=30) == b"x" * 30
+
+
+def test_read_capped_rejects_streamed_body_over_limit() -> None:
+    with _client(httpx.Response(200, content=_chunks(4))) as client:
+        with client.stream("GET", "https://example.com/") as resp:
+            with pytest.raises(HTMLTooLargeError, match="over 30 bytes"):
+                read_capped(resp, limit=30)
+
+
+def test_read_capped_rejects_declared_length_before_reading() -> None:
+    with _client(httpx.Response(200, content=b"x" * 31)) as client:
+        with client.stream("GET", "https://example.com/") as resp:
+            with pytest.raises(HTMLTooLargeError, match="too large: 31 bytes"):
+                read_capped(resp, limit=30)
+
+
+def test_html_too_large_is_a_request_error() -> None:
+    # Callers already handling httpx.RequestError treat an oversized page as a failed fetch
+    assert issubclass(HTMLTooLargeError, httpx.RequestError)
+
+
+def test_aread_capped_matches_read_capped() -> None:
+    async def read(n: int) -> bytes:
+        async def chunks() -> object:
+            for chunk in _chunks(n):
+                yield chunk
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=chunks()))
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("GET", "https://example.com/") as resp:
+                return await aread_capped(resp, limit=30)
+
+    assert asyncio.run(read(3)) == b"x" * 30
+    with pytest.raises(HTMLTooLargeError):
+        asyncio.run(read(4))
+
+
+def test_decode_body_uses_declared_charset() -> None:
+    resp = httpx.Response(200, headers={"content-type": "text/html; charset=iso-8859-1"})
+    assert decode_body(resp, "café".encode("iso-8859-1")) == "café"
+
+
+def test_decode_body_falls_back_to_utf8_with_replacement() -> None:
+    resp = httpx.Response(200, headers={"content-type": "text/html"})
+    assert decode_body(resp, "café".encode()) == "café"
+    assert decode_body(resp, b"caf\xff") == "caf�"
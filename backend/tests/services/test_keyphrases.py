@@ -0,0 +1,40 @@
+import sys
+import types
+from typing import Any, List
+
+import pytest
+
+from app.services import keyphrases
+
+
+def test_get_redis_retries_after_a_failed_connect(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts: List[str] = []
+    client = object()
+
+    def from_url(url: str) -> Any:
+        attempts.append(url)
+        if len(attempts) == 1:
+            raise ConnectionError("redis down")
+        return client
+
+    fake_redis = types.SimpleNamespace(Redis=types.SimpleNamespace(from_url=from_url))
+    monkeypatch.setitem(sys.modules, "redis", fake_redis)
+    monkeypatch.setenv("REDIS_URL", "redis://cache:6379/0")
+    monkeypatch.setattr(keyphrases, "_redis_client", None)
+    monkeypatch.setattr(keyphrases, "_redis_retry_at", 0.0)
+
+    assert keyphrases._get_redis() is None
+    # Backing off: no new attempt until the retry time passes
+    assert keyphrases._get_redis() is None
+    assert len(attempts) == 1
+
+    monkeypatch.setattr(keyphrases, "_redis_retry_at", 0.0)
+    assert keyphrases._get_redis() is client
+    assert keyphrases._get_redis() is client
+    assert len(attempts) == 2
+
+
+def test_get_redis_without_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.setattr(keyphrases, "_redis_client", None)
+    assert keyphrases._get_redis() is None
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+import requests
+
+from app.services import lighthouse
+
+_PSI_RESPONSE = {
+    "id": "https://acme.com/",
+    "lighthouseResult": {"categories": {"performance": {"score": 0.81}, "seo": {"score": 0.9}}, "audits": {}},
+}
+
+
+@pytest.fixture(autouse=True)
+def psi_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PSI_API_KEY", "test-key")
+    monkeypatch.setattr(lighthouse, "_psi_cache", {})
+    monkeypatch.setattr(lighthouse, "_in_flight", {})
+    monkeypatch.setattr(lighthouse, "_circuit_breaker_failures", 0)
+    monkeypatch.setattr(lighthouse, "_circuit_breaker_tripped_until", 0.0)
+
+
+def test_concurrent_fetches_share_one_psi_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[str] = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def call_psi(url: str, key: str, timeout: int = 12) -> Dict[str, Any]:
+        calls.append(url)
+        started.set()
+        release.wait(5)
+        return _PSI_RESPONSE
+
+    monkeypatch.setattr(lighthouse, "_call_psi", call_psi)
+    results: List[Dict[str, Any]] = []
+
+    def fetch() -> None:
+        results.append(lighthouse.fetch_psi("https://acme.com/"))
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    threads[0].start()
+    assert started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == ["https://acme.com/"]
+    assert len(results) == 4
+    assert all(r == results[0] for r in results)
+    assert results[0]["performance"] == 81
+    assert lighthouse._in_flight == {}
+
+
+def test_failed_refresh_keeps_cached_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(lighthouse, "_call_psi", lambda url, key, timeout=12: _PSI_RESPONSE)
+    good = lighthouse.fetch_psi("https://acme.com/")
+    assert good["available"] is True
+
+    def call_psi(url: str, key: str, timeout: int = 12) -> Dict[str, Any]:
+        raise requests.exceptions.ConnectionError("down")
+
+    monkeypatch.setattr(lighthouse, "_call_psi", call_psi)
+    failed = lighthouse.fetch_psi("https://acme.com/", refresh=True)
+    assert failed["available"] is False
+    assert lighthouse.fetch_psi("https://acme.com/") is good
+
+    # Without a cached result to protect, the failure is cached as before
+    assert lighthouse.fetch_psi("https://other.com/")["available"] is False
+    assert lighthouse._psi_cache[("https://other.com/", "mobile")][0]["error"] == "down"
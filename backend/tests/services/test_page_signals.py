@@ -0,0 +1,65 @@
+import pytest
+
+from app.services.page_signals import (
+    HTML_SIGNAL_NEEDLES,
+    PHONE_RE,
+    ZIP_RE,
+    business_hints,
+    keyphrase_intent,
+    scan_html_signals,
+)
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "",
+        "no signals here",
+        "Read our REVIEWS",
+        '<iframe src="https://Maps.Google.com/maps?q=acme"></iframe>',
+        '<a href="https://g.page/acme">Google profile</a> and maps.apple.com/place',
+        "businessconnect.apple.com business.google.com google.com/maps review",
+    ],
+)
+def test_scan_html_signals_matches_lowercased_substring_checks(html: str) -> None:
+    # Same answer as the `needle in html.lower()` checks it replaces
+    expected = {n for n in HTML_SIGNAL_NEEDLES if n in html.lower()}
+    assert scan_html_signals(html) == expected
+
+
+def test_scan_html_signals_reports_needles_nested_in_a_longer_match() -> None:
+    # maps.google.com is matched first, and it also contains maps.google
+    assert scan_html_signals("MAPS.GOOGLE.COM") == {"maps.google.com", "maps.google"}
+
+
+def test_business_hints_from_signals() -> None:
+    assert business_hints({"g.page"}, []) == (True, False)
+    assert business_hints({"maps.apple.com"}, []) == (False, True)
+
+
+def test_business_hints_from_links() -> None:
+    links = ["/about", "https://MAPS.APPLE.COM/place?id=1", "https://www.google.com/maps/place/acme"]
+    assert business_hints(set(), links) == (True, True)
+    assert business_hints(set(), ["/contact"]) == (False, False)
+
+
+def test_nap_patterns() -> None:
+    assert PHONE_RE.search("Call (214) 555-0100 today").group(0) == "(214) 555-0100"
+    assert ZIP_RE.search("Irving, TX 75038-1234").group(0) == "75038-1234"
+    assert ZIP_RE.search("order 1234567") is None
+
+
+@pytest.mark.parametrize(
+    "text, intent",
+    [
+        ("Plumbers in Irving, TX since 1990", "Local"),
+        ("TX licensed plumbers", "Local"),
+        ("Serving all of Texas.", "Local"),
+        ("Download the .txt file", "Informational"),
+        ("Upload a txt export", "Informational"),
+        ("Austin-based, texan owned", "Informational"),
+        ("", "Informational"),
+    ],
+)
+def test_keyphrase_intent(text: str, intent: str) -> None:
+    assert keyphrase_intent(text) == intent
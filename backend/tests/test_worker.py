@@ -0,0 +1,40 @@
+from typing import List
+
+import httpx
+import pytest
+
+from app import worker
+from app.api.routes import orchestrator
+
+
+def _serve(monkeypatch: pytest.MonkeyPatch, responses: List[httpx.Response]) -> List[httpx.Request]:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses[min(len(requests), len(responses)) - 1]
+
+    client = httpx.Client(transport=httpx.MockTransport(handler), headers=orchestrator.HEADERS)
+    monkeypatch.setattr(orchestrator, "_HTTP_CLIENT", client)
+    monkeypatch.setattr(worker, "_ROBOTS_CACHE", {})
+    return requests
+
+
+def test_robots_fetched_and_checked_as_the_crawler(monkeypatch: pytest.MonkeyPatch) -> None:
+    robots = "User-agent: XenlixAI\nDisallow: /private\n\nUser-agent: *\nDisallow: /\n"
+    requests = _serve(monkeypatch, [httpx.Response(200, text=robots)])
+
+    assert worker._robots_allows("https://acme.com/", "https://acme.com/services")
+    assert not worker._robots_allows("https://acme.com/", "https://acme.com/private/x")
+    assert len(requests) == 1
+    assert requests[0].headers["User-Agent"] == worker.CRAWLER_USER_AGENT
+
+
+def test_robots_server_errors_are_not_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    requests = _serve(monkeypatch, [httpx.Response(503), httpx.Response(404)])
+
+    assert worker._robots_allows("https://acme.com/", "https://acme.com/a")
+    assert worker._robots_allows("https://acme.com/", "https://acme.com/b")
+    assert worker._robots_allows("https://acme.com/", "https://acme.com/c")
+    # 503 retried on the next check; the 404 answer is then reused
+    assert len(requests) == 2